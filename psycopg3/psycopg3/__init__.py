@@ -4,16 +4,22 @@ psycopg3 -- PostgreSQL database adapter for Python
 
 # Copyright (C) 2020-2021 The Psycopg Team
 
+import sys
+from typing import Any
+from importlib import import_module
+
 from . import pq
-from . import types
 from .copy import Copy, AsyncCopy
-from .adapt import global_adapters
+from .adapt import AdaptersMap, global_adapters
 from .cursor import AsyncCursor, Cursor
 from .errors import Warning, Error, InterfaceError, DatabaseError
 from .errors import DataError, OperationalError, IntegrityError
 from .errors import InternalError, ProgrammingError, NotSupportedError
 from ._column import Column
+from ._queries import PreparedQuery
+from ._tracing import QueryTrace
 from .connection import AsyncConnection, Connection, Notify
+from .notify import AsyncNotifyListener, NotifyListener
 from .transaction import Rollback, Transaction, AsyncTransaction
 
 from .dbapi20 import BINARY, DATETIME, NUMBER, ROWID, STRING, BinaryDumper
@@ -22,15 +28,36 @@ from .dbapi20 import Timestamp, TimestampFromTicks
 
 from .version import __version__
 
-# register default adapters
-types.register_default_globals(global_adapters)
+
+def _register_global_adapters(adapters: AdaptersMap) -> None:
+    from .types import register_default_globals
+
+    # register default adapters
+    register_default_globals(adapters)
+    BinaryDumper.register(Binary, adapters)  # dbapi20
+
+
+# The adapters are registered on first use of the global adapters map, to
+# avoid importing the types modules if they are not needed.
+global_adapters._init_func = _register_global_adapters
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name: str) -> Any:
+        # Import the types package on first access
+        if name == "types":
+            return import_module(".types", __name__)
+
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+else:
+    from . import types  # noqa: F401
 
 # DBAPI compliancy
 connect = Connection.connect
 apilevel = "2.0"
 threadsafety = 2
 paramstyle = "pyformat"
-BinaryDumper.register(Binary, global_adapters)  # dbapi20
 
 
 # Note: defining the exported methods helps both Sphynx in documenting that
@@ -40,12 +67,16 @@ __all__ = [
     "AsyncConnection",
     "AsyncCopy",
     "AsyncCursor",
+    "AsyncNotifyListener",
     "AsyncTransaction",
     "Column",
     "Connection",
     "Copy",
     "Cursor",
     "Notify",
+    "NotifyListener",
+    "PreparedQuery",
+    "QueryTrace",
     "Rollback",
     "Transaction",
 ]
@@ -4,23 +4,82 @@ Support for prepared statements
 
 # Copyright (C) 2020-2021 The Psycopg Team
 
+import os
 from enum import IntEnum, auto
-from typing import Optional, Sequence, Tuple, TYPE_CHECKING, Union
-from collections import OrderedDict
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional
+from typing import Sequence, Tuple, TYPE_CHECKING, Union
+from collections import OrderedDict, deque
 
-from .pq import ExecStatus
+from .pq import DiagnosticField, ExecStatus
 from ._queries import PostgresQuery
 
 if TYPE_CHECKING:
     from .pq.proto import PGresult
 
 
+Key = Tuple[bytes, Tuple[int, ...]]
+
+
 class Prepare(IntEnum):
     NO = auto()
     YES = auto()
     SHOULD = auto()
 
 
+class PreparedInfo(NamedTuple):
+    """Statistics about the use of the prepared statements on a connection."""
+
+    hits: int
+    misses: int
+    prepares: int
+    evictions: int
+    deallocations: int
+    maxsize: int
+    currsize: int
+    time_saved: float
+
+
+class PreparedStatement(NamedTuple):
+    """A statement prepared on a connection."""
+
+    name: str
+    query: bytes
+    types: Tuple[int, ...]
+    executions: int
+    time_saved: float
+
+
+class StatementStats:
+    """
+    Execution times of a query, to estimate the benefit of preparing it.
+    """
+
+    __slots__ = ("executions", "time", "prepared_executions", "prepared_time")
+
+    def __init__(self) -> None:
+        self.executions = 0
+        self.time = 0.0
+        self.prepared_executions = 0
+        self.prepared_time = 0.0
+
+    @property
+    def time_saved(self) -> float:
+        """
+        Estimate the time saved executing the query as a prepared statement.
+
+        The estimate is based on the difference between the mean time of the
+        executions before and after preparing the query. It is 0 if there is
+        no execution to compare with.
+        """
+        if not (self.executions and self.prepared_executions):
+            return 0.0
+        mean = self.time / self.executions
+        prepared_mean = self.prepared_time / self.prepared_executions
+        if prepared_mean >= mean:
+            return 0.0
+        return (mean - prepared_mean) * self.prepared_executions
+
+
 class PrepareManager:
     # Number of times a query is executed before it is prepared.
     prepare_threshold: Optional[int] = 5
@@ -35,12 +94,30 @@ class PrepareManager:
         # Note: with this implementation we keep the tally of up to 100
         # queries, but most likely we will prepare way less than that. We might
         # change that if we think it would be better.
-        self._prepared: OrderedDict[
-            Tuple[bytes, Tuple[int, ...]], Union[int, bytes]
-        ] = OrderedDict()
+        self._prepared: OrderedDict[Key, Union[int, bytes]] = OrderedDict()
+
+        # Execution times of the queries in the cache above
+        self._stats: Dict[Key, StatementStats] = {}
 
-        # Counter to generate prepared statements names
+        # Counter to generate prepared statements names. The names have a
+        # random prefix, so that statements prepared by different clients
+        # don't clash when they share a server session (behind a pooler).
         self._prepared_idx = 0
+        self._name_prefix = f"_pg3_{os.urandom(6).hex()}_"
+
+        # Commands to run to deallocate the statements evicted from the cache.
+        # They can be sent together with the next query.
+        self._maint_commands: Deque[bytes] = deque()
+
+        # Statistics about the cache use
+        self.hits = 0
+        self.misses = 0
+        self.prepares = 0
+        self.evictions = 0
+        self.deallocations = 0
+
+        # Time saved by the statements no more in the cache
+        self._time_saved = 0.0
 
     def get(
         self, query: PostgresQuery, prepare: Optional[bool] = None
@@ -60,42 +137,68 @@ class PrepareManager:
 
         if value >= self.prepare_threshold or prepare:
             # The query has been executed enough times and needs to be prepared
-            name = f"_pg3_{self._prepared_idx}".encode("utf-8")
-            self._prepared_idx += 1
-            return Prepare.SHOULD, name
+            return Prepare.SHOULD, self._new_name()
         else:
             # The query is not to be prepared yet
             return Prepare.NO, b""
 
+    def _new_name(self) -> bytes:
+        name = f"{self._name_prefix}{self._prepared_idx}".encode("utf-8")
+        self._prepared_idx += 1
+        return name
+
     def maintain(
         self,
         query: PostgresQuery,
         results: Sequence["PGresult"],
         prep: Prepare,
         name: bytes,
-    ) -> Optional[bytes]:
-        """Maintain the cache of the prepared statements."""
+        elapsed: float = 0.0,
+    ) -> None:
+        """
+        Maintain the cache of the prepared statements.
+
+        *elapsed* is the time taken by the query execution, used to estimate
+        the time saved by the prepared statements.
+
+        If a statement is evicted, the command to deallocate it is returned by
+        the following call to `pop_maintenance_commands()`.
+        """
         # don't do anything if prepared statements are disabled
         if self.prepare_threshold is None:
-            return None
+            return
 
         key = (query.query, query.types)
 
+        if prep is Prepare.YES and not isinstance(
+            self._prepared.get(key), bytes
+        ):
+            # The statement was forgotten by reprepare(): the execution failed
+            # and it will be prepared again, so it isn't a hit.
+            return
+
+        if prep is Prepare.YES:
+            self.hits += 1
+        elif prep is Prepare.NO:
+            self.misses += 1
+
         # If we know the query already the cache size won't change
         # So just update the count and record as last used
         if key in self._prepared:
             if isinstance(self._prepared[key], int):
                 if prep is Prepare.SHOULD:
                     self._prepared[key] = name
+                    self.prepares += 1
                 else:
                     self._prepared[key] += 1  # type: ignore  # operator
             self._prepared.move_to_end(key)
-            return None
+            self._record(key, prep, elapsed)
+            return
 
         # The query is not in cache. Let's see if we must add it
         if len(results) != 1:
             # We cannot prepare a multiple statement
-            return None
+            return
 
         result = results[0]
         if (
@@ -103,18 +206,170 @@ class PrepareManager:
             and result.status != ExecStatus.COMMAND_OK
         ):
             # We don't prepare failed queries or other weird results
-            return None
+            return
 
         # Ok, we got to the conclusion that this query is genuinely to prepare
-        self._prepared[key] = name if prep is Prepare.SHOULD else 1
+        if prep is Prepare.SHOULD:
+            self._prepared[key] = name
+            self.prepares += 1
+        else:
+            self._prepared[key] = 1
+        self._record(key, prep, elapsed)
 
         # Evict an old value from the cache; if it was prepared, deallocate it
         # Do it only once: if the cache was resized, deallocate gradually
         if len(self._prepared) <= self.prepared_max:
-            return None
+            return
 
-        old_val = self._prepared.popitem(last=False)[1]
+        old_key, old_val = self._prepared.popitem(last=False)
+        stats = self._stats.pop(old_key, None)
+        if stats:
+            self._time_saved += stats.time_saved
         if isinstance(old_val, bytes):
-            return b"DEALLOCATE " + old_val
+            self.evictions += 1
+            self._maint_commands.append(b"DEALLOCATE " + old_val)
+
+    def _record(self, key: Key, prep: Prepare, elapsed: float) -> None:
+        # The first execution also includes the statement preparation, so it
+        # is not comparable with the others.
+        if prep is Prepare.SHOULD:
+            return
+        stats = self._stats.get(key)
+        if not stats:
+            stats = self._stats[key] = StatementStats()
+        if prep is Prepare.YES:
+            stats.prepared_executions += 1
+            stats.prepared_time += elapsed
         else:
+            stats.executions += 1
+            stats.time += elapsed
+
+    def reprepare(
+        self, query: PostgresQuery, results: Sequence["PGresult"]
+    ) -> Optional[bytes]:
+        """
+        Check if a prepared statement failed but can succeed if prepared again.
+
+        This is the case if the statement was invalidated by a schema change,
+        or if it doesn't exist in the session (which happens behind a
+        connection pooler, if the session is served by a server connection
+        different from the one where it was prepared).
+
+        If so, forget the statement, so that it is prepared again at the next
+        execution, and return the name to prepare it with; return `!None`
+        otherwise. An invalidated statement is also scheduled for
+        deallocation, while a missing one can be prepared with the same name:
+        the names are unique to the client, so the session can't have a
+        different statement with that name.
+        """
+        if not results:
+            return None
+        result = results[-1]
+        if result.status != ExecStatus.FATAL_ERROR:
+            return None
+        sqlstate = result.error_field(DiagnosticField.SQLSTATE)
+        if sqlstate != _missing_stmt and not _is_invalid_stmt(result):
             return None
+
+        key = (query.query, query.types)
+        name = self._prepared.get(key)
+        if not isinstance(name, bytes):
+            return None
+
+        # Make sure the next execution prepares the statement again
+        self._prepared[key] = self.prepare_threshold or 0
+        if sqlstate == _missing_stmt:
+            return name
+
+        self._maint_commands.append(b"DEALLOCATE " + name)
+        return self._new_name()
+
+    def clear(self) -> None:
+        """
+        Forget all the prepared statements.
+
+        To be called after the statements have been deallocated on the server.
+        """
+        self.deallocations += sum(
+            1 for v in self._prepared.values() if isinstance(v, bytes)
+        )
+        self._time_saved += sum(s.time_saved for s in self._stats.values())
+        self._prepared.clear()
+        self._stats.clear()
+        self._maint_commands.clear()
+
+    def pop_maintenance_commands(self) -> List[bytes]:
+        """
+        Return the commands to run to deallocate the statements evicted.
+        """
+        rv = list(self._maint_commands)
+        self._maint_commands.clear()
+        self.deallocations += len(rv)
+        return rv
+
+    def push_maintenance_commands(self, commands: Iterable[bytes]) -> None:
+        """
+        Put back commands returned by `pop_maintenance_commands()` not run.
+        """
+        commands = list(commands)
+        self.deallocations -= len(commands)
+        self._maint_commands.extendleft(reversed(commands))
+
+    def info(self) -> PreparedInfo:
+        """
+        Return statistics about the use of the prepared statements.
+        """
+        return PreparedInfo(
+            hits=self.hits,
+            misses=self.misses,
+            prepares=self.prepares,
+            evictions=self.evictions,
+            deallocations=self.deallocations,
+            maxsize=self.prepared_max,
+            currsize=sum(
+                1 for v in self._prepared.values() if isinstance(v, bytes)
+            ),
+            time_saved=self._time_saved
+            + sum(s.time_saved for s in self._stats.values()),
+        )
+
+    def statements(self) -> List[PreparedStatement]:
+        """
+        Return the statements currently prepared, the least recently used first.
+        """
+        rv = []
+        for key, value in self._prepared.items():
+            if not isinstance(value, bytes):
+                continue
+            stats = self._stats.get(key)
+            rv.append(
+                PreparedStatement(
+                    name=value.decode("ascii"),
+                    query=key[0],
+                    types=key[1],
+                    executions=stats.prepared_executions if stats else 0,
+                    time_saved=stats.time_saved if stats else 0.0,
+                )
+            )
+        return rv
+
+
+def _is_invalid_stmt(result: "PGresult") -> bool:
+    """
+    Return True if a prepared statement failed because it was invalidated.
+
+    This is the "cached plan must not change result type" error, returned
+    after a schema change, e.g. an ALTER TABLE. Its SQLSTATE is shared with
+    other errors, which wouldn't go away preparing the statement again, so
+    check the function raising it too (which, unlike the message, is not
+    translated).
+    """
+    return (
+        result.error_field(DiagnosticField.SQLSTATE) == b"0A000"
+        and result.error_field(DiagnosticField.SOURCE_FUNCTION)
+        == b"RevalidateCachedQuery"
+    )
+
+
+# Error returned executing a prepared statement which doesn't exist.
+_missing_stmt = b"26000"  # invalid_sql_statement_name
@@ -0,0 +1,89 @@
+"""
+Collection of statistics about the adapters used
+"""
+
+# Copyright (C) 2020-2021 The Psycopg Team
+
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from . import pq
+
+
+class AdapterStats(NamedTuple):
+    """Statistics about the use of a dumper or a loader."""
+
+    kind: str
+    """``dump`` for a dumper, ``load`` for a loader."""
+
+    adapter: type
+    """The dumper or loader class."""
+
+    oid: int
+    """The OID of the PostgreSQL type adapted."""
+
+    format: pq.Format
+    """The format of the PostgreSQL data."""
+
+    calls: int
+    """Number of values adapted."""
+
+    bytes: int
+    """Size of the PostgreSQL data adapted."""
+
+    time: float
+    """Time spent adapting the values, in seconds."""
+
+
+AdapterStats.__module__ = "psycopg3.adapt"
+
+# The statistics are accumulated by kind, class, oid, format
+StatsKey = Tuple[str, type, int, int]
+
+
+class AdaptersProfile:
+    """
+    Accumulate the statistics about the dumpers and loaders used in a context.
+    """
+
+    __module__ = "psycopg3.adapt"
+
+    def __init__(self) -> None:
+        # Values are lists [calls, bytes, time]
+        self._stats: Dict[StatsKey, List[Any]] = {}
+
+    def add_dump(self, dumper: Any, nbytes: int, time: float) -> None:
+        """Record the dump of a value by *dumper*."""
+        self._add("dump", dumper, 1, nbytes, time)
+
+    def add_load(
+        self, loader: Any, calls: int, nbytes: int, time: float
+    ) -> None:
+        """Record the load of *calls* values by *loader*."""
+        self._add("load", loader, calls, nbytes, time)
+
+    def _add(
+        self, kind: str, adapter: Any, calls: int, nbytes: int, time: float
+    ) -> None:
+        key = (kind, type(adapter), adapter.oid, adapter.format)
+        try:
+            stats = self._stats[key]
+        except KeyError:
+            stats = self._stats[key] = [0, 0, 0.0]
+        stats[0] += calls
+        stats[1] += nbytes
+        stats[2] += time
+
+    def report(self) -> List[AdapterStats]:
+        """
+        Return the statistics collected, the most expensive adapters first.
+        """
+        rv = [
+            AdapterStats(kind, cls, oid, pq.Format(fmt), *stats)
+            for (kind, cls, oid, fmt), stats in self._stats.items()
+        ]
+        rv.sort(key=lambda s: s.time, reverse=True)
+        return rv
+
+    def clear(self) -> None:
+        """Discard the statistics collected."""
+        self._stats.clear()
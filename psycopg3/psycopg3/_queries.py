@@ -7,9 +7,10 @@ Utility module to manipulate queries
 import re
 from typing import Any, Dict, List, Mapping, Match, NamedTuple, Optional
 from typing import Sequence, Tuple, Union, TYPE_CHECKING
-from functools import lru_cache
+from collections import OrderedDict
 
 from . import pq
+from . import adapt
 from . import errors as e
 from .sql import Composable
 from .proto import Query, Params
@@ -17,6 +18,7 @@ from ._enums import Format
 
 if TYPE_CHECKING:
     from .proto import Transformer
+    from .connection import BaseConnection
 
 
 class QueryPart(NamedTuple):
@@ -25,6 +27,91 @@ class QueryPart(NamedTuple):
     format: Format
 
 
+# The result of the conversion of a query: query, formats, order, parts.
+ConvertedQuery = Tuple[
+    bytes, List[Format], Optional[List[str]], List[QueryPart]
+]
+
+
+class QueryCacheInfo(NamedTuple):
+    """Statistics about the use of a `QueryCache`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class QueryCache:
+    """
+    A bounded LRU cache of the queries converted into Postgres format.
+    """
+
+    __slots__ = ("_cache", "_maxsize", "hits", "misses")
+
+    def __init__(self, maxsize: int = 128):
+        self._cache: OrderedDict[
+            Tuple[Union[bytes, str], str], ConvertedQuery
+        ] = OrderedDict()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Maximum number of queries to keep in the cache.
+
+        0 disables the cache.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int) -> None:
+        if value < 0:
+            raise ValueError(f"the cache size must be >= 0, got {value}")
+        self._maxsize = value
+        while len(self._cache) > value:
+            self._cache.popitem(last=False)
+
+    def get(self, query: Union[bytes, str], encoding: str) -> ConvertedQuery:
+        """
+        Return the conversion of *query*, computing it if not in the cache.
+        """
+        key = (query, encoding)
+        try:
+            rv = self._cache[key]
+        except KeyError:
+            pass
+        else:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return rv
+
+        self.misses += 1
+        rv = _query2pg(query, encoding)
+        if self._maxsize:
+            self._cache[key] = rv
+            if len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return rv
+
+    def clear(self) -> None:
+        """Empty the cache and reset the statistics."""
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> QueryCacheInfo:
+        """Return statistics about the cache use."""
+        return QueryCacheInfo(
+            self.hits, self.misses, self._maxsize, len(self._cache)
+        )
+
+
+# Cache used to convert the queries when there is no connection available.
+_query_cache = QueryCache()
+
+
 class PostgresQuery:
     """
     Helper to convert a Python query and parameters into Postgres format.
@@ -48,13 +135,9 @@ class PostgresQuery:
 
         self._parts: List[QueryPart]
         self.query = b""
-        self._encoding = "utf-8"
+        self._encoding = transformer.encoding
         self._order: Optional[List[str]] = None
 
-        conn = transformer.connection
-        if conn:
-            self._encoding = conn.client_encoding
-
     def convert(self, query: Query, vars: Optional[Params]) -> None:
         """
         Set up the query and parameters to convert.
@@ -62,24 +145,33 @@ class PostgresQuery:
         The results of this function can be obtained accessing the object
         attributes (`query`, `params`, `types`, `formats`).
         """
+        self.convert_query(query, vars)
+        self.dump(vars)
+
+    def convert_query(self, query: Query, vars: Optional[Params]) -> None:
+        """
+        Convert the query only, leaving the parameters to `dump()`.
+
+        *vars* is only checked against `!None` to choose the conversion.
+        """
         if isinstance(query, Composable):
             query = query.as_bytes(self._tx)
 
         if vars is not None:
+            conn = self._tx.connection
+            cache = conn._query_cache if conn else _query_cache
             (
                 self.query,
                 self._want_formats,
                 self._order,
                 self._parts,
-            ) = _query2pg(query, self._encoding)
+            ) = cache.get(query, self._encoding)
         else:
             if isinstance(query, str):
                 query = query.encode(self._encoding)
             self.query = query
             self._want_formats = self._order = None
 
-        self.dump(vars)
-
     def dump(self, vars: Optional[Params]) -> None:
         """
         Process a new set of variables on the query processed by `convert()`.
@@ -100,10 +192,80 @@ class PostgresQuery:
             self.formats = None
 
 
-@lru_cache()
-def _query2pg(
-    query: Union[bytes, str], encoding: str
-) -> Tuple[bytes, List[Format], Optional[List[str]], List[QueryPart]]:
+class PreparedQuery:
+    """
+    A query converted once, ready to be executed repeatedly.
+
+    Create it using `Connection.prepare_query()` and pass it to
+    `Cursor.execute()` in place of the query string.
+    """
+
+    __module__ = "psycopg3"
+
+    def __init__(
+        self,
+        connection: "BaseConnection",
+        query: Query,
+        prepare: Optional[bool] = None,
+    ):
+        self.connection = connection
+        self.prepare = prepare
+        self._query = query
+
+        # Convert the query now, to report errors early
+        self._encoding = ""
+        self._convert(adapt.Transformer(connection))
+
+    def __repr__(self) -> str:
+        cls = f"{self.__class__.__module__}.{self.__class__.__qualname__}"
+        return f"<{cls} {self._raw!r} at 0x{id(self):x}>"
+
+    def _convert(self, tx: "Transformer") -> None:
+        """
+        Convert the query in Postgres format, using the encoding of *tx*.
+        """
+        query = self._query
+        if isinstance(query, Composable):
+            query = query.as_bytes(tx)
+        elif isinstance(query, str):
+            query = query.encode(tx.encoding)
+        self._raw = query
+
+        (
+            self.query,
+            self._want_formats,
+            self._order,
+            self._parts,
+        ) = _query2pg(query, tx.encoding)
+        self._encoding = tx.encoding
+
+    def _bind(
+        self, tx: "Transformer", vars: Optional[Params]
+    ) -> PostgresQuery:
+        """
+        Return a `PostgresQuery` for the query and the parameters *vars*.
+
+        The parameters are dumped by *tx*, the transformer of the cursor
+        executing the query. The query is converted again if the client
+        encoding has changed since the last conversion.
+        """
+        if tx.encoding != self._encoding:
+            self._convert(tx)
+
+        pgq = PostgresQuery(tx)
+        if vars is not None:
+            pgq.query = self.query
+            pgq._want_formats = self._want_formats
+            pgq._order = self._order
+            pgq._parts = self._parts
+        else:
+            # Mimic what would happen executing the query as a string
+            pgq.query = self._raw
+        pgq.dump(vars)
+        return pgq
+
+
+def _query2pg(query: Union[bytes, str], encoding: str) -> ConvertedQuery:
     """
     Convert Python query and params into something Postgres understands.
 
@@ -123,7 +285,7 @@ def _query2pg(
             f" got {type(query).__name__} instead"
         )
 
-    parts = _split_query(query, encoding)
+    parts = split_query(query, encoding)
     order: Optional[List[str]] = None
     chunks: List[bytes] = []
     formats = []
@@ -301,3 +463,13 @@ _ph_to_fmt = {
     b"t": Format.TEXT,
     b"b": Format.BINARY,
 }
+
+
+# Override functions with fast versions if available
+if pq.__impl__ == "c":
+    from psycopg3_c import _psycopg3
+
+    split_query = _psycopg3.split_query
+
+else:
+    split_query = _split_query
@@ -0,0 +1,184 @@
+"""
+Support for the instrumentation of the queries executed
+"""
+
+# Copyright (C) 2020-2021 The Psycopg Team
+
+from time import monotonic
+from typing import Callable, NamedTuple, Optional, Sequence, TYPE_CHECKING
+
+from . import errors as e
+from .proto import PQGen, RV, Params, Query
+
+if TYPE_CHECKING:
+    from .pq.proto import PGresult
+    from ._queries import PostgresQuery
+
+
+class QueryTrace(NamedTuple):
+    """Timings and counters about an operation performed by a cursor."""
+
+    operation: str
+    """The operation traced: ``execute``, ``executemany`` or ``fetch``."""
+
+    query: bytes
+    """The query, as sent to the server."""
+
+    prepared: bool
+    """True if the query was executed as a prepared statement."""
+
+    convert_time: float
+    """Time spent converting the query to the server format."""
+
+    dump_time: float
+    """Time spent adapting the parameters."""
+
+    send_time: float
+    """Time spent passing the query to the server."""
+
+    wait_time: float
+    """Time spent waiting for the results from the server."""
+
+    load_time: float
+    """Time spent converting the results to Python objects."""
+
+    bytes_sent: int
+    """Size of the query and of its parameters."""
+
+    bytes_received: int
+    """Memory used by the results (0 if the libpq can't tell it)."""
+
+    rows: int
+    """Number of rows received or, for ``fetch``, returned."""
+
+
+QueryTrace.__module__ = "psycopg3"
+
+TraceHandler = Callable[[QueryTrace], None]
+
+
+class Tracer:
+    """
+    Accumulate the timings of a query execution to build a `QueryTrace`.
+    """
+
+    __slots__ = """
+        operation convert_time dump_time send_time wait_time
+        """.split()
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.convert_time = 0.0
+        self.dump_time = 0.0
+        self.send_time = 0.0
+        self.wait_time = 0.0
+
+    def convert(
+        self, pgq: "PostgresQuery", query: Query, vars: Optional[Params]
+    ) -> None:
+        """Convert *query* and dump *vars* into *pgq*, timing the phases."""
+        t0 = monotonic()
+        pgq.convert_query(query, vars)
+        t1 = monotonic()
+        pgq.dump(vars)
+        self.convert_time += t1 - t0
+        self.dump_time += monotonic() - t1
+
+    def dump(self, pgq: "PostgresQuery", vars: Optional[Params]) -> None:
+        """Dump *vars* into *pgq*, timing the operation."""
+        t0 = monotonic()
+        pgq.dump(vars)
+        self.dump_time += monotonic() - t0
+
+    def send_gen(self, gen: PQGen[RV]) -> PQGen[RV]:
+        """
+        Run a generator sending a query, timing the send and the wait phases.
+
+        The send phase lasts until the generator must wait for the first time
+        (normally because all the query was sent and the server is processing
+        it); the wait phase until all the results are received.
+        """
+        t0 = monotonic()
+        try:
+            s = next(gen)
+        except StopIteration as ex:
+            self.send_time += monotonic() - t0
+            rv: RV = ex.value
+            return rv
+
+        t1 = monotonic()
+        self.send_time += t1 - t0
+        try:
+            while 1:
+                ready = yield s
+                s = gen.send(ready)
+        except StopIteration as ex:
+            rv = ex.value
+        self.wait_time += monotonic() - t1
+        return rv
+
+    def trace(
+        self,
+        pgq: "PostgresQuery",
+        prepared: bool,
+        results: Sequence["PGresult"],
+    ) -> QueryTrace:
+        """Return the trace of the execution of *pgq* returning *results*."""
+        sent = len(pgq.query)
+        if pgq.params:
+            sent += sum(len(p) for p in pgq.params if p is not None)
+
+        received = rows = 0
+        for res in results:
+            rows += res.ntuples
+            received += _result_size(res)
+
+        return QueryTrace(
+            self.operation,
+            pgq.query,
+            prepared,
+            self.convert_time,
+            self.dump_time,
+            self.send_time,
+            self.wait_time,
+            0.0,
+            sent,
+            received,
+            rows,
+        )
+
+
+def fetch_trace(
+    last: Optional[QueryTrace], query: bytes, load_time: float, rows: int
+) -> QueryTrace:
+    """
+    Return the trace of a fetch operation.
+
+    *last* is the trace of the query which produced the result, if available.
+    """
+    if last is None:
+        last = QueryTrace("", query, False, 0.0, 0.0, 0.0, 0.0, 0.0, 0, 0, 0)
+    return last._replace(
+        operation="fetch",
+        convert_time=0.0,
+        dump_time=0.0,
+        send_time=0.0,
+        wait_time=0.0,
+        load_time=load_time,
+        bytes_sent=0,
+        bytes_received=0,
+        rows=rows,
+    )
+
+
+def _result_size(res: "PGresult") -> int:
+    """
+    Return the memory used by a result, or 0 if the libpq can't tell it.
+
+    Measuring the size of the data would require to scan all the values, as
+    expensive as loading them.
+    """
+    try:
+        return res.memory_size
+    except e.NotSupportedError:
+        return 0
@@ -4,6 +4,7 @@ Helper object to transform values between Python and PostgreSQL
 
 # Copyright (C) 2020-2021 The Psycopg Team
 
+from time import monotonic
 from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from typing import DefaultDict, TYPE_CHECKING
 from collections import defaultdict
@@ -11,13 +12,14 @@ from collections import defaultdict
 from . import pq
 from . import errors as e
 from .oids import INVALID_OID
-from .proto import LoadFunc, AdaptContext
+from .proto import LoadFunc, AdaptContext, Buffer
 from ._enums import Format
 
 if TYPE_CHECKING:
     from .pq.proto import PGresult
     from .adapt import Dumper, Loader, AdaptersMap
     from .connection import BaseConnection
+    from ._profiling import AdaptersProfile
 
 DumperKey = Union[type, Tuple[type, ...]]
 DumperCache = Dict[DumperKey, "Dumper"]
@@ -51,6 +53,13 @@ class Transformer(AdaptContext):
             self._adapters = global_adapters
             self._conn = None
 
+        self._encoding = ""
+
+        # The profile collecting statistics about the adapters, if any
+        self.profile: Optional["AdaptersProfile"] = (
+            self._conn.adapters_profile if self._conn else None
+        )
+
         # mapping class, fmt -> Dumper instance
         self._dumpers_cache: DefaultDict[Format, DumperCache] = defaultdict(
             dict
@@ -73,24 +82,48 @@ class Transformer(AdaptContext):
     def adapters(self) -> "AdaptersMap":
         return self._adapters
 
+    @property
+    def encoding(self) -> str:
+        """The Python codec name of the connection encoding."""
+        if not self._encoding:
+            conn = self._conn
+            self._encoding = conn.client_encoding if conn else "utf-8"
+        return self._encoding
+
     @property
     def pgresult(self) -> Optional["PGresult"]:
         return self._pgresult
 
     @pgresult.setter
     def pgresult(self, result: Optional["PGresult"]) -> None:
+        self.set_pgresult(result)
+
+    def set_pgresult(
+        self, result: Optional["PGresult"], set_loaders: bool = True
+    ) -> None:
+        """
+        Set the result to load rows from.
+
+        If *set_loaders* is false the loaders are not chosen again: the
+        result must have the same columns of the one previously set.
+        """
         self._pgresult = result
-        rc = self._row_loaders = []
 
         self._ntuples: int
         self._nfields: int
         if not result:
             self._nfields = self._ntuples = 0
+            if set_loaders:
+                self._row_loaders = []
             return
 
         nf = self._nfields = result.nfields
         self._ntuples = result.ntuples
 
+        if not set_loaders:
+            return
+
+        rc = self._row_loaders = []
         for i in range(nf):
             oid = result.ftype(i)
             fmt = result.fformat(i)
@@ -108,7 +141,7 @@ class Transformer(AdaptContext):
     def dump_sequence(
         self, params: Sequence[Any], formats: Sequence[Format]
     ) -> Tuple[List[Any], Tuple[int, ...], Sequence[pq.Format]]:
-        ps: List[Optional[bytes]] = [None] * len(params)
+        ps: List[Optional[Buffer]] = [None] * len(params)
         ts = [INVALID_OID] * len(params)
         fs: List[pq.Format] = [pq.Format.TEXT] * len(params)
 
@@ -122,7 +155,12 @@ class Transformer(AdaptContext):
                 dumper = dumpers[i]
                 if not dumper:
                     dumper = dumpers[i] = self.get_dumper(param, formats[i])
-                ps[i] = dumper.dump(param)
+                if self.profile is None:
+                    ps[i] = dumper.dump(param)
+                else:
+                    t0 = monotonic()
+                    ps[i] = b = dumper.dump(param)
+                    self.profile.add_dump(dumper, len(b), monotonic() - t0)
                 ts[i] = dumper.oid
                 fs[i] = dumper.format
 
@@ -167,6 +205,9 @@ class Transformer(AdaptContext):
                 f"rows must be included between 0 and {self._ntuples}"
             )
 
+        if self.profile is not None:
+            return self._load_rows_profiled(row0, row1)
+
         records: List[Tuple[Any, ...]]
         records = [None] * (row1 - row0)  # type: ignore[list-item]
         for row in range(row0, row1):
@@ -187,6 +228,9 @@ class Transformer(AdaptContext):
         if not 0 <= row < self._ntuples:
             return None
 
+        if self.profile is not None:
+            return self._load_rows_profiled(row, row + 1)[0]
+
         record: List[Any] = [None] * self._nfields
         for col in range(self._nfields):
             val = res.get_value(row, col)
@@ -204,11 +248,68 @@ class Transformer(AdaptContext):
                 f" {len(self._row_loaders)} loaders registered"
             )
 
+        if self.profile is not None:
+            return self._load_sequence_profiled(record)
+
         return tuple(
             (self._row_loaders[i](val) if val is not None else None)
             for i, val in enumerate(record)
         )
 
+    def _load_rows_profiled(
+        self, row0: int, row1: int
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Implement `load_rows()` timing the loaders.
+
+        The result is loaded by column, so that the time spent in each loader
+        can be measured without timing every value.
+        """
+        res = self._pgresult
+        profile = self.profile
+        assert res and profile
+
+        columns = []
+        for col in range(self._nfields):
+            load = self._row_loaders[col]
+            values: List[Any] = [None] * (row1 - row0)
+            calls = nbytes = 0
+            t0 = monotonic()
+            for row in range(row0, row1):
+                val = res.get_value(row, col)
+                if val is not None:
+                    values[row - row0] = load(val)
+                    calls += 1
+                    nbytes += len(val)
+            t1 = monotonic()
+            if calls:
+                loader = load.__self__  # type: ignore[attr-defined]
+                profile.add_load(loader, calls, nbytes, t1 - t0)
+            columns.append(values)
+
+        if not columns:
+            return [()] * (row1 - row0)
+        return list(zip(*columns))
+
+    def _load_sequence_profiled(
+        self, record: Sequence[Optional[bytes]]
+    ) -> Tuple[Any, ...]:
+        """Implement `load_sequence()` timing the loaders."""
+        profile = self.profile
+        assert profile
+
+        out: List[Any] = [None] * len(record)
+        for i, val in enumerate(record):
+            if val is not None:
+                load = self._row_loaders[i]
+                t0 = monotonic()
+                out[i] = load(val)
+                t1 = monotonic()
+                loader = load.__self__  # type: ignore[attr-defined]
+                profile.add_load(loader, 1, len(val), t1 - t0)
+
+        return tuple(out)
+
     def get_loader(self, oid: int, format: pq.Format) -> "Loader":
         try:
             return self._loaders_cache[format][oid]
@@ -4,8 +4,9 @@ Entry point into the adaptation system.
 
 # Copyright (C) 2020-2021 The Psycopg Team
 
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Type, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Type, Tuple, Union
 from typing import cast, TYPE_CHECKING, TypeVar
 
 from . import pq
@@ -14,6 +15,8 @@ from . import errors as e
 from ._enums import Format as Format
 from .oids import builtins
 from .proto import AdaptContext, Buffer as Buffer
+from ._profiling import AdaptersProfile as AdaptersProfile  # noqa: F401
+from ._profiling import AdapterStats as AdapterStats  # noqa: F401
 
 if TYPE_CHECKING:
     from .connection import BaseConnection
@@ -138,6 +141,10 @@ class AdaptersMap(AdaptContext):
     Copies are copy-on-write: if the maps are updated make a copy. This way
     extending e.g. global map by a connection or a connection map from a cursor
     is cheap: a copy is made only on customisation.
+
+    The population of the map can be deferred to its first use by setting
+    `!_init_func`: the global map uses it in order to avoid importing all the
+    adapters at import time.
     """
 
     _dumpers: List[Dict[Union[type, str], Type["Dumper"]]]
@@ -146,8 +153,15 @@ class AdaptersMap(AdaptContext):
     # Record if a dumper or loader has an optimised version.
     _optimised: Dict[type, type] = {}
 
+    # Function to call to populate the map on first use.
+    _init_func: Optional[Callable[["AdaptersMap"], None]] = None
+    _initializing = False
+    _init_lock = threading.RLock()
+
     def __init__(self, extend: Optional["AdaptersMap"] = None):
         if extend:
+            if extend._init_func:
+                extend._initialize()
             self._dumpers = extend._dumpers[:]
             self._own_dumpers = [False, False]
             self._loaders = extend._loaders[:]
@@ -167,6 +181,21 @@ class AdaptersMap(AdaptContext):
     def connection(self) -> Optional["BaseConnection"]:
         return None
 
+    def _initialize(self) -> None:
+        """Call the function populating the map, if not done yet."""
+        # Other threads wait for the map to be populated. The function calls
+        # back into the map from the same thread to register the adapters.
+        with self._init_lock:
+            f = self._init_func
+            if not f or self._initializing:
+                return
+            self._initializing = True
+            try:
+                f(self)
+            finally:
+                self._initializing = False
+            self._init_func = None
+
     def register_dumper(
         self, cls: Union[type, str], dumper: Type[Dumper]
     ) -> None:
@@ -178,6 +207,9 @@ class AdaptersMap(AdaptContext):
                 f"dumpers should be registered on classes, got {cls} instead"
             )
 
+        if self._init_func:
+            self._initialize()
+
         dumper = self._get_optimised(dumper)
         fmt = dumper.format
         if not self._own_dumpers[fmt]:
@@ -195,6 +227,9 @@ class AdaptersMap(AdaptContext):
                 f"loaders should be registered on oid, got {oid} instead"
             )
 
+        if self._init_func:
+            self._initialize()
+
         loader = self._get_optimised(loader)
         fmt = loader.format
         if not self._own_loaders[fmt]:
@@ -209,6 +244,9 @@ class AdaptersMap(AdaptContext):
 
         Raise ProgrammingError if a class is not available.
         """
+        if self._init_func:
+            self._initialize()
+
         if format == Format.AUTO:
             # When dumping a string with %s we may refer to any type actually,
             # but the user surely passed a text format
@@ -253,6 +291,9 @@ class AdaptersMap(AdaptContext):
 
         Return None if not found.
         """
+        if self._init_func:
+            self._initialize()
+
         return self._loaders[format].get(oid)
 
     @classmethod
@@ -29,12 +29,16 @@ from . import waiting
 from . import encodings
 from .pq import ConnStatus, ExecStatus, TransactionStatus, Format
 from .sql import Composable
-from .proto import PQGen, PQGenConn, RV, Query, Params, AdaptContext
+from .proto import PQGen, PQGenConn, RV, Query, AnyQuery, Params
+from .proto import AdaptContext
 from .proto import ConnectionType
 from .conninfo import make_conninfo
 from .generators import notifies
 from .transaction import Transaction, AsyncTransaction
-from ._preparing import PrepareManager
+from ._queries import QueryCache, QueryCacheInfo, PreparedQuery
+from ._preparing import PrepareManager, PreparedInfo, PreparedStatement
+from ._tracing import QueryTrace, TraceHandler
+from ._profiling import AdaptersProfile
 
 logger = logging.getLogger(__name__)
 package_logger = logging.getLogger("psycopg3")
@@ -110,6 +114,7 @@ class BaseConnection(AdaptContext):
         self._adapters = adapt.AdaptersMap(adapt.global_adapters)
         self._notice_handlers: List[NoticeHandler] = []
         self._notify_handlers: List[NotifyHandler] = []
+        self._trace_handlers: List[TraceHandler] = []
 
         # Stack of savepoint names managed by current transaction blocks.
         # the first item is "" in case the outermost Transaction must manage
@@ -117,6 +122,19 @@ class BaseConnection(AdaptContext):
         self._savepoints: List[str] = []
 
         self._prepared: PrepareManager = PrepareManager()
+        self._query_cache = QueryCache()
+
+        self.adapters_profile: Optional[AdaptersProfile] = None
+        """
+        Collect statistics about the dumpers and loaders used, if set.
+        """
+
+        # Cache of the client encoding, both in Postgres and Python names.
+        # The cache is checked again after every communication with the server
+        # as a ParameterStatus message may have been received meanwhile.
+        self._pgenc = b""
+        self._encoding = "utf-8"
+        self._check_encoding = True
 
         wself = ref(self)
 
@@ -180,8 +198,14 @@ class BaseConnection(AdaptContext):
     @property
     def client_encoding(self) -> str:
         """The Python codec name of the connection's client encoding."""
-        pgenc = self.pgconn.parameter_status(b"client_encoding") or b"UTF8"
-        return encodings.pg2py(pgenc)
+        if self._check_encoding:
+            pgenc = self.pgconn.parameter_status(b"client_encoding") or b"UTF8"
+            if pgenc != self._pgenc:
+                self._encoding = encodings.pg2py(pgenc)
+                self._pgenc = pgenc
+            self._check_encoding = False
+
+        return self._encoding
 
     @client_encoding.setter
     def client_encoding(self, name: str) -> None:
@@ -267,6 +291,28 @@ class BaseConnection(AdaptContext):
         for cb in self._notify_handlers:
             cb(n)
 
+    def add_trace_handler(self, callback: TraceHandler) -> None:
+        """
+        Register a callable to be invoked with the trace of every operation.
+        """
+        self._trace_handlers.append(callback)
+
+    def remove_trace_handler(self, callback: TraceHandler) -> None:
+        """
+        Unregister a trace callable previously registered.
+        """
+        self._trace_handlers.remove(callback)
+
+    def _emit_trace(self, trace: QueryTrace) -> None:
+        # Iterate on a copy: a handler may remove itself
+        for cb in self._trace_handlers[:]:
+            try:
+                cb(trace)
+            except Exception as ex:
+                package_logger.exception(
+                    "error processing trace callback '%s': %s", cb, ex
+                )
+
     @property
     def prepare_threshold(self) -> Optional[int]:
         """
@@ -298,6 +344,52 @@ class BaseConnection(AdaptContext):
     def prepared_max(self, value: int) -> None:
         self._prepared.prepared_max = value
 
+    def prepared_info(self) -> PreparedInfo:
+        """
+        Return statistics about the use of the prepared statements.
+        """
+        return self._prepared.info()
+
+    def prepared_statements(self) -> List[PreparedStatement]:
+        """
+        Return the statements currently prepared on the connection.
+        """
+        return self._prepared.statements()
+
+    @property
+    def query_cache_size(self) -> int:
+        """
+        Maximum number of queries whose conversion is cached.
+
+        The conversion of the ``%s`` placeholders of the queries executed with
+        parameters is kept in a LRU cache. Setting the value to 0 disables the
+        cache.
+
+        Default value: 128
+        """
+        return self._query_cache.maxsize
+
+    @query_cache_size.setter
+    def query_cache_size(self, value: int) -> None:
+        self._query_cache.maxsize = value
+
+    def query_cache_info(self) -> QueryCacheInfo:
+        """
+        Return statistics about the use of the queries conversion cache.
+        """
+        return self._query_cache.info()
+
+    def prepare_query(
+        self, query: Query, prepare: Optional[bool] = None
+    ) -> PreparedQuery:
+        """
+        Convert a query in advance to execute it repeatedly.
+
+        The object returned can be passed to `Cursor.execute()` in place of
+        the query string, on any cursor of the connection.
+        """
+        return PreparedQuery(self, query, prepare=prepare)
+
     # Generators to perform high-level operations on the connection
     #
     # These operations are expressed in terms of non-blocking generators
@@ -392,6 +484,11 @@ class BaseConnection(AdaptContext):
 
         yield from self._exec_command(b"rollback")
 
+    def _clear_prepared_gen(self) -> PQGen[None]:
+        """Generator implementing `Connection.clear_prepared()`."""
+        yield from self._exec_command(b"deallocate all")
+        self._prepared.clear()
+
 
 class Connection(BaseConnection):
     """
@@ -460,7 +557,7 @@ class Connection(BaseConnection):
 
     def execute(
         self,
-        query: Query,
+        query: AnyQuery,
         params: Optional[Params] = None,
         prepare: Optional[bool] = None,
     ) -> "Cursor":
@@ -478,6 +575,11 @@ class Connection(BaseConnection):
         with self.lock:
             self.wait(self._rollback_gen())
 
+    def clear_prepared(self) -> None:
+        """Deallocate all the prepared statements of the connection."""
+        with self.lock:
+            self.wait(self._clear_prepared_gen())
+
     @contextmanager
     def transaction(
         self,
@@ -516,7 +618,10 @@ class Connection(BaseConnection):
         The function must be used on generators that don't change connection
         fd (i.e. not on connect and reset).
         """
-        return waiting.wait(gen, self.pgconn.socket, timeout=timeout)
+        try:
+            return waiting.wait(gen, self.pgconn.socket, timeout=timeout)
+        finally:
+            self._check_encoding = True
 
     @classmethod
     def _wait_conn(
@@ -597,7 +702,7 @@ class AsyncConnection(BaseConnection):
 
     async def execute(
         self,
-        query: Query,
+        query: AnyQuery,
         params: Optional[Params] = None,
         prepare: Optional[bool] = None,
     ) -> "AsyncCursor":
@@ -612,6 +717,10 @@ class AsyncConnection(BaseConnection):
         async with self.lock:
             await self.wait(self._rollback_gen())
 
+    async def clear_prepared(self) -> None:
+        async with self.lock:
+            await self.wait(self._clear_prepared_gen())
+
     @asynccontextmanager
     async def transaction(
         self,
@@ -637,7 +746,10 @@ class AsyncConnection(BaseConnection):
                 yield n
 
     async def wait(self, gen: PQGen[RV]) -> RV:
-        return await waiting.wait_async(gen, self.pgconn.socket)
+        try:
+            return await waiting.wait_async(gen, self.pgconn.socket)
+        finally:
+            self._check_encoding = True
 
     @classmethod
     async def _wait_conn(cls, gen: PQGenConn[RV]) -> RV:
@@ -4,22 +4,26 @@ psycopg3 copy support
 
 # Copyright (C) 2020-2021 The Psycopg Team
 
+import io
+import os
 import re
+import mmap
 import queue
 import struct
 import asyncio
 import threading
 from abc import ABC, abstractmethod
 from types import TracebackType
-from typing import TYPE_CHECKING, AsyncIterator, Iterator, Generic, Union
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, Iterator, Generic
+from typing import IO, Callable, Union
 from typing import Any, Dict, List, Match, Optional, Sequence, Type, Tuple
 
 from . import pq
 from . import errors as e
 from .pq import ExecStatus
 from .oids import builtins
-from .adapt import Format
-from .proto import ConnectionType, PQGen, Transformer
+from .adapt import Format, Dumper
+from .proto import Buffer, ConnectionType, PQGen, Transformer
 from .generators import copy_from, copy_to, copy_end
 
 if TYPE_CHECKING:
@@ -30,6 +34,9 @@ if TYPE_CHECKING:
 TEXT = pq.Format.TEXT
 BINARY = pq.Format.BINARY
 
+# A file to copy data from or to: a path, a file descriptor, or a file object.
+CopyFile = Union[str, "os.PathLike[str]", int, IO[Any]]
+
 
 class BaseCopy(Generic[ConnectionType]):
     """
@@ -50,6 +57,15 @@ class BaseCopy(Generic[ConnectionType]):
     # Each buffer around Formatter.BUFFER_SIZE size
     QUEUE_SIZE = 1024
 
+    # Size of the blocks read from or written to files, and of the buffer
+    # used by read_block() if none is specified.
+    BLOCK_SIZE = 1024 * 1024
+
+    # Max number of bytes waiting in the write queue. Writing more data waits
+    # for the data queued to be sent; writing a single block larger than that
+    # raises an error. None means no limit.
+    MAX_QUEUED_SIZE: Optional[int] = None
+
     formatter: "Formatter"
 
     def __init__(self, cursor: "BaseCursor[ConnectionType]"):
@@ -70,6 +86,15 @@ class BaseCopy(Generic[ConnectionType]):
 
         self._finished = False
 
+        # Data received which didn't fit in the buffer passed to read_block()
+        self._pending: Optional[memoryview] = None
+        self._block_buffer: Optional[bytearray] = None
+
+        # Bytes put in the write queue and sent to the server by the worker.
+        # Each counter is only updated on one side of the queue.
+        self._bytes_queued = 0
+        self._bytes_sent = 0
+
     def __repr__(self) -> str:
         cls = f"{self.__class__.__module__}.{self.__class__.__qualname__}"
         info = pq.misc.connection_summary(self._pgconn)
@@ -79,30 +104,59 @@ class BaseCopy(Generic[ConnectionType]):
         if self._finished:
             raise TypeError("copy blocks can be used only once")
 
+    @property
+    def queued_size(self) -> int:
+        """The number of bytes written and waiting to be sent to the server."""
+        return self._bytes_queued - self._bytes_sent
+
+    def _check_queued_size(self, data: Buffer) -> bool:
+        """
+        Return True if queueing *data* would exceed `MAX_QUEUED_SIZE`.
+
+        Raise OperationalError if *data* alone exceeds it.
+        """
+        max_size = self.MAX_QUEUED_SIZE
+        if max_size is None:
+            return False
+        if len(data) > max_size:
+            raise e.OperationalError(
+                f"can't write {len(data)} bytes of copy data:"
+                f" the limit is {max_size} bytes"
+            )
+        return self.queued_size + len(data) > max_size
+
     def set_types(self, types: Sequence[Union[int, str]]) -> None:
         """
-        Set the types expected out of a :sql:`COPY TO` operation.
+        Set the types expected in and out of a :sql:`COPY` operation.
 
         Without setting the types, the data from :sql:`COPY TO` will be
-        returned as unparsed strings or bytes.
+        returned as unparsed strings or bytes. In a binary :sql:`COPY FROM`
+        the values in each column are dumped as the type specified,
+        regardless of their Python type.
 
         The types must be specified as a sequence of oid or PostgreSQL type
-        names (e.g. ``int4``, ``timestamptz[]``).
+        names (e.g. ``int4``, ``timestamptz[]``). The names of custom types
+        can be used if the types of the database were already read using
+        `~psycopg3.types.DatabaseTypes.fetch()`.
+        """
+        oids = [t if isinstance(t, int) else self._get_oid(t) for t in types]
+        if self._pgresult.status == ExecStatus.COPY_IN:
+            self.formatter.set_dumper_types(oids)
+        else:
+            self.formatter.transformer.set_row_types(
+                oids, [self.formatter.format] * len(types)
+            )
 
-        .. admonition:: TODO
+    def _get_oid(self, name: str) -> int:
+        try:
+            return builtins.get_oid(name)
+        except KeyError:
+            from .types.database import DatabaseTypes
 
-            Only builtin names are supprted for the moment. In order to specify
-            custom data types you must use their oid.
-
-        """
-        # TODO: should allow names of non-builtin types
-        # Must put a types map on the context.
-        oids = [
-            t if isinstance(t, int) else builtins.get_oid(t) for t in types
-        ]
-        self.formatter.transformer.set_row_types(
-            oids, [self.formatter.format] * len(types)
-        )
+            dbtypes = DatabaseTypes.cached(self.connection)
+            if not dbtypes:
+                raise
+            return dbtypes.get_oid(name)
 
     # High level copy protocol generators (state change of the Copy object)
 
@@ -110,6 +164,10 @@ class BaseCopy(Generic[ConnectionType]):
         if self._finished:
             return memoryview(b"")
 
+        if self._pending is not None:
+            data, self._pending = self._pending, None
+            return data
+
         res = yield from copy_from(self._pgconn)
         if isinstance(res, memoryview):
             return res
@@ -120,6 +178,40 @@ class BaseCopy(Generic[ConnectionType]):
         self.cursor._rowcount = nrows if nrows is not None else -1
         return memoryview(b"")
 
+    def _read_block_gen(
+        self, buffer: Optional[bytearray] = None
+    ) -> PQGen[memoryview]:
+        if self._finished:
+            return memoryview(b"")
+
+        if buffer is None:
+            if self._block_buffer is None:
+                self._block_buffer = bytearray(self.BLOCK_SIZE)
+            buffer = self._block_buffer
+
+        pos = 0
+        if self._pending is not None:
+            data, self._pending = self._pending, None
+            pos = len(data)
+            if pos > len(buffer):
+                return data
+            buffer[:pos] = data
+
+        pos, res = yield from copy_from_block(self._pgconn, buffer, pos)
+        if isinstance(res, memoryview):
+            if not pos:
+                # A row larger than the whole buffer
+                return res
+            self._pending = res
+
+        elif res is not None:
+            # res is the final PGresult
+            self._finished = True
+            nrows = res.command_tuples
+            self.cursor._rowcount = nrows if nrows is not None else -1
+
+        return memoryview(buffer)[:pos]
+
     def _read_row_gen(self) -> PQGen[Optional[Tuple[Any, ...]]]:
         data = yield from self._read_gen()
         if not data:
@@ -134,6 +226,98 @@ class BaseCopy(Generic[ConnectionType]):
 
         return row
 
+    def _write_from_gen(self, source: CopyFile) -> PQGen[None]:
+        # The file contains data in copy format, binary signature included
+        self.formatter.write(b"")
+
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):
+                    # Empty file or not a regular file (e.g. a fifo)
+                    yield from self._write_file_gen(f)
+                else:
+                    yield from self._write_mmap_gen(mm)
+
+        elif isinstance(source, int):
+            with open(source, "rb", closefd=False) as f:
+                yield from self._write_file_gen(f)
+
+        else:
+            yield from self._write_file_gen(source)
+
+    def _write_mmap_gen(self, mm: mmap.mmap) -> PQGen[None]:
+        size = self.BLOCK_SIZE
+        try:
+            # Send slices of the mapped file, without copying them in memory
+            view = memoryview(mm)
+            for i in range(0, len(view), size):
+                yield from copy_to(self._pgconn, view[i : i + size])
+            view.release()
+        finally:
+            try:
+                mm.close()
+            except BufferError:
+                # A slice is still referenced (e.g. by a traceback): the map
+                # will be closed when it's garbage collected.
+                pass
+
+    def _write_file_gen(self, f: IO[Any]) -> PQGen[None]:
+        size = self.BLOCK_SIZE
+        if isinstance(f, io.TextIOBase):
+            encoding = self.connection.client_encoding
+            while True:
+                text = f.read(size)
+                if not text:
+                    break
+                yield from copy_to(self._pgconn, text.encode(encoding))
+            return
+
+        # Read all the blocks in the same buffer
+        buf = bytearray(size)
+        view = memoryview(buf)
+        readinto = getattr(f, "readinto", None)
+        while True:
+            if readinto:
+                n = readinto(buf)
+            else:
+                data = f.read(size)
+                n = len(data)
+                view[:n] = data
+            if not n:
+                break
+            yield from copy_to(self._pgconn, view[:n])
+
+    def _read_into_gen(self, target: CopyFile) -> PQGen[None]:
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, "wb") as f:
+                yield from self._read_file_gen(f)
+
+        elif isinstance(target, int):
+            with open(target, "wb", closefd=False) as f:
+                yield from self._read_file_gen(f)
+
+        else:
+            yield from self._read_file_gen(target)
+
+    def _read_file_gen(self, f: IO[Any]) -> PQGen[None]:
+        write: Callable[[memoryview], Any]
+        if isinstance(f, io.TextIOBase):
+            encoding = self.connection.client_encoding
+
+            def write(data: memoryview) -> None:
+                f.write(str(data, encoding))
+
+        else:
+            write = f.write
+
+        while True:
+            data = yield from self._read_block_gen()
+            if not data:
+                break
+            write(data)
+
     def _end_copy_gen(self, exc: Optional[BaseException]) -> PQGen[None]:
         bmsg: Optional[bytes]
         if exc:
@@ -156,7 +340,7 @@ class Copy(BaseCopy["Connection"]):
 
     def __init__(self, cursor: "Cursor"):
         super().__init__(cursor)
-        self._queue: queue.Queue[Optional[bytes]] = queue.Queue(
+        self._queue: queue.Queue[Optional[Buffer]] = queue.Queue(
             maxsize=self.QUEUE_SIZE
         )
         self._worker: Optional[threading.Thread] = None
@@ -191,6 +375,17 @@ class Copy(BaseCopy["Connection"]):
         """
         return self.connection.wait(self._read_gen())
 
+    def read_block(self, buffer: Optional[bytearray] = None) -> memoryview:
+        """
+        Read a block of rows after a :sql:`COPY TO` operation.
+
+        The rows are copied into *buffer*, as many as it can contain, or into
+        a buffer allocated by the `!Copy` object if not specified. Return a
+        view of the part of the buffer filled, valid until the next read, or
+        an empty string when the data is finished.
+        """
+        return self.connection.wait(self._read_block_gen(buffer))
+
     def rows(self) -> Iterator[Tuple[Any, ...]]:
         """
         Iterate on the result of a :sql:`COPY TO` operation record by record.
@@ -230,6 +425,36 @@ class Copy(BaseCopy["Connection"]):
         data = self.formatter.write_row(row)
         self._write(data)
 
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        """
+        Write several records to a table after a :sql:`COPY FROM` operation.
+
+        Equivalent to calling `write_row()` for each record, but faster.
+        """
+        for data in self.formatter.write_rows(rows):
+            self._write(data)
+
+    def write_from(self, source: CopyFile) -> None:
+        """
+        Write the content of a file to a table after a :sql:`COPY FROM`.
+
+        *source* can be a file path, a file descriptor, or a file object
+        opened in binary or text mode. The data must be in the format of the
+        :sql:`COPY` operation.
+        """
+        # Make sure the data already written goes before the file
+        self._write_join()
+        self.connection.wait(self._write_from_gen(source))
+
+    def read_into(self, target: CopyFile) -> None:
+        """
+        Write the data from a :sql:`COPY TO` operation to a file.
+
+        *target* can be a file path, a file descriptor, or a file object
+        opened in binary or text mode.
+        """
+        self.connection.wait(self._read_into_gen(target))
+
     def finish(self, exc: Optional[BaseException]) -> None:
         """Terminate the copy operation and free the resources allocated.
 
@@ -258,25 +483,33 @@ class Copy(BaseCopy["Connection"]):
             if not data:
                 break
             self.connection.wait(copy_to(self._pgconn, data))
+            self._bytes_sent += len(data)
 
-    def _write(self, data: bytes) -> None:
+    def _write(self, data: Buffer) -> None:
         if not data:
             return
 
+        if self._check_queued_size(data):
+            self._write_join()
+
         if not self._worker:
             # warning: reference loop, broken by _write_end
             self._worker = threading.Thread(target=self.worker)
             self._worker.daemon = True
             self._worker.start()
 
+        self._bytes_queued += len(data)
         self._queue.put(data)
 
     def _write_end(self) -> None:
         data = self.formatter.end()
         self._write(data)
-        self._queue.put(None)
+        self._write_join()
 
+    def _write_join(self) -> None:
+        """Wait for the worker to send all the data in the queue."""
         if self._worker:
+            self._queue.put(None)
             self._worker.join()
             self._worker = None  # break the loop
 
@@ -288,7 +521,7 @@ class AsyncCopy(BaseCopy["AsyncConnection"]):
 
     def __init__(self, cursor: "AsyncCursor"):
         super().__init__(cursor)
-        self._queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(
+        self._queue: asyncio.Queue[Optional[Buffer]] = asyncio.Queue(
             maxsize=self.QUEUE_SIZE
         )
         self._worker: Optional[asyncio.Future[None]] = None
@@ -315,6 +548,11 @@ class AsyncCopy(BaseCopy["AsyncConnection"]):
     async def read(self) -> memoryview:
         return await self.connection.wait(self._read_gen())
 
+    async def read_block(
+        self, buffer: Optional[bytearray] = None
+    ) -> memoryview:
+        return await self.connection.wait(self._read_block_gen(buffer))
+
     async def rows(self) -> AsyncIterator[Tuple[Any, ...]]:
         while True:
             record = await self.read_row()
@@ -333,6 +571,17 @@ class AsyncCopy(BaseCopy["AsyncConnection"]):
         data = self.formatter.write_row(row)
         await self._write(data)
 
+    async def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        for data in self.formatter.write_rows(rows):
+            await self._write(data)
+
+    async def write_from(self, source: CopyFile) -> None:
+        await self._write_join()
+        await self.connection.wait(self._write_from_gen(source))
+
+    async def read_into(self, target: CopyFile) -> None:
+        await self.connection.wait(self._read_into_gen(target))
+
     async def finish(self, exc: Optional[BaseException]) -> None:
         # no-op in COPY TO
         if self._pgresult.status == ExecStatus.COPY_OUT:
@@ -355,23 +604,30 @@ class AsyncCopy(BaseCopy["AsyncConnection"]):
             if not data:
                 break
             await self.connection.wait(copy_to(self._pgconn, data))
+            self._bytes_sent += len(data)
 
-    async def _write(self, data: bytes) -> None:
+    async def _write(self, data: Buffer) -> None:
         if not data:
             return
 
+        if self._check_queued_size(data):
+            await self._write_join()
+
         if not self._worker:
             # TODO: can be asyncio.create_task once Python 3.6 is dropped
             self._worker = asyncio.ensure_future(self.worker())
 
+        self._bytes_queued += len(data)
         await self._queue.put(data)
 
     async def _write_end(self) -> None:
         data = self.formatter.end()
         await self._write(data)
-        await self._queue.put(None)
+        await self._write_join()
 
+    async def _write_join(self) -> None:
         if self._worker:
+            await self._queue.put(None)
             await asyncio.gather(self._worker)
             self._worker = None  # break reference loops if any
 
@@ -386,11 +642,21 @@ class Formatter(ABC):
     # Size of data to accumulate before sending it down the network
     BUFFER_SIZE = 32 * 1024
 
+    # Max size the buffer can reach formatting records (it can exceed
+    # BUFFER_SIZE by up to a record). If a record makes the buffer larger
+    # than that an error is raised. None means no limit.
+    MAX_BUFFER_SIZE: Optional[int] = None
+
     def __init__(self, transformer: Transformer):
         self.transformer = transformer
         self._write_buffer = bytearray()
         self._row_mode = False  # true if the user is using write_row()
 
+    @property
+    def buffer_size(self) -> int:
+        """The number of bytes formatted and not yet returned."""
+        return len(self._write_buffer)
+
     @abstractmethod
     def parse_row(self, data: bytes) -> Optional[Tuple[Any, ...]]:
         ...
@@ -400,13 +666,31 @@ class Formatter(ABC):
         ...
 
     @abstractmethod
-    def write_row(self, row: Sequence[Any]) -> bytes:
+    def write_row(self, row: Sequence[Any]) -> Buffer:
         ...
 
     @abstractmethod
-    def end(self) -> bytes:
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> Iterator[Buffer]:
         ...
 
+    @abstractmethod
+    def end(self) -> Buffer:
+        ...
+
+    def set_dumper_types(self, oids: Sequence[int]) -> None:
+        """Set the types of the columns to write in row mode."""
+        pass
+
+    def _check_buffer_size(self) -> None:
+        max_size = self.MAX_BUFFER_SIZE
+        if max_size is not None and len(self._write_buffer) > max_size:
+            size = len(self._write_buffer)
+            self._write_buffer = bytearray()
+            raise e.OperationalError(
+                f"copy data formatted exceeds the buffer limit:"
+                f" {size} bytes, the limit is {max_size} bytes"
+            )
+
 
 class TextFormatter(Formatter):
 
@@ -427,19 +711,33 @@ class TextFormatter(Formatter):
         self._signature_sent = True
         return data
 
-    def write_row(self, row: Sequence[Any]) -> bytes:
+    def write_row(self, row: Sequence[Any]) -> Buffer:
         # Note down that we are writing in row mode: it means we will have
         # to take care of the end-of-copy marker too
         self._row_mode = True
 
         format_row_text(row, self.transformer, self._write_buffer)
+        self._check_buffer_size()
         if len(self._write_buffer) > self.BUFFER_SIZE:
             buffer, self._write_buffer = self._write_buffer, bytearray()
             return buffer
         else:
             return b""
 
-    def end(self) -> bytes:
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> Iterator[Buffer]:
+        self._row_mode = True
+
+        it = iter(rows)
+        while format_rows_text(
+            it, self.transformer, self._write_buffer, self.BUFFER_SIZE
+        ):
+            self._check_buffer_size()
+            buffer, self._write_buffer = self._write_buffer, bytearray()
+            yield buffer
+
+        self._check_buffer_size()
+
+    def end(self) -> Buffer:
         buffer, self._write_buffer = self._write_buffer, bytearray()
         return buffer
 
@@ -461,6 +759,14 @@ class BinaryFormatter(Formatter):
     def __init__(self, transformer: Transformer):
         super().__init__(transformer)
         self._signature_sent = False
+        self._dumpers: Any = None
+
+    def set_dumper_types(self, oids: Sequence[int]) -> None:
+        # In binary format the data must match the column types exactly:
+        # choose the dumpers now instead of looking at the values.
+        self._dumpers = prepare_row_dumpers(
+            [_get_binary_dumper(oid, self.transformer) for oid in oids]
+        )
 
     def parse_row(self, data: bytes) -> Optional[Tuple[Any, ...]]:
         if not self._signature_sent:
@@ -481,7 +787,7 @@ class BinaryFormatter(Formatter):
         self._signature_sent = True
         return data
 
-    def write_row(self, row: Sequence[Any]) -> bytes:
+    def write_row(self, row: Sequence[Any]) -> Buffer:
         # Note down that we are writing in row mode: it means we will have
         # to take care of the end-of-copy marker too
         self._row_mode = True
@@ -490,14 +796,45 @@ class BinaryFormatter(Formatter):
             self._write_buffer += _binary_signature
             self._signature_sent = True
 
-        format_row_binary(row, self.transformer, self._write_buffer)
+        if self._dumpers is None:
+            format_row_binary(row, self.transformer, self._write_buffer)
+        else:
+            format_rows_binary(
+                iter((row,)),
+                self.transformer,
+                self._write_buffer,
+                self.BUFFER_SIZE,
+                self._dumpers,
+            )
+        self._check_buffer_size()
         if len(self._write_buffer) > self.BUFFER_SIZE:
             buffer, self._write_buffer = self._write_buffer, bytearray()
             return buffer
         else:
             return b""
 
-    def end(self) -> bytes:
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> Iterator[Buffer]:
+        self._row_mode = True
+
+        if not self._signature_sent:
+            self._write_buffer += _binary_signature
+            self._signature_sent = True
+
+        it = iter(rows)
+        while format_rows_binary(
+            it,
+            self.transformer,
+            self._write_buffer,
+            self.BUFFER_SIZE,
+            self._dumpers,
+        ):
+            self._check_buffer_size()
+            buffer, self._write_buffer = self._write_buffer, bytearray()
+            yield buffer
+
+        self._check_buffer_size()
+
+    def end(self) -> Buffer:
         # If we have sent no data we need to send the signature
         # and the trailer
         if not self._signature_sent:
@@ -573,6 +910,122 @@ def _format_row_binary(
     return out
 
 
+def _format_rows_text(
+    rows: Iterator[Sequence[Any]], tx: Transformer, out: bytearray, size: int
+) -> bool:
+    """
+    Convert rows from an iterator to the data to send for copy.
+
+    Stop when *out* is larger than *size*. Return `!False` if there are no
+    more rows to read from *rows*.
+    """
+    for row in rows:
+        format_row_text(row, tx, out)
+        if len(out) > size:
+            return True
+    return False
+
+
+def _format_rows_binary(
+    rows: Iterator[Sequence[Any]],
+    tx: Transformer,
+    out: bytearray,
+    size: int,
+    dumpers: Optional[Sequence[Optional[Dumper]]] = None,
+) -> bool:
+    """
+    Convert rows from an iterator to the data to send for binary copy.
+
+    Stop when *out* is larger than *size*. Return `!False` if there are no
+    more rows to read from *rows*.
+
+    If *dumpers* is specified, it must be the value returned by
+    `prepare_row_dumpers()`: use its items, if not `!None`, to dump the values
+    in the respective columns, regardless of their type.
+    """
+    for row in rows:
+        pos = len(out)
+        try:
+            if dumpers is None:
+                format_row_binary(row, tx, out)
+            else:
+                _format_row_binary_dumpers(row, tx, out, dumpers)
+        except BaseException:
+            # Drop a row partially written
+            del out[pos:]
+            raise
+        if len(out) > size:
+            return True
+    return False
+
+
+def _prepare_row_dumpers(
+    dumpers: Sequence[Optional[Dumper]],
+) -> Sequence[Optional[Dumper]]:
+    """
+    Convert a sequence of dumpers to pass to `format_rows_binary()`.
+
+    Convert it only once if several calls use the same dumpers.
+    """
+    return list(dumpers)
+
+
+def _format_row_binary_dumpers(
+    row: Sequence[Any],
+    tx: Transformer,
+    out: bytearray,
+    dumpers: Sequence[Optional[Dumper]],
+) -> None:
+    out += _pack_int2(len(row))
+    ndumpers = len(dumpers)
+    for i, item in enumerate(row):
+        if item is not None:
+            dumper = dumpers[i] if i < ndumpers else None
+            if dumper is None:
+                dumper = tx.get_dumper(item, Format.BINARY)
+            b = dumper.dump(item)
+            out += _pack_int4(len(b))
+            out += b
+        else:
+            out += _binary_null
+
+
+def _get_binary_dumper(oid: int, tx: Transformer) -> Optional[Dumper]:
+    """
+    Return a dumper to convert Python objects to binary data of type *oid*.
+
+    Only the dumpers whose choice doesn't depend on the value dumped (i.e.
+    they don't implement `~Dumper.get_key()`) are considered. The dumpers of
+    arrays are built from the dumper of their element. Return `!None` if no
+    such dumper is found: the values will be dumped according to their type.
+    """
+    adapters = tx.adapters
+    adapters._initialize()
+    dmap = adapters._dumpers[pq.Format.BINARY]
+    for cls, dcls in dmap.items():
+        if not isinstance(cls, type):
+            continue
+        # C dumpers expose get_key() only if they override it
+        if getattr(dcls, "get_key", Dumper.get_key) is not Dumper.get_key:
+            continue
+        dumper = dcls(cls, tx)
+        if dumper.oid == oid:
+            return dumper
+
+    info = builtins.get(oid)
+    if info and info.array_oid == oid:
+        sub_dumper = _get_binary_dumper(info.oid, tx)
+        if sub_dumper:
+            from .types.array import ListBinaryDumper
+
+            ldumper = ListBinaryDumper(list, tx)
+            ldumper.sub_dumper = sub_dumper
+            ldumper.oid = oid
+            return ldumper
+
+    return None
+
+
 def _parse_row_text(data: bytes, tx: Transformer) -> Tuple[Any, ...]:
     if not isinstance(data, bytes):
         data = bytes(data)
@@ -646,11 +1099,21 @@ if pq.__impl__ == "c":
 
     format_row_text = _psycopg3.format_row_text
     format_row_binary = _psycopg3.format_row_binary
+    format_rows_text = _psycopg3.format_rows_text
+    format_rows_binary = _psycopg3.format_rows_binary
+    prepare_row_dumpers = _psycopg3.prepare_row_dumpers
     parse_row_text = _psycopg3.parse_row_text
     parse_row_binary = _psycopg3.parse_row_binary
+    copy_from_block = _psycopg3.copy_from_block
 
 else:
+    from . import generators
+
     format_row_text = _format_row_text
     format_row_binary = _format_row_binary
+    format_rows_text = _format_rows_text
+    format_rows_binary = _format_rows_binary
+    prepare_row_dumpers = _prepare_row_dumpers
     parse_row_text = _parse_row_text
     parse_row_binary = _parse_row_binary
+    copy_from_block = generators.copy_from_block
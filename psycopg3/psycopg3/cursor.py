@@ -5,9 +5,11 @@ psycopg3 cursor objects
 # Copyright (C) 2020-2021 The Psycopg Team
 
 import sys
+import logging
+from time import monotonic
 from types import TracebackType
 from typing import Any, AsyncIterator, Callable, Generic, Iterator, List
-from typing import Optional, NoReturn, Sequence, Type, TYPE_CHECKING
+from typing import Optional, NoReturn, Sequence, Tuple, Type, TYPE_CHECKING
 from contextlib import contextmanager
 
 from . import pq
@@ -15,12 +17,14 @@ from . import adapt
 from . import errors as e
 from . import generators
 
-from .pq import ExecStatus, Format
+from .pq import ConnStatus, DiagnosticField, ExecStatus, Format
+from .pq import PGresAttDesc, TransactionStatus
 from .copy import Copy, AsyncCopy
-from .proto import ConnectionType, Query, Params, PQGen
+from .proto import ConnectionType, Query, AnyQuery, Params, PQGen
 from ._column import Column
-from ._queries import PostgresQuery
+from ._queries import PostgresQuery, PreparedQuery
 from ._preparing import Prepare
+from ._tracing import QueryTrace, Tracer, fetch_trace
 
 if sys.version_info >= (3, 7):
     from contextlib import asynccontextmanager
@@ -32,8 +36,13 @@ if TYPE_CHECKING:
     from .pq.proto import PGconn, PGresult
     from .connection import Connection, AsyncConnection  # noqa: F401
 
+logger = logging.getLogger(__name__)
+
 execute: Callable[["PGconn"], PQGen[List["PGresult"]]]
 
+# The pipeline mode allows to send several commands in a single round trip.
+_has_pipeline = pq.has_pipeline()
+
 if pq.__impl__ == "c":
     from psycopg3_c import _psycopg3
 
@@ -48,8 +57,9 @@ class BaseCursor(Generic[ConnectionType]):
     # https://bugs.python.org/issue41451
     if sys.version_info >= (3, 7):
         __slots__ = """
-            _conn format _adapters arraysize _closed _results _pgresult _pos
-            _iresult _rowcount _pgq _tx _last_query
+            _conn format _adapters arraysize release_results _closed _results
+            _pgresult _pos _iresult _rowcount _pgq _tx _last_query _tracer
+            _trace
             __weakref__
             """.split()
 
@@ -66,8 +76,9 @@ class BaseCursor(Generic[ConnectionType]):
         self.format = format
         self._adapters = adapt.AdaptersMap(connection.adapters)
         self.arraysize = 1
+        self.release_results = False
         self._closed = False
-        self._last_query: Optional[Query] = None
+        self._last_query: Optional[AnyQuery] = None
         self._reset()
 
     def _reset(self) -> None:
@@ -77,6 +88,8 @@ class BaseCursor(Generic[ConnectionType]):
         self._iresult = 0
         self._rowcount = -1
         self._pgq: Optional[PostgresQuery] = None
+        self._tracer: Optional[Tracer] = None
+        self._trace: Optional[QueryTrace] = None
 
     def __repr__(self) -> str:
         cls = f"{self.__class__.__module__}.{self.__class__.__qualname__}"
@@ -182,27 +195,37 @@ class BaseCursor(Generic[ConnectionType]):
 
     def _execute_gen(
         self,
-        query: Query,
+        query: AnyQuery,
         params: Optional[Params] = None,
         prepare: Optional[bool] = None,
     ) -> PQGen[None]:
         """Generator implementing `Cursor.execute()`."""
         yield from self._start_query(query)
+        self._tracer = (
+            Tracer("execute") if self._conn._trace_handlers else None
+        )
         pgq = self._convert_query(query, params)
+        if prepare is None and isinstance(query, PreparedQuery):
+            prepare = query.prepare
         yield from self._maybe_prepare_gen(pgq, prepare)
         self._last_query = query
 
     def _executemany_gen(
-        self, query: Query, params_seq: Sequence[Params]
+        self, query: AnyQuery, params_seq: Sequence[Params]
     ) -> PQGen[None]:
         """Generator implementing `Cursor.executemany()`."""
         yield from self._start_query(query)
         first = True
         for params in params_seq:
+            self._tracer = (
+                Tracer("executemany") if self._conn._trace_handlers else None
+            )
             if first:
                 pgq = self._convert_query(query, params)
                 self._pgq = pgq
                 first = False
+            elif self._tracer:
+                self._tracer.dump(pgq, params)
             else:
                 pgq.dump(params)
 
@@ -214,38 +237,293 @@ class BaseCursor(Generic[ConnectionType]):
         self, pgq: PostgresQuery, prepare: Optional[bool]
     ) -> PQGen[None]:
         # Check if the query is prepared or needs preparing
-        prep, name = self._conn._prepared.get(pgq, prepare)
+        prepared = self._conn._prepared
+        tracer = self._tracer
+        prep, name = prepared.get(pgq, prepare)
+        t0 = monotonic()
+        gen = self._send_prepared_gen(pgq, prep, name)
+        results, name = yield from (tracer.send_gen(gen) if tracer else gen)
+
         if prep is Prepare.YES:
-            # The query is already prepared
-            self._send_query_prepared(name, pgq)
+            # The statement may have been invalidated by a schema change, or
+            # be missing from the server session behind a pooler. If we are
+            # not in a transaction we can prepare it again and retry.
+            new_name = prepared.reprepare(pgq, results)
+            if (
+                new_name
+                and self._conn.pgconn.transaction_status
+                == TransactionStatus.IDLE
+            ):
+                prep = Prepare.SHOULD
+                gen = self._send_prepared_gen(pgq, prep, new_name)
+                results, name = yield from (
+                    tracer.send_gen(gen) if tracer else gen
+                )
+
+        # Update the prepare state of the query
+        if prepare is not False:
+            prepared.maintain(pgq, results, prep, name, monotonic() - t0)
+
+        self._execute_results(results)
+        if tracer:
+            self._trace = tracer.trace(pgq, prep is not Prepare.NO, results)
+            self._conn._emit_trace(self._trace)
+
+    def _send_prepared_gen(
+        self, pgq: PostgresQuery, prep: Prepare, name: bytes
+    ) -> PQGen[Tuple[List["PGresult"], bytes]]:
+        """
+        Run a query, preparing it or using a prepared statement if requested.
 
-        elif prep is Prepare.NO:
-            # The query must be executed without preparing
-            self._execute_send(pgq)
+        Return the results of the query and the name of the statement used,
+        which might be different from *name* (see `_pipeline_gen()`).
+        """
+        prepared = self._conn._prepared
 
+        # Statements evicted from the cache by the previous queries. They are
+        # not deallocated in a transaction block, where a failure would break
+        # the transaction of an unrelated query.
+        if self._conn.pgconn.transaction_status == TransactionStatus.IDLE:
+            cmds = prepared.pop_maintenance_commands()
         else:
-            # The query must be prepared and executed
+            cmds = []
+
+        if _has_pipeline and (
+            prep is Prepare.SHOULD or (cmds and self._is_extended(pgq, prep))
+        ):
+            # Send the query together with the prepare command and the
+            # deallocation of the statements evicted, in a single round trip
+            return (yield from self._pipeline_gen(pgq, prep, name, cmds))
+
+        else:
+            if cmds:
+                yield from self._deallocate_gen(cmds)
+
+            if prep is Prepare.YES:
+                # The query is already prepared
+                self._pgq = pgq
+                self._send_query_prepared(name, pgq)
+
+            elif prep is Prepare.NO:
+                # The query must be executed without preparing
+                self._execute_send(pgq)
+
+            else:
+                # The query must be prepared and executed
+                pgconn = self._conn.pgconn
+                in_trans = pgconn.transaction_status != TransactionStatus.IDLE
+                self._pgq = pgq
+                self._send_prepare(name, pgq)
+                (result,) = yield from execute(pgconn)
+                self._check_prepare_result(result, in_trans)
+                self._send_query_prepared(name, pgq)
+
+            # run the query
+            results = yield from execute(self._conn.pgconn)
+
+        return results, name
+
+    def _pipeline_gen(
+        self,
+        pgq: PostgresQuery,
+        prep: Prepare,
+        name: bytes,
+        cmds: Sequence[bytes],
+    ) -> PQGen[Tuple[List["PGresult"], bytes]]:
+        """
+        Run a query in pipeline mode, return its results and statement name.
+
+        Run the deallocation commands *cmds* first, each in its own sync block
+        so that their failure can't affect the query (which is only the case
+        outside a transaction block). If *prep* is `Prepare.SHOULD` prepare
+        the statement in the same sync block where it is executed: behind a
+        pooler in transaction mode, a different block might be served by a
+        server connection which never saw the statement.
+
+        If a statement with the same name exists already, prepare and execute
+        the query again with a new name, which is returned.
+        """
+        pgconn = self._conn.pgconn
+        in_trans = pgconn.transaction_status != TransactionStatus.IDLE
+        self._pgq = pgq
+        pgconn.enter_pipeline_mode()
+        syncs = 0  # number of sync results still to receive
+        try:
+            for cmd in cmds:
+                # A sync after each command, so that they can fail
+                # independently
+                pgconn.send_query_params(cmd, None)
+                pgconn.pipeline_sync()
+                syncs += 1
+            self._send_pipeline_query(pgq, prep, name)
+            syncs += 1
+
+            # Flush everything and collect the results of each command.
+            # Note: no NULL result is returned after a sync.
+            cmds_results: List["PGresult"] = []
+            for cmd in cmds:
+                cmds_results.extend((yield from execute(pgconn)))
+                yield from generators.fetch(pgconn)
+                syncs -= 1
+            for attempt in range(2):
+                if attempt:
+                    # The name is used in the session: behind a pooler, it
+                    # may have been prepared on this server connection before.
+                    name = self._conn._prepared._new_name()
+                    self._send_pipeline_query(pgq, prep, name)
+                    syncs += 1
+                if prep is Prepare.SHOULD:
+                    (result,) = yield from execute(pgconn)
+                results = yield from execute(pgconn)
+                yield from generators.fetch(pgconn)
+                syncs -= 1
+                if not (
+                    prep is Prepare.SHOULD
+                    and self._is_duplicate_stmt(result, in_trans)
+                ):
+                    break
+
+        except Exception:
+            # Consume the results left, up to the last sync, so that the
+            # connection can exit the pipeline mode and stay usable.
+            if pgconn.status == ConnStatus.OK:
+                yield from self._pipeline_drain_gen(syncs)
+                syncs = 0
+            raise
+
+        finally:
+            if not syncs:
+                pgconn.exit_pipeline_mode()
+
+        if cmds:
+            self._check_deallocate_results(cmds, cmds_results)
+        if prep is Prepare.SHOULD and result.status == ExecStatus.FATAL_ERROR:
+            # The query was not executed
+            raise e.error_from_result(
+                result, encoding=self._conn.client_encoding
+            )
+
+        return results, name
+
+    def _send_pipeline_query(
+        self, pgq: PostgresQuery, prep: Prepare, name: bytes
+    ) -> None:
+        """
+        Send a query in pipeline mode, preparing it if requested, and a sync.
+        """
+        if prep is Prepare.SHOULD:
             self._send_prepare(name, pgq)
-            (result,) = yield from execute(self._conn.pgconn)
-            if result.status == ExecStatus.FATAL_ERROR:
-                raise e.error_from_result(
-                    result, encoding=self._conn.client_encoding
-                )
+        if prep is Prepare.NO:
+            self._execute_send(pgq, no_pqexec=True)
+        else:
             self._send_query_prepared(name, pgq)
+        self._conn.pgconn.pipeline_sync()
 
-        # run the query
-        results = yield from execute(self._conn.pgconn)
+    def _pipeline_drain_gen(self, syncs: int) -> PQGen[None]:
+        """
+        Discard the pipeline results until *syncs* sync results are received.
 
-        # Update the prepare state of the query
-        if prepare is not False:
-            cmd = self._conn._prepared.maintain(pgq, results, prep, name)
-            if cmd:
-                yield from self._conn._exec_command(cmd)
+        A sync is sent first, in case a command was sent without it.
+        """
+        pgconn = self._conn.pgconn
+        pgconn.pipeline_sync()
+        syncs += 1
+        yield from generators.send(pgconn)
+        while syncs:
+            res = yield from generators.fetch(pgconn)
+            if res and res.status == ExecStatus.PIPELINE_SYNC:
+                syncs -= 1
+
+    def _check_prepare_result(
+        self, result: "PGresult", in_trans: bool
+    ) -> None:
+        """
+        Raise an exception if the preparation of a statement failed.
 
-        self._execute_results(results)
+        A statement with the same name already existing is not an error, unless
+        it broke a transaction: the names are unique to the client, so it is
+        the same statement, prepared when the session was served by the same
+        server connection behind a pooler.
+        """
+        if result.status != ExecStatus.FATAL_ERROR:
+            return
+        if self._is_duplicate_stmt(result, in_trans):
+            return
+        raise e.error_from_result(result, encoding=self._conn.client_encoding)
+
+    def _is_duplicate_stmt(self, result: "PGresult", in_trans: bool) -> bool:
+        """
+        Return True if a statement failed to prepare because its name exists.
+
+        Return False if the error broke a transaction, as it must be reported.
+        """
+        return (
+            not in_trans
+            and result.status == ExecStatus.FATAL_ERROR
+            and result.error_field(DiagnosticField.SQLSTATE) == b"42P05"
+        )
+
+    def _deallocate_gen(self, cmds: Sequence[bytes]) -> PQGen[None]:
+        """
+        Deallocate the statements evicted from the cache in one round trip.
+        """
+        pgconn = self._conn.pgconn
+        pgconn.send_query(b"; ".join(cmds))
+        results = yield from execute(pgconn)
+        self._check_deallocate_results(cmds, results)
+
+    def _check_deallocate_results(
+        self, cmds: Sequence[bytes], results: Sequence["PGresult"]
+    ) -> None:
+        """
+        Check the results of the deallocation commands *cmds*.
+
+        The commands not run because of the failure of a previous one are put
+        back to be run later. A statement not found is not an error: behind a
+        pooler it is normal that the session is not served by the server
+        connection where the statement was prepared.
+
+        The errors are only logged: the deallocations are run together with
+        an unrelated query, which shouldn't fail because of them.
+        """
+        retry = []
+        for i, cmd in enumerate(cmds):
+            if i >= len(results):
+                # not run after an error in the same query
+                retry.append(cmd)
+                continue
+
+            res = results[i]
+            if res.status == ExecStatus.PIPELINE_ABORTED:
+                retry.append(cmd)
+            elif res.status == ExecStatus.FATAL_ERROR:
+                sqlstate = res.error_field(DiagnosticField.SQLSTATE)
+                if sqlstate != b"26000":
+                    logger.warning(
+                        "error deallocating prepared statement: %s",
+                        e.error_from_result(
+                            res, encoding=self._conn.client_encoding
+                        ),
+                    )
+
+        if retry:
+            self._conn._prepared.push_maintenance_commands(retry)
+
+    def _is_extended(self, pgq: PostgresQuery, prep: Prepare) -> bool:
+        """
+        Return True if the query would use the extended query protocol.
+
+        The simple query protocol, which can run several statements at once,
+        is not available in pipeline mode.
+        """
+        return bool(
+            prep is not Prepare.NO
+            or pgq.params
+            or self.format == Format.BINARY
+        )
 
     def _stream_send_gen(
-        self, query: Query, params: Optional[Params] = None
+        self, query: AnyQuery, params: Optional[Params] = None
     ) -> PQGen[None]:
         """Generator to send the query for `Cursor.stream()`."""
         yield from self._start_query(query)
@@ -261,9 +539,10 @@ class BaseCursor(Generic[ConnectionType]):
             return None
 
         elif res.status == ExecStatus.SINGLE_TUPLE:
-            self.pgresult = res  # will set it on the transformer too
-            # TODO: the transformer may do excessive work here: create a
-            # path that doesn't clear the loaders every time.
+            # The previous row result is released. The loaders are only
+            # chosen on the first row, as the following have the same columns.
+            self._tx.set_pgresult(res, set_loaders=self._pgresult is None)
+            self._pgresult = res
             return res
 
         elif res.status in (ExecStatus.TUPLES_OK, ExecStatus.COMMAND_OK):
@@ -282,7 +561,7 @@ class BaseCursor(Generic[ConnectionType]):
             self._raise_from_results([res])
             return None  # TODO: shouldn't be needed
 
-    def _start_query(self, query: Optional[Query] = None) -> PQGen[None]:
+    def _start_query(self, query: Optional[AnyQuery] = None) -> PQGen[None]:
         """Generator to start the processing of a query.
 
         It is implemented as generator because it may send additional queries,
@@ -292,10 +571,28 @@ class BaseCursor(Generic[ConnectionType]):
             raise e.InterfaceError("the cursor is closed")
 
         self._reset()
-        if not self._last_query or (self._last_query is not query):
+        conn = self._conn
+        # The adapters are reused if the same query is executed again, unless
+        # they are configured for a client encoding no more in use.
+        if (
+            not self._last_query
+            or self._last_query is not query
+            or self._tx.encoding != conn.client_encoding
+        ):
             self._last_query = None
             self._tx = adapt.Transformer(self)
-        yield from self._conn._start_query()
+
+        if (
+            not conn._autocommit
+            and conn.pgconn.transaction_status == TransactionStatus.IDLE
+        ):
+            # A transaction is about to start: deallocate the statements
+            # evicted from the cache before it, as they can't be run in it.
+            cmds = conn._prepared.pop_maintenance_commands()
+            if cmds:
+                yield from self._deallocate_gen(cmds)
+
+        yield from conn._start_query()
 
     def _start_copy_gen(self, statement: Query) -> PQGen[None]:
         """Generator implementing sending a command for `Cursor.copy()."""
@@ -332,12 +629,90 @@ class BaseCursor(Generic[ConnectionType]):
             self._conn.pgconn.send_query(query.query)
 
     def _convert_query(
-        self, query: Query, params: Optional[Params] = None
+        self, query: AnyQuery, params: Optional[Params] = None
     ) -> PostgresQuery:
+        if isinstance(query, PreparedQuery):
+            if query.connection is not self._conn:
+                raise e.ProgrammingError(
+                    "the query was prepared on a different connection"
+                )
+            if not self._tracer:
+                return query._bind(self._tx, params)
+            t0 = monotonic()
+            pgq = query._bind(self._tx, params)
+            self._tracer.dump_time += monotonic() - t0
+            return pgq
+
         pgq = PostgresQuery(self._tx)
-        pgq.convert(query, params)
+        if self._tracer:
+            self._tracer.convert(pgq, query, params)
+        else:
+            pgq.convert(query, params)
         return pgq
 
+    def _load_row(self, pos: int) -> Optional[Sequence[Any]]:
+        """Load a row of the current result, tracing it if requested."""
+        if not self._conn._trace_handlers:
+            return self._tx.load_row(pos)
+
+        t0 = monotonic()
+        rv = self._tx.load_row(pos)
+        if rv is not None:
+            self._trace_fetch(monotonic() - t0, 1)
+        return rv
+
+    def _load_rows(self, start: int, end: int) -> Sequence[Sequence[Any]]:
+        """Load rows of the current result, tracing them if requested."""
+        if not self._conn._trace_handlers:
+            return self._tx.load_rows(start, end)
+
+        t0 = monotonic()
+        rv = self._tx.load_rows(start, end)
+        if rv:
+            self._trace_fetch(monotonic() - t0, len(rv))
+        return rv
+
+    def _release_result(self) -> None:
+        """
+        Release the current result if all its rows were fetched.
+
+        Do it only if `release_results` is set. The result is replaced by an
+        empty one with the same columns, so that the description is still
+        available but the memory of the records is freed, if nothing else
+        refers to it.
+        """
+        if not self.release_results:
+            return
+        res = self._pgresult
+        if not res or self._pos < res.ntuples or not res.ntuples:
+            return
+
+        nfields = res.nfields
+        empty = self._conn.pgconn.make_empty_result(ExecStatus.TUPLES_OK)
+        empty.set_attributes(
+            [
+                PGresAttDesc(
+                    res.fname(i) or b"",
+                    res.ftable(i),
+                    res.ftablecol(i),
+                    res.fformat(i),
+                    res.ftype(i),
+                    res.fsize(i),
+                    res.fmod(i),
+                )
+                for i in range(nfields)
+            ]
+        )
+        self._results[self._iresult] = self._pgresult = empty
+        self._tx.set_pgresult(empty, set_loaders=False)
+        self._pos = 0
+
+    def _trace_fetch(self, load_time: float, rows: int) -> None:
+        query = self._pgq.query if self._pgq else b""
+        self._conn._emit_trace(
+            fetch_trace(self._trace, query, load_time, rows)
+        )
+
     _status_ok = (
         ExecStatus.TUPLES_OK,
         ExecStatus.COMMAND_OK,
@@ -458,7 +833,7 @@ class Cursor(BaseCursor["Connection"]):
 
     def execute(
         self,
-        query: Query,
+        query: AnyQuery,
         params: Optional[Params] = None,
         prepare: Optional[bool] = None,
     ) -> "Cursor":
@@ -469,7 +844,9 @@ class Cursor(BaseCursor["Connection"]):
             self._conn.wait(self._execute_gen(query, params, prepare=prepare))
         return self
 
-    def executemany(self, query: Query, params_seq: Sequence[Params]) -> None:
+    def executemany(
+        self, query: AnyQuery, params_seq: Sequence[Params]
+    ) -> None:
         """
         Execute the same command with a sequence of input data.
         """
@@ -477,7 +854,7 @@ class Cursor(BaseCursor["Connection"]):
             self._conn.wait(self._executemany_gen(query, params_seq))
 
     def stream(
-        self, query: Query, params: Optional[Params] = None
+        self, query: AnyQuery, params: Optional[Params] = None
     ) -> Iterator[Sequence[Any]]:
         """
         Iterate row-by-row on a result from the database.
@@ -496,9 +873,10 @@ class Cursor(BaseCursor["Connection"]):
         Return `!None` the recordset is finished.
         """
         self._check_result()
-        record = self._tx.load_row(self._pos)
+        record = self._load_row(self._pos)
         if record is not None:
             self._pos += 1
+            self._release_result()
         return record
 
     def fetchmany(self, size: int = 0) -> Sequence[Sequence[Any]]:
@@ -512,10 +890,11 @@ class Cursor(BaseCursor["Connection"]):
 
         if not size:
             size = self.arraysize
-        records = self._tx.load_rows(
+        records = self._load_rows(
             self._pos, min(self._pos + size, self.pgresult.ntuples)
         )
         self._pos += len(records)
+        self._release_result()
         return records
 
     def fetchall(self) -> Sequence[Sequence[Any]]:
@@ -524,14 +903,19 @@ class Cursor(BaseCursor["Connection"]):
         """
         self._check_result()
         assert self.pgresult
-        records = self._tx.load_rows(self._pos, self.pgresult.ntuples)
-        self._pos += self.pgresult.ntuples
+        records = self._load_rows(self._pos, self.pgresult.ntuples)
+        self._pos = self.pgresult.ntuples
+        self._release_result()
         return records
 
     def __iter__(self) -> Iterator[Sequence[Any]]:
         self._check_result()
 
-        load = self._tx.load_row
+        load: Callable[[int], Optional[Sequence[Any]]]
+        if self._conn._trace_handlers:
+            load = self._load_row
+        else:
+            load = self._tx.load_row
 
         while 1:
             row = load(self._pos)
@@ -540,6 +924,8 @@ class Cursor(BaseCursor["Connection"]):
             self._pos += 1
             yield row
 
+        self._release_result()
+
     @contextmanager
     def copy(self, statement: Query) -> Iterator[Copy]:
         """
@@ -573,7 +959,7 @@ class AsyncCursor(BaseCursor["AsyncConnection"]):
 
     async def execute(
         self,
-        query: Query,
+        query: AnyQuery,
         params: Optional[Params] = None,
         prepare: Optional[bool] = None,
     ) -> "AsyncCursor":
@@ -584,13 +970,13 @@ class AsyncCursor(BaseCursor["AsyncConnection"]):
         return self
 
     async def executemany(
-        self, query: Query, params_seq: Sequence[Params]
+        self, query: AnyQuery, params_seq: Sequence[Params]
     ) -> None:
         async with self._conn.lock:
             await self._conn.wait(self._executemany_gen(query, params_seq))
 
     async def stream(
-        self, query: Query, params: Optional[Params] = None
+        self, query: AnyQuery, params: Optional[Params] = None
     ) -> AsyncIterator[Sequence[Any]]:
         async with self._conn.lock:
             await self._conn.wait(self._stream_send_gen(query, params))
@@ -601,9 +987,10 @@ class AsyncCursor(BaseCursor["AsyncConnection"]):
 
     async def fetchone(self) -> Optional[Sequence[Any]]:
         self._check_result()
-        rv = self._tx.load_row(self._pos)
+        rv = self._load_row(self._pos)
         if rv is not None:
             self._pos += 1
+            self._release_result()
         return rv
 
     async def fetchmany(self, size: int = 0) -> Sequence[Sequence[Any]]:
@@ -612,23 +999,29 @@ class AsyncCursor(BaseCursor["AsyncConnection"]):
 
         if not size:
             size = self.arraysize
-        records = self._tx.load_rows(
+        records = self._load_rows(
             self._pos, min(self._pos + size, self.pgresult.ntuples)
         )
         self._pos += len(records)
+        self._release_result()
         return records
 
     async def fetchall(self) -> Sequence[Sequence[Any]]:
         self._check_result()
         assert self.pgresult
-        records = self._tx.load_rows(self._pos, self.pgresult.ntuples)
-        self._pos += self.pgresult.ntuples
+        records = self._load_rows(self._pos, self.pgresult.ntuples)
+        self._pos = self.pgresult.ntuples
+        self._release_result()
         return records
 
     async def __aiter__(self) -> AsyncIterator[Sequence[Any]]:
         self._check_result()
 
-        load = self._tx.load_row
+        load: Callable[[int], Optional[Sequence[Any]]]
+        if self._conn._trace_handlers:
+            load = self._load_row
+        else:
+            load = self._tx.load_row
 
         while 1:
             row = load(self._pos)
@@ -637,6 +1030,8 @@ class AsyncCursor(BaseCursor["AsyncConnection"]):
             self._pos += 1
             yield row
 
+        self._release_result()
+
     @asynccontextmanager
     async def copy(self, statement: Query) -> AsyncIterator[AsyncCopy]:
         async with self._conn.lock:
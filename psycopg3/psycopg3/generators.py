@@ -16,12 +16,12 @@ when the file descriptor is ready.
 # Copyright (C) 2020-2021 The Psycopg Team
 
 import logging
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 from . import pq
 from . import errors as e
 from .pq import ConnStatus, PollingStatus, ExecStatus
-from .proto import PQGen, PQGenConn
+from .proto import Buffer, PQGen, PQGenConn
 from .waiting import Wait, Ready
 from .encodings import py_codecs
 from .pq.proto import PGconn, PGresult
@@ -186,18 +186,37 @@ def copy_from(pgconn: PGconn) -> PQGen[Union[memoryview, PGresult]]:
         # some data
         return data
 
-    # Retrieve the final result of copy
-    (result,) = yield from fetch_many(pgconn)
-    if result.status != ExecStatus.COMMAND_OK:
-        encoding = py_codecs.get(
-            pgconn.parameter_status(b"client_encoding") or "", "utf-8"
-        )
-        raise e.error_from_result(result, encoding=encoding)
-
+    result = yield from fetch_copy_result(pgconn)
     return result
 
 
-def copy_to(pgconn: PGconn, buffer: bytes) -> PQGen[None]:
+def copy_from_block(
+    pgconn: PGconn, buffer: bytearray, pos: int = 0
+) -> PQGen[Tuple[int, Union[memoryview, PGresult, None]]]:
+    """
+    Generator filling *buffer* from *pos* with the copy data received.
+
+    Return the position reached in the buffer and, if the buffer couldn't
+    be filled completely, the data which didn't fit in it or the final
+    result of the copy operation.
+    """
+    size = len(buffer)
+    while pos < size:
+        data = yield from copy_from(pgconn)
+        if not isinstance(data, memoryview):
+            return pos, data
+
+        nbytes = len(data)
+        if nbytes > size - pos:
+            return pos, data
+
+        buffer[pos : pos + nbytes] = data
+        pos += nbytes
+
+    return pos, None
+
+
+def copy_to(pgconn: PGconn, buffer: Buffer) -> PQGen[None]:
     # Retry enqueuing data until successful
     while pgconn.put_copy_data(buffer) == 0:
         yield Wait.W
@@ -215,7 +234,16 @@ def copy_end(pgconn: PGconn, error: Optional[bytes]) -> PQGen[PGresult]:
         if f == 0:
             break
 
-    # Retrieve the final result of copy
+    result = yield from fetch_copy_result(pgconn)
+    return result
+
+
+def fetch_copy_result(pgconn: PGconn) -> PQGen[PGresult]:
+    """
+    Generator retrieving the final result of a copy operation.
+
+    Raise an exception if the copy operation failed.
+    """
     (result,) = yield from fetch_many(pgconn)
     if result.status != ExecStatus.COMMAND_OK:
         encoding = py_codecs.get(
@@ -0,0 +1,517 @@
+"""
+psycopg3 notifications listeners
+"""
+
+# Copyright (C) 2020-2021 The Psycopg Team
+
+import os
+import queue
+import socket
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from types import TracebackType
+from typing import Any, Dict, FrozenSet, Generic, List, Optional, Sequence
+from typing import Tuple, Type, TYPE_CHECKING
+from selectors import DefaultSelector, EVENT_READ
+
+from . import sql
+from . import errors as e
+from .pq import ConnStatus
+from .proto import ConnectionType
+from .connection import Notify
+
+if TYPE_CHECKING:
+    from .connection import Connection, AsyncConnection  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+NotifyBatch = List[Notify]
+
+
+class BaseNotifyListener(Generic[ConnectionType], ABC):
+    """
+    Base implementation for the notifications listeners.
+
+    A listener receives the notifications from a connection on behalf of
+    several subscribers, each one interested in a set of channels, and
+    dispatches them in batches to the subscribers' queues.
+
+    The listener doesn't hold the connection lock while waiting for
+    notifications: it takes it only to read them once the connection has some
+    data, so the connection can be used normally to run other queries. The
+    notifications received during these queries are dispatched by the listener
+    too.
+
+    Two subclasses expose real methods with the sync/async differences.
+    """
+
+    # Interval to check if the connection was closed while waiting.
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, connection: ConnectionType):
+        self.connection = connection
+        self._pgconn = connection.pgconn
+
+        # Pairs (queue, channels) of the subscribers. Channels None means all
+        # the notifications received. Replaced, not modified, on change, so
+        # that the worker can iterate on it without a lock.
+        self._subscribers: Tuple[Tuple[Any, Optional[FrozenSet[str]]], ...]
+        self._subscribers = ()
+
+        # Number of subscribers interested in each channel listened.
+        self._channels: Dict[str, int] = {}
+
+        # Notifications received by the connection out of the listener reading
+        self._pending: NotifyBatch = []
+
+        self._started = False
+        self._stopped = False
+
+        self.error: Optional[BaseException] = None
+        """The error which caused the listener to terminate, if any."""
+
+    def __repr__(self) -> str:
+        cls = f"{self.__class__.__module__}.{self.__class__.__qualname__}"
+        channels = ", ".join(sorted(self._channels))
+        return f"<{cls} [{channels}] at 0x{id(self):x}>"
+
+    @property
+    def channels(self) -> List[str]:
+        """The channels currently listened by the subscribers."""
+        return sorted(self._channels)
+
+    def _check_start(self) -> None:
+        if self._started:
+            raise e.ProgrammingError("the listener can be started only once")
+        if self._stopped:
+            raise e.ProgrammingError("the listener is stopped")
+        self._started = True
+
+    def _check_stop(self) -> bool:
+        """
+        Mark the listener as stopped; return True if there is a worker to stop.
+
+        If the listener was never started, there is no worker to tell the
+        subscribers about the stop: the end marker is put on their queues here.
+        """
+        stopped, self._stopped = self._stopped, True
+        if self._started:
+            return True
+        if not stopped:
+            self._close_queues()
+        return False
+
+    def _close_queues(self) -> None:
+        """Put `!None` on the subscribers' queues, to tell them we are done."""
+        for q, _ in self._subscribers:
+            self._put(q, None)
+
+    def _add_subscriber(
+        self, q: Any, channels: Sequence[str]
+    ) -> Optional[sql.Composable]:
+        """Register a new subscriber; return a LISTEN command if needed."""
+        if self._stopped:
+            raise e.ProgrammingError("the listener is stopped")
+
+        self._subscribers += ((q, frozenset(channels) or None),)
+
+        new = []
+        for channel in channels:
+            if channel not in self._channels:
+                self._channels[channel] = 0
+                new.append(channel)
+            self._channels[channel] += 1
+
+        return self._listen_command("LISTEN", new)
+
+    def _remove_subscriber(self, q: Any) -> Optional[sql.Composable]:
+        """Unregister a subscriber; return an UNLISTEN command if needed."""
+        for sub in self._subscribers:
+            if sub[0] is q:
+                break
+        else:
+            raise ValueError("the queue is not subscribed to the listener")
+
+        self._subscribers = tuple(s for s in self._subscribers if s is not sub)
+
+        old = []
+        for channel in sub[1] or ():
+            self._channels[channel] -= 1
+            if not self._channels[channel]:
+                del self._channels[channel]
+                old.append(channel)
+
+        return self._listen_command("UNLISTEN", old)
+
+    def _listen_command(
+        self, command: str, channels: Sequence[str]
+    ) -> Optional[sql.Composable]:
+        if not channels:
+            return None
+        return sql.SQL("; ").join(
+            [sql.SQL(command + " ") + sql.Identifier(c) for c in channels]
+        )
+
+    def _handle_notify(self, n: Notify) -> None:
+        """
+        Receive the notifications consumed by other operations on connection.
+
+        The function is called by the connection holding its lock.
+        """
+        self._pending.append(n)
+        self._wakeup()
+
+    @abstractmethod
+    def _wakeup(self) -> None:
+        ...
+
+    @abstractmethod
+    def _put(self, q: Any, item: Optional[NotifyBatch]) -> None:
+        ...
+
+    def _read_notifies(self) -> NotifyBatch:
+        """
+        Return all the notifications available without blocking.
+
+        The function must be called holding the connection lock.
+        """
+        pgconn = self._pgconn
+        if pgconn.status != ConnStatus.OK:
+            raise e.OperationalError("the connection is closed")
+
+        pgconn.consume_input()
+        ns, self._pending = self._pending, []
+
+        pgn = pgconn.notifies()
+        if pgn:
+            # Decode the whole batch with the same encoding.
+            enc = self.connection.client_encoding
+            new = []
+            while pgn:
+                new.append(
+                    Notify(
+                        pgn.relname.decode(enc),
+                        pgn.extra.decode(enc),
+                        pgn.be_pid,
+                    )
+                )
+                pgn = pgconn.notifies()
+
+            self._call_handlers(new)
+            ns.extend(new)
+
+        return ns
+
+    def _call_handlers(self, ns: NotifyBatch) -> None:
+        """
+        Pass the notifications read by the listener to the connection handlers.
+
+        The handlers added by `~Connection.add_notify_handler()` would have
+        received them if they had been read by the connection.
+        """
+        handlers = [
+            cb
+            for cb in self.connection._notify_handlers
+            if cb != self._handle_notify
+        ]
+        for n in ns:
+            for cb in handlers:
+                try:
+                    cb(n)
+                except Exception as ex:
+                    logger.exception(
+                        "error processing notify callback '%s': %s", cb, ex
+                    )
+
+    def _discarded(self, batch: Optional[NotifyBatch]) -> None:
+        logger.warning(
+            "notifications queue full: %d notifications discarded",
+            len(batch or ()),
+        )
+
+    def _batches(self, ns: NotifyBatch) -> List[Tuple[Any, NotifyBatch]]:
+        """Split the notifications received among the subscribers."""
+        rv = []
+        for q, channels in self._subscribers:
+            if channels is None:
+                batch = ns[:]
+            else:
+                batch = [n for n in ns if n.channel in channels]
+            if batch:
+                rv.append((q, batch))
+        return rv
+
+
+class NotifyListener(BaseNotifyListener["Connection"]):
+    """
+    Receive notifications from a connection in a separate thread.
+    """
+
+    __module__ = "psycopg3"
+
+    def __init__(self, connection: "Connection"):
+        super().__init__(connection)
+        self._worker: Optional[threading.Thread] = None
+        self._wakeup_r: Optional[socket.socket] = None
+        self._wakeup_w: Optional[socket.socket] = None
+
+    def __enter__(self) -> "NotifyListener":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    def subscribe(
+        self, *channels: str, maxsize: int = 0
+    ) -> "queue.Queue[Optional[NotifyBatch]]":
+        """
+        Return a queue receiving the notifications on the *channels* specified.
+
+        The queue receives lists of `Notify` objects. If no channel is
+        specified, the queue receives all the notifications received by the
+        listener. When the listener is stopped the queue receives `!None`.
+
+        If *maxsize* is specified and the queue is full, the oldest batch in
+        the queue is discarded to make room for the new one, and a warning is
+        logged: the listener never blocks waiting for a subscriber.
+        """
+        q: "queue.Queue[Optional[NotifyBatch]]" = queue.Queue(maxsize=maxsize)
+        cmd = self._add_subscriber(q, channels)
+        if cmd:
+            self._exec_command(cmd)
+        return q
+
+    def unsubscribe(self, q: "queue.Queue[Optional[NotifyBatch]]") -> None:
+        """
+        Stop sending notifications to a queue returned by `subscribe()`.
+        """
+        cmd = self._remove_subscriber(q)
+        if cmd:
+            self._exec_command(cmd)
+
+    def start(self) -> None:
+        """Start receiving notifications in a worker thread."""
+        self._check_start()
+        # A socket pair to wake up the worker when it is waiting.
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+
+        self.connection.add_notify_handler(self._handle_notify)
+        self._worker = threading.Thread(target=self.worker)
+        self._worker.daemon = True
+        self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop receiving notifications and wait for the worker to terminate.
+
+        Wait at most *timeout* seconds, if specified. All the subscribed
+        queues will receive `!None`.
+        """
+        if not self._check_stop():
+            return
+        self._wakeup()
+        if self._worker:
+            self._worker.join(timeout)
+            self._worker = None
+
+    def worker(self) -> None:
+        """Wait for notifications and dispatch them to the subscribers.
+
+        The function is designed to be run in a separate thread.
+        """
+        assert self._wakeup_r and self._wakeup_w
+        sel = DefaultSelector()
+        try:
+            sel.register(self._pgconn.socket, EVENT_READ)
+            sel.register(self._wakeup_r, EVENT_READ)
+            while not self._stopped:
+                sel.select(timeout=self.POLL_INTERVAL)
+                self._drain_wakeup()
+                if self._stopped:
+                    break
+
+                with self.connection.lock:
+                    ns = self._read_notifies()
+
+                if ns:
+                    for q, batch in self._batches(ns):
+                        self._put(q, batch)
+
+        except Exception as ex:
+            logger.warning("notifications listener terminated: %s", ex)
+            self.error = ex
+
+        finally:
+            self._stopped = True
+            sel.close()
+            self.connection.remove_notify_handler(self._handle_notify)
+            self._wakeup_r.close()
+            self._wakeup_w.close()
+            self._close_queues()
+
+    def _put(
+        self,
+        q: "queue.Queue[Optional[NotifyBatch]]",
+        item: Optional[NotifyBatch],
+    ) -> None:
+        """Put an item in a queue, discarding the oldest one if full."""
+        while 1:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._discarded(q.get_nowait())
+                except queue.Empty:
+                    pass
+
+    def _wakeup(self) -> None:
+        if not self._wakeup_w:
+            return
+        try:
+            self._wakeup_w.send(b"\0")
+        except OSError:
+            # the buffer is full (the worker will wake up anyway), or closed.
+            pass
+
+    def _drain_wakeup(self) -> None:
+        assert self._wakeup_r
+        try:
+            while self._wakeup_r.recv(1024):
+                pass
+        except OSError:
+            pass
+
+    def _exec_command(self, command: sql.Composable) -> None:
+        with self.connection.lock:
+            self.connection.wait(self.connection._exec_command(command))
+
+
+class AsyncNotifyListener(BaseNotifyListener["AsyncConnection"]):
+    """
+    Receive notifications from an async connection in a separate task.
+    """
+
+    __module__ = "psycopg3"
+
+    def __init__(self, connection: "AsyncConnection"):
+        super().__init__(connection)
+        self._worker: Optional["asyncio.Future[None]"] = None
+        self._wakeup_fut: Optional["asyncio.Future[None]"] = None
+
+    async def __aenter__(self) -> "AsyncNotifyListener":
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.stop()
+
+    async def subscribe(
+        self, *channels: str, maxsize: int = 0
+    ) -> "asyncio.Queue[Optional[NotifyBatch]]":
+        q: "asyncio.Queue[Optional[NotifyBatch]]"
+        q = asyncio.Queue(maxsize=maxsize)
+        cmd = self._add_subscriber(q, channels)
+        if cmd:
+            await self._exec_command(cmd)
+        return q
+
+    async def unsubscribe(
+        self, q: "asyncio.Queue[Optional[NotifyBatch]]"
+    ) -> None:
+        cmd = self._remove_subscriber(q)
+        if cmd:
+            await self._exec_command(cmd)
+
+    async def start(self) -> None:
+        self._check_start()
+        self.connection.add_notify_handler(self._handle_notify)
+        # TODO: can be asyncio.create_task once Python 3.6 is dropped
+        self._worker = asyncio.ensure_future(self.worker())
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        if not self._check_stop():
+            return
+        self._wakeup()
+        if self._worker:
+            await asyncio.wait([self._worker], timeout=timeout)
+            self._worker = None
+
+    async def worker(self) -> None:
+        """Wait for notifications and dispatch them to the subscribers."""
+        loop = asyncio.get_event_loop()
+
+        # Wait on a copy of the fd: the loop can only have one reader per fd
+        # and the connection may register the same fd running other queries.
+        fileno = os.dup(self._pgconn.socket)
+        try:
+            while not self._stopped:
+                self._wakeup_fut = fut = loop.create_future()
+                loop.add_reader(fileno, self._wakeup)
+                try:
+                    await asyncio.wait_for(fut, self.POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    loop.remove_reader(fileno)
+                    self._wakeup_fut = None
+
+                if self._stopped:
+                    break
+
+                async with self.connection.lock:
+                    ns = self._read_notifies()
+
+                if ns:
+                    for q, batch in self._batches(ns):
+                        self._put(q, batch)
+
+        except Exception as ex:
+            logger.warning("notifications listener terminated: %s", ex)
+            self.error = ex
+
+        finally:
+            self._stopped = True
+            os.close(fileno)
+            self.connection.remove_notify_handler(self._handle_notify)
+            self._close_queues()
+
+    def _put(
+        self,
+        q: "asyncio.Queue[Optional[NotifyBatch]]",
+        item: Optional[NotifyBatch],
+    ) -> None:
+        """Put an item in a queue, discarding the oldest one if full."""
+        while 1:
+            try:
+                q.put_nowait(item)
+                return
+            except asyncio.QueueFull:
+                try:
+                    self._discarded(q.get_nowait())
+                except asyncio.QueueEmpty:
+                    pass
+
+    def _wakeup(self) -> None:
+        fut = self._wakeup_fut
+        if fut is not None and not fut.done():
+            fut.set_result(None)
+
+    async def _exec_command(self, command: sql.Composable) -> None:
+        async with self.connection.lock:
+            await self.connection.wait(self.connection._exec_command(command))
@@ -0,0 +1,643 @@
+"""
+psycopg3 parallel copy support
+"""
+
+# Copyright (C) 2020-2021 The Psycopg Team
+
+import queue
+import asyncio
+import inspect
+import threading
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from . import sql
+from .pq import Format
+from .copy import Copy, _binary_signature, _binary_trailer
+from .connection import Connection, AsyncConnection
+
+# The function receiving the data exported.
+Sink = Callable[[bytes], Any]
+
+# Interval to check if a worker failed while waiting on a queue.
+POLL_INTERVAL = 0.5
+
+# Max number of blocks of data exported to hold in memory for each range,
+# or of batches of data to import for each connection.
+QUEUE_SIZE = 8
+
+_begin = "BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY"
+
+
+class _State:
+    """The state shared by the workers of a parallel copy."""
+
+    def __init__(self) -> None:
+        self.error: Optional[BaseException] = None
+        self.rowcounts: List[int] = []
+
+    def fail(self, ex: BaseException) -> None:
+        # Only the first error is reported
+        if self.error is None:
+            self.error = ex
+
+
+def copy_to_parallel(
+    conninfo: str,
+    query: Union[str, sql.Composable],
+    key: str,
+    bounds: Sequence[Any],
+    sink: Sink,
+    *,
+    jobs: int = 4,
+    ordered: bool = True,
+    format: Format = Format.TEXT,
+) -> int:
+    """
+    Export the result of a query running :sql:`COPY TO` on several connections.
+
+    The records returned by *query* are split in ranges of values of the
+    *key* column, separated by the values in *bounds*, each range exported by
+    :sql:`COPY TO` on the first of *jobs* connections available. All the
+    connections read from the same snapshot of the database.
+
+    *sink* is called with the data exported, in blocks of `!bytes` in copy
+    format. If *ordered* the blocks are received in the order of the ranges,
+    otherwise as soon as they are available.
+
+    Return the number of records exported.
+    """
+    stmts = _range_statements(query, key, bounds, format)
+    state = _State()
+    conns: List[Connection] = []
+    workers: List[threading.Thread] = []
+    try:
+        for i in range(max(1, min(jobs, len(stmts)))):
+            conns.append(Connection.connect(conninfo, autocommit=True))
+
+        # Make all the connections see the same data
+        conns[0].execute(_begin)
+        row = conns[0].execute("SELECT pg_export_snapshot()").fetchone()
+        assert row
+        snapshot = row[0]
+        for conn in conns[1:]:
+            conn.execute(_begin)
+            conn.execute(_set_snapshot(snapshot))
+
+        todo: "queue.Queue[int]" = queue.Queue()
+        for i in range(len(stmts)):
+            todo.put(i)
+        outs = _out_queues(len(stmts), len(conns), ordered, queue.Queue)
+
+        for conn in conns:
+            t = threading.Thread(
+                target=_export_worker,
+                args=(conn, stmts, format, todo, outs, state),
+            )
+            t.daemon = True
+            t.start()
+            workers.append(t)
+
+        if format == Format.BINARY:
+            sink(_binary_signature)
+
+        for out in _unique(outs):
+            # Each range terminates with a None
+            ndone = outs.count(out)
+            while ndone:
+                data = _get(out, state)
+                if data is None:
+                    ndone -= 1
+                else:
+                    sink(data)
+
+        if format == Format.BINARY:
+            sink(_binary_trailer)
+
+    except BaseException as ex:
+        # Stop the workers if the error comes from the sink
+        state.fail(ex)
+        raise
+
+    finally:
+        for t in workers:
+            t.join()
+        for conn in conns:
+            conn.close()
+
+    return sum(state.rowcounts)
+
+
+async def copy_to_parallel_async(
+    conninfo: str,
+    query: Union[str, sql.Composable],
+    key: str,
+    bounds: Sequence[Any],
+    sink: Sink,
+    *,
+    jobs: int = 4,
+    ordered: bool = True,
+    format: Format = Format.TEXT,
+) -> int:
+    """
+    Export the result of a query running :sql:`COPY TO` on several connections.
+
+    Asynchronous version of `copy_to_parallel()`, using a task for each
+    connection. If *sink* returns an awaitable, it is awaited.
+    """
+    stmts = _range_statements(query, key, bounds, format)
+    state = _State()
+    conns: List[AsyncConnection] = []
+    workers: List["asyncio.Future[None]"] = []
+    try:
+        for i in range(max(1, min(jobs, len(stmts)))):
+            conns.append(
+                await AsyncConnection.connect(conninfo, autocommit=True)
+            )
+
+        await conns[0].execute(_begin)
+        cur = await conns[0].execute("SELECT pg_export_snapshot()")
+        row = await cur.fetchone()
+        assert row
+        snapshot = row[0]
+        for conn in conns[1:]:
+            await conn.execute(_begin)
+            await conn.execute(_set_snapshot(snapshot))
+
+        todo: "asyncio.Queue[int]" = asyncio.Queue()
+        for i in range(len(stmts)):
+            todo.put_nowait(i)
+        outs = _out_queues(len(stmts), len(conns), ordered, asyncio.Queue)
+
+        for conn in conns:
+            # TODO: can be asyncio.create_task once Python 3.6 is dropped
+            workers.append(
+                asyncio.ensure_future(
+                    _export_worker_async(
+                        conn, stmts, format, todo, outs, state
+                    )
+                )
+            )
+
+        async def asink(data: bytes) -> None:
+            rv = sink(data)
+            if inspect.isawaitable(rv):
+                await rv
+
+        if format == Format.BINARY:
+            await asink(_binary_signature)
+
+        for out in _unique(outs):
+            ndone = outs.count(out)
+            while ndone:
+                data = await _get_async(out, state)
+                if data is None:
+                    ndone -= 1
+                else:
+                    await asink(data)
+
+        if format == Format.BINARY:
+            await asink(_binary_trailer)
+
+    except BaseException as ex:
+        state.fail(ex)
+        raise
+
+    finally:
+        if workers:
+            await asyncio.gather(*workers)
+        for conn in conns:
+            await conn.close()
+
+    return sum(state.rowcounts)
+
+
+def copy_from_parallel(
+    conninfo: str,
+    statement: Union[str, sql.Composable],
+    data: Iterable[Any],
+    *,
+    jobs: int = 4,
+    batch_size: int = 1000,
+    types: Optional[Sequence[Union[int, str]]] = None,
+) -> int:
+    """
+    Load data running :sql:`COPY FROM` concurrently on several connections.
+
+    *statement* is executed on *jobs* connections, each one in its own
+    thread. *data* is an iterable of records, or of buffers in copy format
+    containing complete records, split in batches of *batch_size* items,
+    each one loaded by the first connection available. *types*, if
+    specified, is passed to `~psycopg3.Copy.set_types()`.
+
+    Each connection commits its transaction as soon as it has received its
+    last batch, so that concurrent inserts of the same key don't wait on each
+    other until the end. The first error raised by a connection, or by
+    *data*, is raised and makes the connections still loading roll back.
+
+    Return the number of records loaded.
+    """
+    state = _State()
+    conns: List[Connection] = []
+    workers: List[threading.Thread] = []
+    try:
+        for i in range(max(1, jobs)):
+            conns.append(Connection.connect(conninfo))
+
+        batches: "queue.Queue[Optional[List[Any]]]"
+        batches = queue.Queue(maxsize=QUEUE_SIZE * len(conns))
+        for conn in conns:
+            t = threading.Thread(
+                target=_import_worker,
+                args=(conn, statement, types, batches, state),
+            )
+            t.daemon = True
+            t.start()
+            workers.append(t)
+
+        for batch in _batches(data, batch_size):
+            if not _put(batches, batch, state):
+                break
+        for conn in conns:
+            if not _put(batches, None, state):
+                break
+
+        for t in workers:
+            t.join()
+        workers = []
+        if state.error is not None:
+            raise state.error
+
+    except BaseException as ex:
+        # Stop the workers if the error comes from the data
+        state.fail(ex)
+        raise
+
+    finally:
+        for t in workers:
+            t.join()
+        for conn in conns:
+            conn.close()
+
+    return sum(state.rowcounts)
+
+
+async def copy_from_parallel_async(
+    conninfo: str,
+    statement: Union[str, sql.Composable],
+    data: Union[Iterable[Any], AsyncIterable[Any]],
+    *,
+    jobs: int = 4,
+    batch_size: int = 1000,
+    types: Optional[Sequence[Union[int, str]]] = None,
+) -> int:
+    """
+    Load data running :sql:`COPY FROM` concurrently on several connections.
+
+    Asynchronous version of `copy_from_parallel()`, using a task for each
+    connection. *data* can also be an asynchronous iterable.
+    """
+    state = _State()
+    conns: List[AsyncConnection] = []
+    workers: List["asyncio.Future[None]"] = []
+    try:
+        for i in range(max(1, jobs)):
+            conns.append(await AsyncConnection.connect(conninfo))
+
+        batches: "asyncio.Queue[Optional[List[Any]]]"
+        batches = asyncio.Queue(maxsize=QUEUE_SIZE * len(conns))
+        for conn in conns:
+            # TODO: can be asyncio.create_task once Python 3.6 is dropped
+            workers.append(
+                asyncio.ensure_future(
+                    _import_worker_async(
+                        conn, statement, types, batches, state
+                    )
+                )
+            )
+
+        async for batch in _batches_async(data, batch_size):
+            if not await _put_async(batches, batch, state):
+                break
+        for conn in conns:
+            if not await _put_async(batches, None, state):
+                break
+
+        await asyncio.gather(*workers)
+        workers = []
+        if state.error is not None:
+            raise state.error
+
+    except BaseException as ex:
+        state.fail(ex)
+        raise
+
+    finally:
+        if workers:
+            await asyncio.gather(*workers)
+        for conn in conns:
+            await conn.close()
+
+    return sum(state.rowcounts)
+
+
+def _range_statements(
+    query: Union[str, sql.Composable],
+    key: str,
+    bounds: Sequence[Any],
+    format: Format,
+) -> List[sql.Composable]:
+    """Return the COPY TO statements to export each range of the query."""
+    if isinstance(query, str):
+        query = sql.SQL(query)
+    ident = sql.Identifier(key)
+
+    rv: List[sql.Composable] = []
+    lows: List[Any] = [None, *bounds]
+    highs: List[Any] = [*bounds, None]
+    for low, high in zip(lows, highs):
+        conds = []
+        if low is not None:
+            conds.append(sql.SQL("{} >= {}").format(ident, sql.Literal(low)))
+        if high is not None:
+            conds.append(sql.SQL("{} < {}").format(ident, sql.Literal(high)))
+        cond = sql.SQL(" AND ").join(conds) if conds else sql.SQL("true")
+        if high is None:
+            # The records with null key are exported in the last range
+            cond = sql.SQL("({}) OR {} IS NULL").format(cond, ident)
+
+        rv.append(
+            sql.SQL(
+                "COPY (SELECT * FROM ({}) AS _range WHERE {})"
+                " TO STDOUT (FORMAT {})"
+            ).format(query, cond, sql.SQL(format.name))
+        )
+
+    return rv
+
+
+def _set_snapshot(snapshot: str) -> sql.Composable:
+    return sql.SQL("SET TRANSACTION SNAPSHOT {}").format(sql.Literal(snapshot))
+
+
+def _out_queues(
+    nranges: int, njobs: int, ordered: bool, factory: Callable[..., Any]
+) -> List[Any]:
+    """
+    Return the queues to send the data exported for each range.
+
+    In ordered mode every range has its own queue, read in order. Otherwise
+    all the ranges share the same queue.
+    """
+    if ordered:
+        return [factory(maxsize=QUEUE_SIZE) for i in range(nranges)]
+    else:
+        return [factory(maxsize=QUEUE_SIZE * njobs)] * nranges
+
+
+def _unique(outs: List[Any]) -> List[Any]:
+    rv: List[Any] = []
+    for out in outs:
+        if not rv or rv[-1] is not out:
+            rv.append(out)
+    return rv
+
+
+def _strip_binary(
+    data: bytes, first: bool, tail: bytes
+) -> Tuple[bytes, bytes]:
+    """
+    Remove the header and the trailer from the binary data of a range.
+
+    The last bytes of the data are held back, as they might be the trailer:
+    return the data to send and the bytes held.
+    """
+    if first:
+        data = data[len(_binary_signature) :]
+    data = tail + data
+    n = len(_binary_trailer)
+    return data[:-n], data[-n:]
+
+
+def _export_worker(
+    conn: Connection,
+    stmts: List[sql.Composable],
+    format: Format,
+    todo: "queue.Queue[int]",
+    outs: List["queue.Queue[Optional[bytes]]"],
+    state: _State,
+) -> None:
+    """Export the ranges to do until there are any left.
+
+    The function is designed to be run in a separate thread.
+    """
+    buffer = bytearray(Copy.BLOCK_SIZE)
+    try:
+        while state.error is None:
+            try:
+                i = todo.get_nowait()
+            except queue.Empty:
+                break
+
+            cur = conn.cursor()
+            with cur.copy(stmts[i]) as copy:
+                first = True
+                tail = b""
+                while True:
+                    block = copy.read_block(buffer)
+                    if not block:
+                        break
+                    data = bytes(block)
+                    if format == Format.BINARY:
+                        data, tail = _strip_binary(data, first, tail)
+                        first = False
+                    if data and not _put(outs[i], data, state):
+                        return
+
+            state.rowcounts.append(cur.rowcount)
+            if not _put(outs[i], None, state):
+                return
+
+    except BaseException as ex:
+        state.fail(ex)
+
+
+async def _export_worker_async(
+    conn: AsyncConnection,
+    stmts: List[sql.Composable],
+    format: Format,
+    todo: "asyncio.Queue[int]",
+    outs: List["asyncio.Queue[Optional[bytes]]"],
+    state: _State,
+) -> None:
+    buffer = bytearray(Copy.BLOCK_SIZE)
+    try:
+        while state.error is None:
+            try:
+                i = todo.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+
+            cur = await conn.cursor()
+            async with cur.copy(stmts[i]) as copy:
+                first = True
+                tail = b""
+                while True:
+                    block = await copy.read_block(buffer)
+                    if not block:
+                        break
+                    data = bytes(block)
+                    if format == Format.BINARY:
+                        data, tail = _strip_binary(data, first, tail)
+                        first = False
+                    if data and not await _put_async(outs[i], data, state):
+                        return
+
+            state.rowcounts.append(cur.rowcount)
+            if not await _put_async(outs[i], None, state):
+                return
+
+    except BaseException as ex:
+        state.fail(ex)
+
+
+def _batches(data: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch = []
+    for item in data:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _batches_async(
+    data: Union[Iterable[Any], AsyncIterable[Any]], size: int
+) -> AsyncIterator[List[Any]]:
+    if not hasattr(data, "__aiter__"):
+        for batch in _batches(data, size):
+            yield batch
+        return
+
+    batch = []
+    async for item in data:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _is_buffer(item: Any) -> bool:
+    return isinstance(item, (bytes, bytearray, memoryview, str))
+
+
+def _import_worker(
+    conn: Connection,
+    statement: Union[str, sql.Composable],
+    types: Optional[Sequence[Union[int, str]]],
+    batches: "queue.Queue[Optional[List[Any]]]",
+    state: _State,
+) -> None:
+    """Load the batches of data received until a None.
+
+    The function is designed to be run in a separate thread.
+    """
+    try:
+        cur = conn.cursor()
+        with cur.copy(statement) as copy:
+            if types:
+                copy.set_types(types)
+            while True:
+                # Raise if another worker failed, aborting the copy
+                batch = _get(batches, state)
+                if batch is None:
+                    break
+                if _is_buffer(batch[0]):
+                    for buffer in batch:
+                        copy.write(buffer)
+                else:
+                    copy.write_rows(batch)
+
+        if state.error is None:
+            conn.commit()
+            state.rowcounts.append(cur.rowcount)
+
+    except BaseException as ex:
+        state.fail(ex)
+
+
+async def _import_worker_async(
+    conn: AsyncConnection,
+    statement: Union[str, sql.Composable],
+    types: Optional[Sequence[Union[int, str]]],
+    batches: "asyncio.Queue[Optional[List[Any]]]",
+    state: _State,
+) -> None:
+    try:
+        cur = await conn.cursor()
+        async with cur.copy(statement) as copy:
+            if types:
+                copy.set_types(types)
+            while True:
+                batch = await _get_async(batches, state)
+                if batch is None:
+                    break
+                if _is_buffer(batch[0]):
+                    for buffer in batch:
+                        await copy.write(buffer)
+                else:
+                    await copy.write_rows(batch)
+
+        if state.error is None:
+            await conn.commit()
+            state.rowcounts.append(cur.rowcount)
+
+    except BaseException as ex:
+        state.fail(ex)
+
+
+def _put(q: "queue.Queue[Any]", item: Any, state: _State) -> bool:
+    """Put an item in a queue; return False if a worker failed meanwhile."""
+    while True:
+        try:
+            q.put(item, timeout=POLL_INTERVAL)
+            return True
+        except queue.Full:
+            if state.error is not None:
+                return False
+
+
+def _get(q: "queue.Queue[Any]", state: _State) -> Any:
+    """Get an item from a queue; raise the error of a failed worker."""
+    while True:
+        if state.error is not None:
+            raise state.error
+        try:
+            return q.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            pass
+
+
+async def _put_async(
+    q: "asyncio.Queue[Any]", item: Any, state: _State
+) -> bool:
+    while True:
+        try:
+            await asyncio.wait_for(q.put(item), POLL_INTERVAL)
+            return True
+        except asyncio.TimeoutError:
+            if state.error is not None:
+                return False
+
+
+async def _get_async(q: "asyncio.Queue[Any]", state: _State) -> Any:
+    while True:
+        if state.error is not None:
+            raise state.error
+        try:
+            return await asyncio.wait_for(q.get(), POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
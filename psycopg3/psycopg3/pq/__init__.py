@@ -16,7 +16,7 @@ from typing import Callable, List, Type
 from .misc import ConninfoOption, PQerror, PGnotify, PGresAttDesc
 from .misc import error_message
 from ._enums import ConnStatus, DiagnosticField, ExecStatus, Format
-from ._enums import Ping, PollingStatus, TransactionStatus
+from ._enums import Ping, PipelineStatus, PollingStatus, TransactionStatus
 from . import proto
 
 logger = logging.getLogger(__name__)
@@ -28,6 +28,7 @@ Possible values include ``python``, ``c``, ``binary``.
 """
 
 version: Callable[[], int]
+has_pipeline: Callable[[], bool]
 PGconn: Type[proto.PGconn]
 PGresult: Type[proto.PGresult]
 Conninfo: Type[proto.Conninfo]
@@ -43,7 +44,8 @@ def import_from_libpq() -> None:
     try to import the best implementation available.
     """
     # import these names into the module on success as side effect
-    global __impl__, version, PGconn, PGresult, Conninfo, Escaping, PGcancel
+    global __impl__, version, has_pipeline
+    global PGconn, PGresult, Conninfo, Escaping, PGcancel
 
     impl = os.environ.get("PSYCOPG3_IMPL", "").lower()
     module = None
@@ -83,6 +85,7 @@ def import_from_libpq() -> None:
     if module:
         __impl__ = module.__impl__
         version = module.version
+        has_pipeline = module.has_pipeline
         PGconn = module.PGconn
         PGresult = module.PGresult
         Conninfo = module.Conninfo
@@ -108,6 +111,7 @@ __all__ = (
     "TransactionStatus",
     "ExecStatus",
     "Ping",
+    "PipelineStatus",
     "DiagnosticField",
     "Format",
     "PGconn",
@@ -118,4 +122,5 @@ __all__ = (
     "error_message",
     "ConninfoOption",
     "version",
+    "has_pipeline",
 )
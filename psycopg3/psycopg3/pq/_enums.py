@@ -102,6 +102,40 @@ class ExecStatus(IntEnum):
     query.
     """
 
+    PIPELINE_SYNC = auto()
+    """
+    The PGresult represents a synchronization point in pipeline mode.
+
+    Requires libpq from PostgreSQL 14.
+    """
+
+    PIPELINE_ABORTED = auto()
+    """
+    The PGresult represents a pipeline that has received an error.
+
+    Requires libpq from PostgreSQL 14.
+    """
+
+
+class PipelineStatus(IntEnum):
+    """
+    The pipeline mode status of a connection.
+    """
+
+    __module__ = "psycopg3.pq"
+
+    OFF = 0
+    """The connection is not in pipeline mode."""
+
+    ON = auto()
+    """The connection is in pipeline mode."""
+
+    ABORTED = auto()
+    """
+    The connection is in pipeline mode and an error occurred while processing
+    the current pipeline.
+    """
+
 
 class TransactionStatus(IntEnum):
     """
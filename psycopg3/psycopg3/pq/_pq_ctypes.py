@@ -505,6 +505,67 @@ PQsetSingleRowMode.argtypes = [PGconn_ptr]
 PQsetSingleRowMode.restype = c_int
 
 
+# 33.5.bis Pipeline Mode (libpq >= 14)
+
+_PQpipelineStatus = None
+_PQenterPipelineMode = None
+_PQexitPipelineMode = None
+_PQpipelineSync = None
+
+if libpq_version >= 140000:
+    _PQpipelineStatus = pq.PQpipelineStatus
+    _PQpipelineStatus.argtypes = [PGconn_ptr]
+    _PQpipelineStatus.restype = c_int
+
+    _PQenterPipelineMode = pq.PQenterPipelineMode
+    _PQenterPipelineMode.argtypes = [PGconn_ptr]
+    _PQenterPipelineMode.restype = c_int
+
+    _PQexitPipelineMode = pq.PQexitPipelineMode
+    _PQexitPipelineMode.argtypes = [PGconn_ptr]
+    _PQexitPipelineMode.restype = c_int
+
+    _PQpipelineSync = pq.PQpipelineSync
+    _PQpipelineSync.argtypes = [PGconn_ptr]
+    _PQpipelineSync.restype = c_int
+
+
+def _pipeline_not_supported() -> NotSupportedError:
+    return NotSupportedError(
+        f"pipeline mode requires libpq from PostgreSQL 14,"
+        f" {libpq_version} available instead"
+    )
+
+
+def PQpipelineStatus(pgconn: type) -> int:
+    if _PQpipelineStatus:
+        return _PQpipelineStatus(pgconn)
+    else:
+        # The pipeline mode is always off if not supported
+        return 0
+
+
+def PQenterPipelineMode(pgconn: type) -> int:
+    if _PQenterPipelineMode:
+        return _PQenterPipelineMode(pgconn)
+    else:
+        raise _pipeline_not_supported()
+
+
+def PQexitPipelineMode(pgconn: type) -> int:
+    if _PQexitPipelineMode:
+        return _PQexitPipelineMode(pgconn)
+    else:
+        raise _pipeline_not_supported()
+
+
+def PQpipelineSync(pgconn: type) -> int:
+    if _PQpipelineSync:
+        return _PQpipelineSync(pgconn)
+    else:
+        raise _pipeline_not_supported()
+
+
 # 33.6. Canceling Queries in Progress
 
 PQgetCancel = pq.PQgetCancel
@@ -557,6 +618,23 @@ PQsetResultAttrs = pq.PQsetResultAttrs
 PQsetResultAttrs.argtypes = [PGresult_ptr, c_int, PGresAttDesc_ptr]
 PQsetResultAttrs.restype = c_int
 
+_PQresultMemorySize = None
+
+if libpq_version >= 120000:
+    _PQresultMemorySize = pq.PQresultMemorySize
+    _PQresultMemorySize.argtypes = [PGresult_ptr]
+    _PQresultMemorySize.restype = c_size_t
+
+
+def PQresultMemorySize(pgresult: type) -> int:
+    if _PQresultMemorySize:
+        return _PQresultMemorySize(pgresult)
+    else:
+        raise NotSupportedError(
+            f"PQresultMemorySize requires libpq from PostgreSQL 12,"
+            f" {libpq_version} available instead"
+        )
+
 
 # 33.12. Notice Processing
 
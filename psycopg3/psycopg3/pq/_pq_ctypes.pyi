@@ -38,6 +38,15 @@ class PGresAttDesc_struct:
     atttypmod: int
 
 def PQhostaddr(arg1: Optional[PGconn_struct]) -> bytes: ...
+def PQpipelineStatus(arg1: Optional[PGconn_struct]) -> int: ...
+def PQenterPipelineMode(arg1: Optional[PGconn_struct]) -> int: ...
+def PQexitPipelineMode(arg1: Optional[PGconn_struct]) -> int: ...
+def PQpipelineSync(arg1: Optional[PGconn_struct]) -> int: ...
+
+# Not None if the libpq loaded supports the pipeline mode
+_PQenterPipelineMode: Optional[Callable[[Optional[PGconn_struct]], int]]
+
+def PQresultMemorySize(arg1: Optional[PGresult_struct]) -> int: ...
 def PQerrorMessage(arg1: Optional[PGconn_struct]) -> bytes: ...
 def PQresultErrorMessage(arg1: Optional[PGresult_struct]) -> bytes: ...
 def PQexecPrepared(
@@ -186,6 +195,7 @@ def PQfreeCancel(arg1: Optional[PGcancel_struct]) -> None: ...
 def PQputCopyData(arg1: Optional[PGconn_struct], arg2: bytes, arg3: int) -> int: ...
 def PQfreemem(arg1: Any) -> None: ...
 def PQmakeEmptyPGresult(arg1: Optional[PGconn_struct], arg2: int) -> PGresult_struct: ...
+def _PQresultMemorySize(arg1: Optional[PGresult_struct]) -> int: ...
 # autogenerated: end
 # fmt: on
 
@@ -14,7 +14,7 @@ from weakref import ref
 from functools import partial
 
 from ctypes import Array, pointer, string_at, create_string_buffer, byref
-from ctypes import c_char_p, c_int, c_size_t, c_ulong
+from ctypes import c_char, c_char_p, c_int, c_size_t, c_ulong
 from typing import Any, Callable, List, Optional, Sequence, Tuple
 from typing import cast as t_cast, TYPE_CHECKING
 
@@ -36,6 +36,11 @@ def version() -> int:
     return impl.PQlibVersion()
 
 
+def has_pipeline() -> bool:
+    """Return `!True` if the libpq loaded supports the pipeline mode."""
+    return impl._PQenterPipelineMode is not None
+
+
 def notice_receiver(
     arg: Any, result_ptr: impl.PGresult_struct, wconn: "ref[PGconn]"
 ) -> None:
@@ -504,6 +509,43 @@ class PGconn:
         if not impl.PQsetSingleRowMode(self.pgconn_ptr):
             raise PQerror("setting single row mode failed")
 
+    @property
+    def pipeline_status(self) -> int:
+        """
+        The pipeline mode status of the connection.
+
+        See :pq:`PQpipelineStatus` for details.
+        """
+        return impl.PQpipelineStatus(self.pgconn_ptr)
+
+    def enter_pipeline_mode(self) -> None:
+        """
+        Put the connection in pipeline mode.
+
+        See :pq:`PQenterPipelineMode` for details. Requires libpq from
+        PostgreSQL 14.
+        """
+        if not impl.PQenterPipelineMode(self.pgconn_ptr):
+            raise PQerror("cannot enter pipeline mode")
+
+    def exit_pipeline_mode(self) -> None:
+        """
+        Put the connection out of pipeline mode.
+
+        See :pq:`PQexitPipelineMode` for details.
+        """
+        if not impl.PQexitPipelineMode(self.pgconn_ptr):
+            raise PQerror(f"cannot exit pipeline mode: {error_message(self)}")
+
+    def pipeline_sync(self) -> None:
+        """
+        Mark a synchronization point in a pipeline.
+
+        See :pq:`PQpipelineSync` for details.
+        """
+        if not impl.PQpipelineSync(self.pgconn_ptr):
+            raise PQerror(f"pipeline sync failed: {error_message(self)}")
+
     def get_cancel(self) -> "PGcancel":
         """
         Create an object with the information needed to cancel a command.
@@ -524,11 +566,16 @@ class PGconn:
         else:
             return None
 
-    def put_copy_data(self, buffer: bytes) -> int:
-        # TODO: should be done without copy
+    def put_copy_data(self, buffer: "proto.Buffer") -> int:
+        length = len(buffer)
+        cbuffer: Any = buffer
         if not isinstance(buffer, bytes):
-            buffer = bytes(buffer)
-        rv = impl.PQputCopyData(self.pgconn_ptr, buffer, len(buffer))
+            try:
+                # Writable buffers (e.g. bytearray) can be passed without copy
+                cbuffer = (c_char * length).from_buffer(buffer)
+            except TypeError:
+                cbuffer = bytes(buffer)
+        rv = impl.PQputCopyData(self.pgconn_ptr, cbuffer, length)
         if rv < 0:
             raise PQerror(f"sending copy data failed: {error_message(self)}")
         return rv
@@ -674,6 +721,9 @@ class PGresult:
             else:
                 return b""
 
+    def get_length(self, row_number: int, column_number: int) -> int:
+        return impl.PQgetlength(self.pgresult_ptr, row_number, column_number)
+
     @property
     def nparams(self) -> int:
         return impl.PQnparams(self.pgresult_ptr)
@@ -694,6 +744,17 @@ class PGresult:
     def oid_value(self) -> int:
         return impl.PQoidValue(self.pgresult_ptr)
 
+    @property
+    def memory_size(self) -> int:
+        """
+        The number of bytes allocated for the result.
+
+        Requires libpq from PostgreSQL 12. Return 0 if the result was cleared.
+        """
+        if not self.pgresult_ptr:
+            return 0
+        return impl.PQresultMemorySize(self.pgresult_ptr)
+
     def set_attributes(self, descriptions: List[PGresAttDesc]) -> None:
         structs = [
             impl.PGresAttDesc_struct(*desc)  # type: ignore
@@ -217,13 +217,26 @@ class PGconn(Protocol):
     def set_single_row_mode(self) -> None:
         ...
 
+    @property
+    def pipeline_status(self) -> int:
+        ...
+
+    def enter_pipeline_mode(self) -> None:
+        ...
+
+    def exit_pipeline_mode(self) -> None:
+        ...
+
+    def pipeline_sync(self) -> None:
+        ...
+
     def get_cancel(self) -> "PGcancel":
         ...
 
     def notifies(self) -> Optional["PGnotify"]:
         ...
 
-    def put_copy_data(self, buffer: bytes) -> int:
+    def put_copy_data(self, buffer: Buffer) -> int:
         ...
 
     def put_copy_end(self, error: Optional[bytes] = None) -> int:
@@ -289,6 +302,9 @@ class PGresult(Protocol):
     ) -> Optional[bytes]:
         ...
 
+    def get_length(self, row_number: int, column_number: int) -> int:
+        ...
+
     @property
     def nparams(self) -> int:
         ...
@@ -308,6 +324,10 @@ class PGresult(Protocol):
     def oid_value(self) -> int:
         ...
 
+    @property
+    def memory_size(self) -> int:
+        ...
+
     def set_attributes(self, descriptions: List["PGresAttDesc"]) -> None:
         ...
 
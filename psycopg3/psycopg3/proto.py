@@ -17,11 +17,15 @@ if TYPE_CHECKING:
     from .adapt import Dumper, Loader, AdaptersMap
     from .waiting import Wait, Ready
     from .sql import Composable
+    from ._queries import PreparedQuery
+    from ._profiling import AdaptersProfile
 
 # An object implementing the buffer protocol
 Buffer = Union[bytes, bytearray, memoryview]
 
 Query = Union[str, bytes, "Composable"]
+# A query, or one converted in advance by Connection.prepare_query()
+AnyQuery = Union[Query, "PreparedQuery"]
 Params = Union[Sequence[Any], Mapping[str, Any]]
 ConnectionType = TypeVar("ConnectionType", bound="BaseConnection")
 
@@ -70,6 +74,8 @@ class AdaptContext(Protocol):
 
 
 class Transformer(Protocol):
+    profile: Optional["AdaptersProfile"]
+
     def __init__(self, context: Optional[AdaptContext] = None):
         ...
 
@@ -81,6 +87,10 @@ class Transformer(Protocol):
     def adapters(self) -> "AdaptersMap":
         ...
 
+    @property
+    def encoding(self) -> str:
+        ...
+
     @property
     def pgresult(self) -> Optional[pq.proto.PGresult]:
         ...
@@ -89,6 +99,11 @@ class Transformer(Protocol):
     def pgresult(self, result: Optional[pq.proto.PGresult]) -> None:
         ...
 
+    def set_pgresult(
+        self, result: Optional[pq.proto.PGresult], set_loaders: bool = True
+    ) -> None:
+        ...
+
     def set_row_types(
         self, types: Sequence[int], formats: Sequence[pq.Format]
     ) -> None:
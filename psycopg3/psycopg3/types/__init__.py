@@ -19,6 +19,8 @@ from .range import Range
 # Supper objects
 from .range import RangeInfo
 from .composite import CompositeInfo
+from .enum import EnumInfo
+from .database import DatabaseTypes, DomainInfo
 
 # Adapter objects
 from .text import (
@@ -227,4 +229,4 @@ def register_default_globals(ctx: AdaptContext) -> None:
     RecordLoader.register("record", ctx)
     RecordBinaryLoader.register("record", ctx)
 
-    array.register_all_arrays()
+    array.register_all_arrays(ctx)
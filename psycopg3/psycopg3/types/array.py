@@ -208,11 +208,17 @@ class ListBinaryDumper(BaseListDumper):
 
 
 class BaseArrayLoader(Loader):
-    base_oid: int
+
+    # The oid of the array elements. If 0, it is looked up among the builtins.
+    base_oid = 0
 
     def __init__(self, oid: int, context: Optional[AdaptContext] = None):
         super().__init__(oid, context)
         self._tx = Transformer(context)
+        if not self.base_oid:
+            info = builtins.get(oid)
+            if info and info.array_oid == oid:
+                self.base_oid = info.oid
 
 
 class ArrayLoader(BaseArrayLoader):
@@ -287,7 +293,8 @@ class ArrayBinaryLoader(BaseArrayLoader):
         if not ndims:
             return []
 
-        fcast = self._tx.get_loader(oid, self.format).load
+        # The oid in the data is the domain's one for arrays of domains.
+        fcast = self._tx.get_loader(self.base_oid or oid, self.format).load
 
         p = 12 + 8 * ndims
         dims = [
@@ -332,14 +339,15 @@ def register(
         loader.register(array_oid, context=context)
 
 
-def register_all_arrays() -> None:
+def register_all_arrays(context: Optional[AdaptContext] = None) -> None:
     """
-    Associate the array oid of all the types in Loader.globals.
+    Associate the array oid of all the builtin types to the array loaders.
 
-    This function is designed to be called once at import time, after having
-    registered all the base loaders.
+    The loaders registered are generic: they find the oid of the array
+    elements on creation, so no class needs to be created for each type.
     """
     for t in builtins:
         # TODO: handle different delimiters (box)
         if t.array_oid and getattr(t, "delimiter", None) == ",":
-            register(t.array_oid, t.oid, name=t.name)
+            ArrayLoader.register(t.array_oid, context=context)
+            ArrayBinaryLoader.register(t.array_oid, context=context)
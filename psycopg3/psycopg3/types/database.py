@@ -0,0 +1,214 @@
+"""
+Information about the custom data types defined in a database.
+"""
+
+# Copyright (C) 2020-2021 The Psycopg Team
+
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+from typing import TYPE_CHECKING
+
+from ..oids import TypeInfo, TypesRegistry
+from ..proto import AdaptContext
+from . import array
+from .enum import EnumInfo
+from .range import RangeInfo
+from .composite import CompositeInfo
+
+if TYPE_CHECKING:
+    from ..connection import BaseConnection, Connection, AsyncConnection
+
+# The key identifying a database in the cache: host, port, dbname, user
+DatabaseKey = Tuple[bytes, bytes, bytes, bytes]
+
+
+class DomainInfo(TypeInfo):
+    """Information about a domain."""
+
+    def __init__(self, name: str, oid: int, array_oid: int, base_oid: int):
+        super().__init__(name, oid, array_oid)
+        self.base_oid = base_oid
+
+
+class DatabaseTypes(TypesRegistry):
+    """
+    The custom data types defined in a database.
+
+    The composite types, enums, domains and ranges defined in a database (and
+    their arrays) are read using a single query and kept in a cache shared by
+    all the connections to the same database, as the same user.
+
+    Only the composite types created by :sql:`CREATE TYPE` are read, not the
+    row types of the tables and views, which would make the cache as large
+    as the schema: use `CompositeInfo.fetch()` for them.
+
+    The class allows to:
+
+    - read the types of a database using `fetch()` and `fetch_async()`
+    - configure the adaptation of one of these types using `register()`
+    """
+
+    _cache: Dict[DatabaseKey, "DatabaseTypes"] = {}
+
+    @classmethod
+    def fetch(
+        cls, conn: "Connection", refresh: bool = False
+    ) -> "DatabaseTypes":
+        """
+        Return the types of the database *conn* is connected to.
+
+        The types are only read from the database the first time, unless
+        *refresh* is true (e.g. because new types have been created).
+        """
+        key = cls._get_key(conn)
+        if not refresh:
+            rv = cls._cache.get(key)
+            if rv:
+                return rv
+
+        cur = conn.cursor()
+        cur.execute(cls._info_query)
+        rv = cls._cache[key] = cls._from_records(cur.fetchall())
+        return rv
+
+    @classmethod
+    async def fetch_async(
+        cls, conn: "AsyncConnection", refresh: bool = False
+    ) -> "DatabaseTypes":
+        """
+        Return the types of the database *conn* is connected to.
+
+        Async version of `fetch()`.
+        """
+        key = cls._get_key(conn)
+        if not refresh:
+            rv = cls._cache.get(key)
+            if rv:
+                return rv
+
+        cur = await conn.cursor()
+        await cur.execute(cls._info_query)
+        rv = cls._cache[key] = cls._from_records(await cur.fetchall())
+        return rv
+
+    @classmethod
+    def cached(cls, conn: "BaseConnection") -> Optional["DatabaseTypes"]:
+        """
+        Return the types of the database *conn* is connected to.
+
+        Return None if the types were not fetched yet.
+        """
+        return cls._cache.get(cls._get_key(conn))
+
+    def get_oid(self, name: str) -> int:
+        """
+        Return the oid of a type by name.
+
+        Return the array oid if the type ends with "[]". Domains are
+        resolved to the oid of their base type, which is the one used by the
+        server to return their values.
+
+        Raise KeyError if the name is unknown.
+        """
+        oid = super().get_oid(name)
+        if not name.endswith("[]"):
+            oid = self._get_base_oid(oid)
+        return oid
+
+    def register(
+        self,
+        name: Union[str, int],
+        context: Optional[AdaptContext] = None,
+    ) -> None:
+        """
+        Configure the adaptation of the type *name* in *context*.
+
+        Composite types, enums and ranges are registered as by their
+        `!register()` method; the arrays of every type are returned as lists.
+
+        Raise KeyError if the name is unknown.
+        """
+        info = self[name]
+        if isinstance(info, (CompositeInfo, EnumInfo, RangeInfo)):
+            info.register(context)
+        elif info.array_oid:
+            array.register(
+                info.array_oid,
+                self._get_base_oid(info.oid),
+                context=context,
+                name=info.name,
+            )
+
+    def _get_base_oid(self, oid: int) -> int:
+        info = self._by_oid.get(oid)
+        # Follow domains defined on other domains
+        while isinstance(info, DomainInfo) and info.oid == oid:
+            oid = info.base_oid
+            info = self._by_oid.get(oid)
+        return oid
+
+    @classmethod
+    def _get_key(cls, conn: "BaseConnection") -> DatabaseKey:
+        pgconn = conn.pgconn
+        return (pgconn.host, pgconn.port, pgconn.db, pgconn.user)
+
+    @classmethod
+    def _from_records(cls, recs: Sequence[Any]) -> "DatabaseTypes":
+        rv = cls()
+        for rec in recs:
+            name, regtype, oid, array_oid, kind = rec[:5]
+            info: TypeInfo
+            if kind == "c":
+                fnames, ftypes = rec[7:9]
+                fields = [
+                    CompositeInfo.FieldInfo(*p) for p in zip(fnames, ftypes)
+                ]
+                info = CompositeInfo(name, oid, array_oid, fields)
+            elif kind == "r":
+                info = RangeInfo(name, oid, array_oid, rec[5])
+            elif kind == "d":
+                info = DomainInfo(name, oid, array_oid, rec[6])
+            elif kind == "e":
+                info = EnumInfo(name, oid, array_oid, rec[9])
+            else:
+                info = TypeInfo(name, oid, array_oid)
+
+            rv.add(info)
+            # Allow to look up the type by schema-qualified name too
+            if regtype != name:
+                rv._by_name[regtype] = info
+
+        return rv
+
+    # Types in the search path are returned last, so that they take
+    # precedence on the ones with the same name in other schemas.
+    _info_query = """\
+select
+    t.typname as name, t.oid::regtype::text as regtype,
+    t.oid as oid, t.typarray as array_oid, t.typtype::text as kind,
+    r.rngsubtype as range_subtype, t.typbasetype as base_oid,
+    coalesce(a.fnames, '{}') as fnames,
+    coalesce(a.ftypes, '{}') as ftypes,
+    coalesce(x.labels, '{}') as labels
+from pg_type t
+join pg_namespace n on n.oid = t.typnamespace
+left join pg_class c on c.oid = t.typrelid
+left join pg_range r on r.rngtypid = t.oid
+left join lateral (
+    select
+        array_agg(attname order by attnum) as fnames,
+        array_agg(atttypid order by attnum) as ftypes
+    from pg_attribute
+    where attrelid = t.typrelid
+    and attnum > 0
+    and not attisdropped
+) a on true
+left join lateral (
+    select array_agg(enumlabel order by enumsortorder) as labels
+    from pg_enum
+    where enumtypid = t.oid
+) x on true
+where (t.typtype in ('d', 'e', 'r') or c.relkind = 'c')
+and n.nspname not in ('pg_catalog', 'information_schema')
+and n.nspname !~ '^pg_toast'
+order by pg_type_is_visible(t.oid), t.oid
+"""
@@ -0,0 +1,209 @@
+"""
+Support for enum types adaptation.
+"""
+
+# Copyright (C) 2020-2021 The Psycopg Team
+
+from enum import Enum
+from typing import Any, Dict, Optional, Sequence, Type, Union, TYPE_CHECKING
+
+from .. import pq
+from .. import sql
+from .. import errors as e
+from ..oids import TypeInfo
+from ..adapt import Buffer, Dumper, Loader
+from ..proto import AdaptContext
+from . import array
+
+if TYPE_CHECKING:
+    from ..connection import Connection, AsyncConnection
+
+
+class EnumInfo(TypeInfo):
+    """Manage information about an enum type.
+
+    The class allows to:
+
+    - read information about an enum type using `fetch()` and `fetch_async()`
+    - configure an enum type adaptation using `register()`
+    """
+
+    def __init__(
+        self, name: str, oid: int, array_oid: int, labels: Sequence[str]
+    ):
+        super().__init__(name, oid, array_oid)
+        self.labels = list(labels)
+
+    @classmethod
+    def fetch(
+        cls, conn: "Connection", name: Union[str, sql.Identifier]
+    ) -> Optional["EnumInfo"]:
+        if isinstance(name, sql.Composable):
+            name = name.as_string(conn)
+        cur = conn.cursor()
+        cur.execute(cls._info_query, {"name": name})
+        recs = cur.fetchall()
+        return cls._from_records(recs)
+
+    @classmethod
+    async def fetch_async(
+        cls, conn: "AsyncConnection", name: Union[str, sql.Identifier]
+    ) -> Optional["EnumInfo"]:
+        if isinstance(name, sql.Composable):
+            name = name.as_string(conn)
+        cur = await conn.cursor()
+        await cur.execute(cls._info_query, {"name": name})
+        recs = await cur.fetchall()
+        return cls._from_records(recs)
+
+    def register(
+        self,
+        context: Optional[AdaptContext] = None,
+        enum: Optional[Type[Enum]] = None,
+    ) -> Type[Enum]:
+        """
+        Configure the adaptation of the enum type in *context*.
+
+        The values of the enum are loaded as members of the Python *enum*,
+        which must have a member with the same name for every label; if not
+        specified, an `!Enum` class is created with the enum labels as
+        members. The members of *enum* are dumped as the enum labels.
+
+        Return the Python enum used.
+        """
+        penum: Type[Enum]
+        if not enum:
+            penum = Enum(self.name, self.labels)  # type: ignore
+        else:
+            penum = enum
+            members = penum.__members__
+            missing = [lbl for lbl in self.labels if lbl not in members]
+            if missing:
+                raise e.ProgrammingError(
+                    f"the enum {penum.__name__} has no members for the labels"
+                    f" {', '.join(missing)} of the type {self.name}"
+                )
+
+        attribs: Dict[str, Any] = {"enum": penum, "_maps": {}}
+
+        loader: Type[Loader]
+        for base in (EnumLoader, EnumBinaryLoader):
+            fmt = "Binary" if base.format == pq.Format.BINARY else ""
+            loader = type(f"{self.name.title()}{fmt}Loader", (base,), attribs)
+            loader.register(self.oid, context=context)
+
+        dumper: Type[Dumper]
+        for dbase in (EnumDumper, EnumBinaryDumper):
+            fmt = "Binary" if dbase.format == pq.Format.BINARY else ""
+            dumper = type(
+                f"{self.name.title()}{fmt}Dumper",
+                (dbase,),
+                {"_oid": self.oid, "_maps": {}},
+            )
+            dumper.register(penum, context=context)
+
+        if self.array_oid:
+            array.register(
+                self.array_oid, self.oid, context=context, name=self.name
+            )
+
+        return penum
+
+    @classmethod
+    def _from_records(cls, recs: Sequence[Any]) -> Optional["EnumInfo"]:
+        if not recs:
+            return None
+        if len(recs) > 1:
+            raise e.ProgrammingError(
+                f"found {len(recs)} different types named {recs[0][0]}"
+            )
+
+        name, oid, array_oid, labels = recs[0]
+        return cls(name, oid, array_oid, labels)
+
+    _info_query = """\
+select
+    t.typname as name, t.oid as oid, t.typarray as array_oid,
+    array_agg(x.enumlabel order by x.enumsortorder) as labels
+from pg_type t
+join pg_enum x on x.enumtypid = t.oid
+where t.oid = %(name)s::regtype
+group by t.typname, t.oid, t.typarray
+"""
+
+
+class _EnumAdapter:
+    """
+    Mixin for the enum loaders and dumpers, providing the map between enum
+    members and the labels encoded in the connection encoding.
+
+    The maps are built once per encoding and stored on the adapter class.
+    """
+
+    enum: Type[Enum]
+    _maps: Dict[str, Dict[Any, Any]]
+    _encoding = "utf-8"
+
+    def _set_encoding(self, context: Optional[AdaptContext]) -> None:
+        conn = context.connection if context else None
+        if conn:
+            enc = conn.client_encoding
+            if enc != "ascii":
+                self._encoding = enc
+
+
+class EnumLoader(_EnumAdapter, Loader):
+
+    format = pq.Format.TEXT
+
+    def __init__(self, oid: int, context: Optional[AdaptContext] = None):
+        super().__init__(oid, context)
+        self._set_encoding(context)
+        self._load_map: Dict[bytes, Enum]
+        try:
+            self._load_map = self._maps[self._encoding]
+        except KeyError:
+            self._load_map = self._maps[self._encoding] = {
+                m.name.encode(self._encoding): m for m in self.enum
+            }
+
+    def load(self, data: Buffer) -> Enum:
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        try:
+            return self._load_map[data]
+        except KeyError:
+            raise e.DataError(
+                f"bad {self.enum.__name__} value:"
+                f" {data.decode(self._encoding, 'replace')!r}"
+            ) from None
+
+
+class EnumBinaryLoader(EnumLoader):
+
+    # The binary representation of enums is the same as the text one.
+    format = pq.Format.BINARY
+
+
+class EnumDumper(_EnumAdapter, Dumper):
+
+    format = pq.Format.TEXT
+
+    def __init__(self, cls: type, context: Optional[AdaptContext] = None):
+        super().__init__(cls, context)
+        self._set_encoding(context)
+        self._dump_map: Dict[Enum, bytes]
+        try:
+            self._dump_map = self._maps[self._encoding]
+        except KeyError:
+            self._dump_map = self._maps[self._encoding] = {
+                m: m.name.encode(self._encoding) for m in cls  # type: ignore
+            }
+
+    def dump(self, obj: Enum) -> bytes:
+        return self._dump_map[obj]
+
+
+class EnumBinaryDumper(EnumDumper):
+
+    format = pq.Format.BINARY
@@ -44,8 +44,8 @@ class _JsonDumper(Dumper):
 
     format = Format.TEXT
 
-    def dump(self, obj: _JsonWrapper) -> bytes:
-        return obj.dumps().encode("utf-8")
+    def dump(self, obj: Any) -> bytes:
+        return _dumps(obj).encode("utf-8")
 
 
 class JsonDumper(_JsonDumper):
@@ -69,8 +69,17 @@ class JsonbBinaryDumper(JsonbDumper):
 
     format = Format.BINARY
 
-    def dump(self, obj: _JsonWrapper) -> bytes:
-        return b"\x01" + obj.dumps().encode("utf-8")
+    def dump(self, obj: Any) -> bytes:
+        return b"\x01" + _dumps(obj).encode("utf-8")
+
+
+def _dumps(obj: Any) -> str:
+    # Objects not wrapped can be received if the dumper is chosen by oid, for
+    # instance in a binary copy with the types set.
+    if isinstance(obj, _JsonWrapper):
+        return obj.dumps()
+    else:
+        return json.dumps(obj)
 
 
 class JsonLoader(Loader):
@@ -8,6 +8,7 @@ import struct
 from typing import Any, Callable, Dict, Tuple, cast
 from decimal import Decimal
 
+from .. import errors as e
 from ..pq import Format
 from ..oids import builtins
 from ..adapt import Buffer, Dumper, Loader
@@ -148,7 +149,10 @@ class Int2BinaryDumper(Int2Dumper):
     format = Format.BINARY
 
     def dump(self, obj: int) -> bytes:
-        return _pack_int2(obj)
+        try:
+            return _pack_int2(obj)
+        except struct.error:
+            raise e.DataError(f"value out of int2 range: {obj}") from None
 
 
 class Int4BinaryDumper(Int4Dumper):
@@ -156,7 +160,10 @@ class Int4BinaryDumper(Int4Dumper):
     format = Format.BINARY
 
     def dump(self, obj: int) -> bytes:
-        return _pack_int4(obj)
+        try:
+            return _pack_int4(obj)
+        except struct.error:
+            raise e.DataError(f"value out of int4 range: {obj}") from None
 
 
 class Int8BinaryDumper(Int8Dumper):
@@ -164,7 +171,10 @@ class Int8BinaryDumper(Int8Dumper):
     format = Format.BINARY
 
     def dump(self, obj: int) -> bytes:
-        return _pack_int8(obj)
+        try:
+            return _pack_int8(obj)
+        except struct.error:
+            raise e.DataError(f"value out of int8 range: {obj}") from None
 
 
 class IntNumericBinaryDumper(IntNumericDumper):
@@ -13,7 +13,7 @@ import select
 import selectors
 from enum import IntEnum
 from typing import Optional
-from asyncio import get_event_loop, Event
+from asyncio import get_event_loop, AbstractEventLoop, Future
 from selectors import DefaultSelector, EVENT_READ, EVENT_WRITE
 
 from . import errors as e
@@ -105,44 +105,25 @@ async def wait_async(gen: PQGen[RV], fileno: int) -> RV:
 
     Behave like in `wait()`, but exposing an `asyncio` interface.
     """
-    # Use an event to block and restart after the fd state changes.
-    # Not sure this is the best implementation but it's a start.
-    ev = Event()
+    # The generator is advanced optimistically: the loop is involved only if
+    # it yields, i.e. if the operation would block. The file descriptor stays
+    # registered on the loop across the generator steps requesting the same
+    # wait state, and it is unregistered only when the generator is done.
     loop = get_event_loop()
-    ready: Ready
-    s: Wait
-
-    def wakeup(state: Ready) -> None:
-        nonlocal ready
-        ready = state
-        ev.set()
-
+    waiter = _AsyncWaiter(loop)
     try:
         s = next(gen)
         while 1:
-            ev.clear()
-            if s == Wait.R:
-                loop.add_reader(fileno, wakeup, Ready.R)
-                await ev.wait()
-                loop.remove_reader(fileno)
-            elif s == Wait.W:
-                loop.add_writer(fileno, wakeup, Ready.W)
-                await ev.wait()
-                loop.remove_writer(fileno)
-            elif s == Wait.RW:
-                loop.add_reader(fileno, wakeup, Ready.R)
-                loop.add_writer(fileno, wakeup, Ready.W)
-                await ev.wait()
-                loop.remove_reader(fileno)
-                loop.remove_writer(fileno)
-            else:
-                raise e.InternalError("bad poll status: %s")
+            ready = await waiter.wait(fileno, s)
             s = gen.send(ready)
 
     except StopIteration as ex:
         rv: RV = ex.args[0] if ex.args else None
         return rv
 
+    finally:
+        waiter.close()
+
 
 async def wait_conn_async(gen: PQGenConn[RV]) -> RV:
     """
@@ -157,44 +138,86 @@ async def wait_conn_async(gen: PQGenConn[RV]) -> RV:
     Behave like in `wait()`, but take the fileno to wait from the generator
     itself, which might change during processing.
     """
-    # Use an event to block and restart after the fd state changes.
-    # Not sure this is the best implementation but it's a start.
-    ev = Event()
     loop = get_event_loop()
-    ready: Ready
-    s: Wait
-
-    def wakeup(state: Ready) -> None:
-        nonlocal ready
-        ready = state
-        ev.set()
-
+    waiter = _AsyncWaiter(loop)
     try:
         fileno, s = next(gen)
         while 1:
-            ev.clear()
-            if s == Wait.R:
-                loop.add_reader(fileno, wakeup, Ready.R)
-                await ev.wait()
-                loop.remove_reader(fileno)
-            elif s == Wait.W:
-                loop.add_writer(fileno, wakeup, Ready.W)
-                await ev.wait()
-                loop.remove_writer(fileno)
-            elif s == Wait.RW:
-                loop.add_reader(fileno, wakeup, Ready.R)
-                loop.add_writer(fileno, wakeup, Ready.W)
-                await ev.wait()
-                loop.remove_reader(fileno)
-                loop.remove_writer(fileno)
-            else:
-                raise e.InternalError("bad poll status: %s")
+            ready = await waiter.wait(fileno, s)
             fileno, s = gen.send(ready)
 
     except StopIteration as ex:
         rv: RV = ex.args[0] if ex.args else None
         return rv
 
+    finally:
+        waiter.close()
+
+
+class _AsyncWaiter:
+    """
+    Helper to wait on a file descriptor using the asyncio loop.
+
+    The reader/writer callbacks are added to the loop only when the wait
+    state changes, instead of being added and removed at every wait. A new
+    loop future is only created when there is actually something to wait.
+    """
+
+    __slots__ = ("_loop", "_fileno", "_reading", "_writing", "_fut")
+
+    def __init__(self, loop: AbstractEventLoop):
+        self._loop = loop
+        self._fileno = -1
+        self._reading = False
+        self._writing = False
+        self._fut: Optional["Future[Ready]"] = None
+
+    def wait(self, fileno: int, s: Wait) -> "Future[Ready]":
+        if s != Wait.R and s != Wait.W and s != Wait.RW:
+            raise e.InternalError(f"bad poll status: {s}")
+
+        if fileno != self._fileno:
+            # The connection may change fd while connecting
+            self.close()
+            self._fileno = fileno
+
+        self._fut = fut = self._loop.create_future()
+
+        if s & Wait.R:
+            if not self._reading:
+                self._loop.add_reader(fileno, self._wakeup, Ready.R)
+                self._reading = True
+        elif self._reading:
+            self._loop.remove_reader(fileno)
+            self._reading = False
+
+        if s & Wait.W:
+            if not self._writing:
+                self._loop.add_writer(fileno, self._wakeup, Ready.W)
+                self._writing = True
+        elif self._writing:
+            self._loop.remove_writer(fileno)
+            self._writing = False
+
+        return fut
+
+    def close(self) -> None:
+        """Remove the file descriptor from the loop, if registered."""
+        if self._reading:
+            self._loop.remove_reader(self._fileno)
+            self._reading = False
+        if self._writing:
+            self._loop.remove_writer(self._fileno)
+            self._writing = False
+        self._fut = None
+
+    def _wakeup(self, state: Ready) -> None:
+        # The callbacks may stay registered after the future is resolved, e.g.
+        # if the fd is ready for both read and write.
+        fut = self._fut
+        if fut is not None and not fut.done():
+            fut.set_result(state)
+
 
 poll_evmasks = {
     Wait.R: select.EPOLLONESHOT | select.EPOLLIN,
@@ -7,24 +7,33 @@ information. Will submit a bug.
 
 # Copyright (C) 2020-2021 The Psycopg Team
 
-from typing import Any, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+from typing import Union
 
 from psycopg3 import proto
-from psycopg3.adapt import Dumper, Loader, AdaptersMap, Format
+from psycopg3.adapt import Dumper, Loader, AdaptersMap, AdaptersProfile
+from psycopg3.adapt import Format
 from psycopg3.connection import BaseConnection
 from psycopg3 import pq
+from psycopg3._queries import QueryPart
 from psycopg3.pq.proto import PGconn, PGresult
 
 class Transformer(proto.AdaptContext):
+    profile: Optional[AdaptersProfile]
     def __init__(self, context: Optional[proto.AdaptContext] = None): ...
     @property
     def connection(self) -> Optional[BaseConnection]: ...
     @property
     def adapters(self) -> AdaptersMap: ...
     @property
+    def encoding(self) -> str: ...
+    @property
     def pgresult(self) -> Optional[PGresult]: ...
     @pgresult.setter
     def pgresult(self, result: Optional[PGresult]) -> None: ...
+    def set_pgresult(
+        self, result: Optional[PGresult], set_loaders: bool = True
+    ) -> None: ...
     def set_row_types(
         self, types: Sequence[int], formats: Sequence[pq.Format]
     ) -> None: ...
@@ -42,6 +51,9 @@ class Transformer(proto.AdaptContext):
 # Generators
 def connect(conninfo: str) -> proto.PQGenConn[PGconn]: ...
 def execute(pgconn: PGconn) -> proto.PQGen[List[PGresult]]: ...
+def copy_from_block(
+    pgconn: PGconn, buffer: bytearray, pos: int = 0
+) -> proto.PQGen[Tuple[int, Union[memoryview, PGresult, None]]]: ...
 
 # Copy support
 def format_row_text(
@@ -50,9 +62,26 @@ def format_row_text(
 def format_row_binary(
     row: Sequence[Any], tx: proto.Transformer, out: Optional[bytearray] = None
 ) -> bytearray: ...
+def format_rows_text(
+    rows: Iterator[Sequence[Any]],
+    tx: proto.Transformer,
+    out: bytearray,
+    size: int,
+) -> bool: ...
+def prepare_row_dumpers(dumpers: Sequence[Optional[Dumper]]) -> Any: ...
+def format_rows_binary(
+    rows: Iterator[Sequence[Any]],
+    tx: proto.Transformer,
+    out: bytearray,
+    size: int,
+    dumpers: Any = None,
+) -> bool: ...
 def parse_row_text(data: bytes, tx: proto.Transformer) -> Tuple[Any, ...]: ...
 def parse_row_binary(
     data: bytes, tx: proto.Transformer
 ) -> Tuple[Any, ...]: ...
 
+# Queries support
+def split_query(query: bytes, encoding: str = "ascii") -> List[QueryPart]: ...
+
 # vim: set syntax=python:
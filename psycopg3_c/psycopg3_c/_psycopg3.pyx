@@ -25,6 +25,7 @@ PG_BINARY = _pg_Format.BINARY
 include "_psycopg3/adapt.pyx"
 include "_psycopg3/copy.pyx"
 include "_psycopg3/generators.pyx"
+include "_psycopg3/queries.pyx"
 include "_psycopg3/transform.pyx"
 
 include "types/numeric.pyx"
@@ -9,6 +9,7 @@ from libc.string cimport memcpy
 from libc.stdint cimport uint16_t, uint32_t, int32_t
 from cpython.bytearray cimport PyByteArray_FromStringAndSize, PyByteArray_Resize
 from cpython.bytearray cimport PyByteArray_AS_STRING, PyByteArray_GET_SIZE
+from cpython.object cimport PyObject
 from cpython.memoryview cimport PyMemoryView_FromObject
 
 from psycopg3_c._psycopg3 cimport endian
@@ -23,9 +24,6 @@ def format_row_binary(
     row: Sequence[Any], tx: Transformer, out: bytearray = None
 ) -> bytearray:
     """Convert a row of adapted data to the data to send for binary copy"""
-    cdef Py_ssize_t rowlen = len(row)
-    cdef uint16_t berowlen = endian.htobe16(rowlen)
-
     cdef Py_ssize_t pos  # offset in 'out' where to write
     if out is None:
         out = PyByteArray_FromStringAndSize("", 0)
@@ -33,6 +31,73 @@ def format_row_binary(
     else:
         pos = PyByteArray_GET_SIZE(out)
 
+    pos = _append_row_binary(row, tx, out, pos, None)
+
+    # Resize to the final size
+    PyByteArray_Resize(out, pos)
+    return out
+
+
+def prepare_row_dumpers(dumpers: Sequence[Any]) -> list:
+    """
+    Convert a sequence of dumpers to pass to `format_rows_binary()`.
+
+    Convert it only once if several calls use the same dumpers.
+    """
+    return [
+        (None, _as_row_dumper(d)) if d is not None else None for d in dumpers
+    ]
+
+
+def format_rows_binary(
+    rows: Iterator[Sequence[Any]],
+    tx: Transformer,
+    out: bytearray,
+    size: int,
+    dumpers: Optional[Sequence[Any]] = None,
+) -> bool:
+    """
+    Convert rows from an iterator to the data to send for binary copy.
+
+    Stop when *out* is larger than *size*. Return `!False` if there are no
+    more rows to read from *rows*.
+
+    If *dumpers* is specified, it must be the value returned by
+    `prepare_row_dumpers()`: use its items, if not `!None`, to dump the values
+    in the respective columns, regardless of their type.
+    """
+    cdef Py_ssize_t pos = PyByteArray_GET_SIZE(out)
+    cdef list pins = []
+    cdef int rv = 1
+
+    if dumpers is not None:
+        pins = dumpers
+
+    try:
+        for row in rows:
+            pos = _append_row_binary(row, tx, out, pos, pins)
+            if pos > size:
+                break
+        else:
+            rv = 0
+    finally:
+        # Resize to the final size; drop a row partially written on error
+        PyByteArray_Resize(out, pos)
+
+    return bool(rv)
+
+
+cdef Py_ssize_t _append_row_binary(
+    object row, Transformer tx, bytearray out, Py_ssize_t pos, list pins
+) except -1:
+    """
+    Write a row for binary copy into *out* at *pos*; return the new position.
+
+    The size of *out* may be larger than the position returned.
+    """
+    cdef Py_ssize_t rowlen = len(row)
+    cdef uint16_t berowlen = endian.htobe16(rowlen)
+
     # let's start from a nice chunk
     # (larger than most fixed size; for variable ones, oh well, we'll resize it)
     cdef char *target = CDumper.ensure_size(
@@ -52,7 +117,10 @@ def format_row_binary(
     for i in range(rowlen):
         item = row[i]
         if item is not None:
-            row_dumper = tx.get_row_dumper(<PyObject *>item, fmt)
+            if pins is not None:
+                row_dumper = _get_column_dumper(tx, item, fmt, pins, i)
+            else:
+                row_dumper = tx.get_row_dumper(<PyObject *>item, fmt)
             if (<RowDumper>row_dumper).cdumper is not None:
                 # A cdumper can resize if necessary and copy in place
                 size = (<RowDumper>row_dumper).cdumper.cdump(
@@ -78,9 +146,7 @@ def format_row_binary(
             memcpy(target, <void *>&_binary_null, sizeof(_binary_null))
             pos += sizeof(_binary_null)
 
-    # Resize to the final size
-    PyByteArray_Resize(out, pos)
-    return out
+    return pos
 
 
 def format_row_text(
@@ -93,12 +159,55 @@ def format_row_text(
     else:
         pos = PyByteArray_GET_SIZE(out)
 
+    pos = _append_row_text(row, tx, out, pos, None)
+
+    # Resize to the final size
+    PyByteArray_Resize(out, pos)
+    return out
+
+
+def format_rows_text(
+    rows: Iterator[Sequence[Any]], tx: Transformer, out: bytearray, size: int
+) -> bool:
+    """
+    Convert rows from an iterator to the data to send for copy.
+
+    Stop when *out* is larger than *size*. Return `!False` if there are no
+    more rows to read from *rows*.
+    """
+    cdef Py_ssize_t pos = PyByteArray_GET_SIZE(out)
+    cdef list pins = []
+    cdef int rv = 1
+
+    try:
+        for row in rows:
+            pos = _append_row_text(row, tx, out, pos, pins)
+            if pos > size:
+                break
+        else:
+            rv = 0
+    finally:
+        # Resize to the final size; drop a row partially written on error
+        PyByteArray_Resize(out, pos)
+
+    return bool(rv)
+
+
+cdef Py_ssize_t _append_row_text(
+    object row, Transformer tx, bytearray out, Py_ssize_t pos, list pins
+) except -1:
+    """
+    Write a row for text copy into *out* at *pos*; return the new position.
+
+    The size of *out* may be larger than the position returned.
+    """
     cdef Py_ssize_t rowlen = len(row)
+    cdef char *newline
 
     if rowlen == 0:
-        PyByteArray_Resize(out, pos + 1)
-        out[pos] = b"\n"
-        return out
+        newline = CDumper.ensure_size(out, pos, 1)
+        newline[0] = b"\n"
+        return pos + 1
 
     cdef Py_ssize_t size, tmpsize
     cdef char *buf
@@ -125,7 +234,10 @@ def format_row_text(
                 pos += 2
             continue
 
-        row_dumper = tx.get_row_dumper(<PyObject *>item, fmt)
+        if pins is not None:
+            row_dumper = _get_column_dumper(tx, item, fmt, pins, i)
+        else:
+            row_dumper = tx.get_row_dumper(<PyObject *>item, fmt)
         if (<RowDumper>row_dumper).cdumper is not None:
             # A cdumper can resize if necessary and copy in place
             size = (<RowDumper>row_dumper).cdumper.cdump(
@@ -166,10 +278,53 @@ def format_row_text(
         else:
             pos += size
 
-    # Resize to the final size, add the newline
-    PyByteArray_Resize(out, pos + 1)
-    out[pos] = b"\n"
-    return out
+    # add the newline
+    newline = CDumper.ensure_size(out, pos, 1)
+    newline[0] = b"\n"
+    return pos + 1
+
+
+# Imported on first use: importing psycopg3.adapt here would be circular.
+cdef object _dumper_get_key = None
+
+
+cdef PyObject *_get_column_dumper(
+    Transformer tx, object item, PyObject *fmt, list pins, Py_ssize_t col
+) except NULL:
+    """
+    Return a borrowed reference to the RowDumper for an item in a column.
+
+    The dumpers whose choice doesn't depend on the value dumped (the ones not
+    implementing `get_key()`) are pinned in *pins*, so that the lookup can be
+    skipped for the items of the same type in the following rows. A dumper
+    pinned for the type `!None` is used for items of any type.
+    """
+    global _dumper_get_key
+    if _dumper_get_key is None:
+        from psycopg3.adapt import Dumper
+        _dumper_get_key = Dumper.get_key
+
+    if col < PyList_GET_SIZE(pins):
+        pin = <object>PyList_GET_ITEM(pins, col)
+        if pin is not None and (
+            (<tuple>pin)[0] is None or (<tuple>pin)[0] is type(item)
+        ):
+            return <PyObject *>(<tuple>pin)[1]
+    else:
+        while PyList_GET_SIZE(pins) <= col:
+            pins.append(None)
+
+    cdef PyObject *row_dumper = tx.get_row_dumper(<PyObject *>item, fmt)
+    cdef RowDumper rd = <RowDumper>row_dumper
+    if rd.cdumper is not None:
+        # CDumper.get_key() is cdef: only the overriding methods are visible
+        fixed = not hasattr(type(rd.cdumper), "get_key")
+    else:
+        fixed = type(rd.pydumper).get_key is _dumper_get_key
+    if fixed:
+        pins[col] = (type(item), rd)
+
+    return row_dumper
 
 
 def parse_row_binary(data, tx: Transformer) -> Tuple[Any, ...]:
@@ -4,10 +4,13 @@ C implementation of generators for the communication protocols with the libpq
 
 # Copyright (C) 2020-2021 The Psycopg Team
 
+from libc.string cimport memcpy
 from cpython.object cimport PyObject_CallFunctionObjArgs
+from cpython.bytearray cimport PyByteArray_AS_STRING, PyByteArray_GET_SIZE
+from cpython.memoryview cimport PyMemoryView_FromObject
 
 import logging
-from typing import List
+from typing import List, Tuple, Union
 
 from psycopg3 import errors as e
 from psycopg3.pq import proto, error_message, PQerror
@@ -19,6 +22,9 @@ cdef object WAIT_R = Wait.R
 cdef object WAIT_RW = Wait.RW
 cdef int READY_R = Ready.R
 
+# Imported on first use: importing psycopg3.generators here would be circular.
+cdef object _fetch_copy_result = None
+
 def connect(conninfo: str) -> PQGenConn[proto.PGconn]:
     """
     Generator to create a database connection without blocking.
@@ -36,7 +42,8 @@ def connect(conninfo: str) -> PQGenConn[proto.PGconn]:
                 f"connection is bad: {error_message(conn)}"
             )
 
-        poll_status = libpq.PQconnectPoll(pgconn_ptr)
+        with nogil:
+            poll_status = libpq.PQconnectPoll(pgconn_ptr)
         logger.debug("connection polled, status %s", conn.status)
         if poll_status == libpq.PGRES_POLLING_OK:
             break
@@ -71,11 +78,13 @@ def execute(pq.PGconn pgconn) -> PQGen[List[proto.PGresult]]:
     cdef int status
     cdef libpq.PGnotify *notify
     cdef libpq.PGresult *pgres
-    cdef int cires, ibres
+    cdef int cires, ibres, flres
 
     # Sending the query
     while 1:
-        if libpq.PQflush(pgconn_ptr) == 0:
+        with nogil:
+            flres = libpq.PQflush(pgconn_ptr)
+        if flres == 0:
             break
 
         status = yield WAIT_RW
@@ -121,7 +130,8 @@ def execute(pq.PGconn pgconn) -> PQGen[List[proto.PGresult]]:
                     break
                 libpq.PQfreemem(notify)
 
-        pgres = libpq.PQgetResult(pgconn_ptr)
+        with nogil:
+            pgres = libpq.PQgetResult(pgconn_ptr)
         if pgres is NULL:
             break
         results.append(pq.PGresult._from_ptr(pgres))
@@ -133,3 +143,56 @@ def execute(pq.PGconn pgconn) -> PQGen[List[proto.PGresult]]:
             break
 
     return results
+
+
+def copy_from_block(
+    pq.PGconn pgconn, bytearray buffer, Py_ssize_t pos = 0
+) -> PQGen[Tuple[int, Union[memoryview, proto.PGresult, None]]]:
+    """
+    Generator filling *buffer* from *pos* with the copy data received.
+
+    Equivalent to `psycopg3.generators.copy_from_block()`, but copying the
+    data in the buffer without creating a Python object for each message.
+    """
+    global _fetch_copy_result
+    if _fetch_copy_result is None:
+        from psycopg3.generators import fetch_copy_result
+        _fetch_copy_result = fetch_copy_result
+
+    cdef libpq.PGconn *pgconn_ptr = pgconn.pgconn_ptr
+    cdef Py_ssize_t size = PyByteArray_GET_SIZE(buffer)
+    cdef char *data
+    cdef int nbytes
+    cdef int cires
+
+    while pos < size:
+        with nogil:
+            nbytes = libpq.PQgetCopyData(pgconn_ptr, &data, 1)
+        if nbytes == 0:
+            # would block
+            yield WAIT_R
+            with nogil:
+                cires = libpq.PQconsumeInput(pgconn_ptr)
+            if 1 != cires:
+                raise PQerror(
+                    f"consuming input failed: {error_message(pgconn)}")
+            continue
+
+        if nbytes == -2:
+            raise PQerror(
+                f"receiving copy data failed: {error_message(pgconn)}")
+
+        if nbytes == -1:
+            result = yield from _fetch_copy_result(pgconn)
+            return pos, result
+
+        if nbytes > size - pos:
+            # Wrap the data in a buffer which will free it when collected
+            return pos, PyMemoryView_FromObject(
+                pq.PQBuffer._from_buffer(<unsigned char *>data, nbytes))
+
+        memcpy(PyByteArray_AS_STRING(buffer) + pos, data, nbytes)
+        libpq.PQfreemem(data)
+        pos += nbytes
+
+    return pos, None
@@ -0,0 +1,133 @@
+"""
+C optimised functions to manipulate queries.
+
+"""
+
+# Copyright (C) 2020-2021 The Psycopg Team
+
+from libc.string cimport memchr
+from cpython.bytes cimport PyBytes_AsStringAndSize
+
+from psycopg3 import errors as e
+
+# Imported on first use: importing psycopg3._queries here would be circular.
+cdef object _QueryPart = None
+
+
+def split_query(query: bytes, encoding: str = "ascii") -> list:
+    """
+    Split a query in parts separated by the placeholders.
+
+    Equivalent to `psycopg3._queries._split_query()`, but scanning the query
+    without using regular expressions.
+    """
+    global _QueryPart
+    if _QueryPart is None:
+        from psycopg3._queries import QueryPart
+        _QueryPart = QueryPart
+
+    cdef char *buf
+    cdef Py_ssize_t size
+    PyBytes_AsStringAndSize(query, &buf, &size)
+
+    cdef list rv = []
+    cdef list chunks = []  # pieces of the current part, split by '%%'
+    cdef Py_ssize_t start = 0  # start of the current chunk
+    cdef Py_ssize_t pos = 0  # start of the current placeholder
+    cdef Py_ssize_t end  # end of the current placeholder
+    cdef char *ptr
+    cdef char *close
+    cdef char c
+    cdef int nph = 0
+    cdef int phtype = 0  # 1: positional, 2: named
+
+    while 1:
+        ptr = <char *>memchr(buf + pos, b'%', size - pos)
+        if ptr == NULL:
+            break
+
+        pos = ptr - buf
+        if pos + 1 >= size:
+            # A lone '%' at the end of the query is left alone
+            break
+
+        c = buf[pos + 1]
+        if c == b'\n':
+            # Not a placeholder (the Python regexp doesn't match newlines)
+            pos += 1
+            continue
+
+        name = None
+        if c == b'%':
+            # unescape '%%' to '%' and merge the parts
+            chunks.append(query[start:pos + 1])
+            pos = start = pos + 2
+            continue
+
+        elif c == b'(':
+            # Look for a name in braces, followed by a format
+            close = <char *>memchr(buf + pos + 2, b')', size - pos - 2)
+            if (
+                close == NULL
+                or close == buf + pos + 2
+                or close + 1 >= buf + size
+                or close[1] == b'\n'
+            ):
+                raise e.ProgrammingError(
+                    f"incomplete placeholder:"
+                    f" '{query[pos:].split()[0].decode(encoding)}'"
+                )
+            name = query[pos + 2:close - buf]
+            end = close - buf + 2
+            c = close[1]
+
+        elif c == b' ':
+            # explicit message for a typical error
+            raise e.ProgrammingError(
+                "incomplete placeholder: '%'; if you want to use '%' as an"
+                " operator you can double it up, i.e. use '%%'"
+            )
+
+        else:
+            end = pos + 2
+
+        if c == b's':
+            fmt = PG_AUTO
+        elif c == b'b':
+            fmt = PG_BINARY
+        elif c == b't':
+            fmt = PG_TEXT
+        else:
+            raise e.ProgrammingError(
+                f"only '%s', '%b', '%t' placeholders allowed, got"
+                f" {query[pos:end].decode(encoding)}"
+            )
+
+        # Index or name
+        if name is None:
+            item = nph
+            if phtype == 0:
+                phtype = 1
+            elif phtype != 1:
+                raise e.ProgrammingError(
+                    "positional and named placeholders cannot be mixed"
+                )
+        else:
+            item = name.decode(encoding)
+            if phtype == 0:
+                phtype = 2
+            elif phtype != 2:
+                raise e.ProgrammingError(
+                    "positional and named placeholders cannot be mixed"
+                )
+
+        chunks.append(query[start:pos])
+        rv.append(_QueryPart(b"".join(chunks), item, fmt))
+        chunks = []
+        nph += 1
+        pos = start = end
+
+    # last part
+    chunks.append(query[start:])
+    rv.append(_QueryPart(b"".join(chunks), 0, PG_AUTO))
+    return rv
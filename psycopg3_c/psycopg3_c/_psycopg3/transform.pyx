@@ -19,6 +19,7 @@ from cpython.bytes cimport PyBytes_AS_STRING
 from cpython.tuple cimport PyTuple_New, PyTuple_SET_ITEM
 from cpython.object cimport PyObject, PyObject_CallFunctionObjArgs
 
+from time import monotonic
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from psycopg3 import errors as e
@@ -68,6 +69,7 @@ cdef class Transformer:
 
     cdef readonly object connection
     cdef readonly object adapters
+    cdef public object profile
 
     # mapping class -> Dumper instance (auto, text, binary)
     cdef dict _auto_dumpers
@@ -82,6 +84,7 @@ cdef class Transformer:
     cdef int _nfields, _ntuples
     cdef list _row_dumpers
     cdef list _row_loaders
+    cdef str _encoding
 
     def __cinit__(self, context: Optional["AdaptContext"] = None):
         if context is not None:
@@ -92,6 +95,16 @@ cdef class Transformer:
             self.adapters = global_adapters
             self.connection = None
 
+        if self.connection is not None:
+            self.profile = self.connection.adapters_profile
+
+    @property
+    def encoding(self) -> str:
+        if not self._encoding:
+            conn = self.connection
+            self._encoding = conn.client_encoding if conn is not None else "utf-8"
+        return self._encoding
+
     @property
     def pgresult(self) -> Optional[PGresult]:
         return self._pgresult
@@ -100,7 +113,7 @@ cdef class Transformer:
     def pgresult(self, result: Optional[PGresult]) -> None:
         self.set_pgresult(result)
 
-    cdef void set_pgresult(self, pq.PGresult result):
+    cpdef set_pgresult(self, pq.PGresult result, bint set_loaders = True):
         self._pgresult = result
 
         if result is None:
@@ -111,6 +124,9 @@ cdef class Transformer:
         self._nfields = libpq.PQnfields(res)
         self._ntuples = libpq.PQntuples(res)
 
+        if not set_loaders:
+            return
+
         cdef int i
         cdef object tmp
         cdef list types = PyList_New(self._nfields)
@@ -248,7 +264,9 @@ cdef class Transformer:
 
                 oid = (<RowDumper>dumper_ptr).oid
                 dfmt = (<RowDumper>dumper_ptr).format
-                if (<RowDumper>dumper_ptr).cdumper is not None:
+                if self.profile is not None:
+                    dumped = self._dump_profiled(<RowDumper>dumper_ptr, param)
+                elif (<RowDumper>dumper_ptr).cdumper is not None:
                     dumped = PyByteArray_FromStringAndSize("", 0)
                     size = (<RowDumper>dumper_ptr).cdumper.cdump(
                         param, <bytearray>dumped, 0)
@@ -280,6 +298,9 @@ cdef class Transformer:
                 f"rows must be included between 0 and {self._ntuples}"
             )
 
+        if self.profile is not None:
+            return self._load_rows_profiled(row0, row1)
+
         cdef libpq.PGresult *res = self._pgresult.pgresult_ptr
         # cheeky access to the internal PGresult structure
         cdef pg_result_int *ires = <pg_result_int*>res
@@ -340,6 +361,9 @@ cdef class Transformer:
         if not 0 <= row < self._ntuples:
             return None
 
+        if self.profile is not None:
+            return self._load_rows_profiled(row, row + 1)[0]
+
         cdef libpq.PGresult *res = self._pgresult.pgresult_ptr
         # cheeky access to the internal PGresult structure
         cdef pg_result_int *ires = <pg_result_int*>res
@@ -388,6 +412,9 @@ cdef class Transformer:
                 f"cannot load sequence of {nfields} items:"
                 f" {len(self._row_loaders)} loaders registered")
 
+        if self.profile is not None:
+            return self._load_sequence_profiled(record)
+
         for col in range(nfields):
             item = record[col]
             if item is None:
@@ -408,6 +435,74 @@ cdef class Transformer:
 
         return out
 
+    cdef object _dump_profiled(self, RowDumper row_dumper, object param):
+        t0 = monotonic()
+        dumped = row_dumper.dumpfunc(param)
+        t1 = monotonic()
+        self.profile.add_dump(row_dumper.pydumper, len(dumped), t1 - t0)
+        return dumped
+
+    cdef list _load_rows_profiled(self, int row0, int row1):
+        """
+        Implement `load_rows()` timing the loaders.
+
+        The result is loaded by column, so that the time spent in each loader
+        can be measured without timing every value.
+        """
+        cdef libpq.PGresult *res = self._pgresult.pgresult_ptr
+        cdef pg_result_int *ires = <pg_result_int*>res
+
+        cdef int row
+        cdef int col
+        cdef Py_ssize_t calls, nbytes
+        cdef PGresAttValue *attval
+        cdef RowLoader loader
+
+        cdef list records = [
+            [None] * self._nfields for row in range(row0, row1)]
+
+        for col in range(self._nfields):
+            loader = self._row_loaders[col]
+            calls = nbytes = 0
+            t0 = monotonic()
+            for row in range(row0, row1):
+                attval = &(ires.tuples[row][col])
+                if attval.len == -1:  # NULL_LEN
+                    continue
+                if loader.cloader is not None:
+                    pyval = loader.cloader.cload(attval.value, attval.len)
+                else:
+                    b = PyMemoryView_FromObject(
+                        ViewBuffer._from_buffer(
+                            self._pgresult,
+                            <unsigned char *>attval.value, attval.len))
+                    pyval = loader.loadfunc(b)
+                records[row - row0][col] = pyval
+                calls += 1
+                nbytes += attval.len
+            t1 = monotonic()
+            if calls:
+                self.profile.add_load(loader.pyloader, calls, nbytes, t1 - t0)
+
+        return [tuple(record) for record in records]
+
+    cdef tuple _load_sequence_profiled(self, record):
+        cdef list out = [None] * len(record)
+        cdef RowLoader loader
+        cdef int col
+
+        for col in range(len(record)):
+            item = record[col]
+            if item is None:
+                continue
+            loader = self._row_loaders[col]
+            t0 = monotonic()
+            out[col] = loader.loadfunc(item)
+            t1 = monotonic()
+            self.profile.add_load(loader.pyloader, 1, len(item), t1 - t0)
+
+        return tuple(out)
+
     def get_loader(self, oid: int, format: pq.Format) -> "Loader":
         cdef PyObject *row_loader = self._c_get_loader(
             <PyObject *>oid, <PyObject *>format)
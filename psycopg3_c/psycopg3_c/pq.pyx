@@ -16,6 +16,10 @@ def version():
     return libpq.PQlibVersion()
 
 
+def has_pipeline():
+    return bool(libpq.PG3_HAS_PIPELINE)
+
+
 include "pq/pgconn.pyx"
 include "pq/pgresult.pyx"
 include "pq/pgcancel.pyx"
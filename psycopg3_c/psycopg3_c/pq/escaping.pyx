@@ -7,6 +7,7 @@ psycopg3_c.pq.Escaping object implementation.
 from libc.string cimport strlen
 from cpython.bytearray cimport PyByteArray_FromStringAndSize, PyByteArray_Resize
 from cpython.bytearray cimport PyByteArray_AS_STRING
+from cpython.buffer cimport PyBuffer_Release
 from cpython.memoryview cimport PyMemoryView_FromObject
 
 
@@ -16,18 +17,20 @@ cdef class Escaping:
 
     def escape_literal(self, data: "Buffer") -> memoryview:
         cdef char *out
-        cdef bytes rv
-        cdef char *ptr
-        cdef Py_ssize_t length
+        cdef Py_buffer buf
 
         if self.conn is None:
             raise PQerror("escape_literal failed: no connection provided")
         if self.conn.pgconn_ptr is NULL:
             raise PQerror("the connection is closed")
 
-        _buffer_as_string_and_size(data, &ptr, &length)
-
-        out = libpq.PQescapeLiteral(self.conn.pgconn_ptr, ptr, length)
+        _buffer_acquire(data, &buf)
+        try:
+            with nogil:
+                out = libpq.PQescapeLiteral(
+                    self.conn.pgconn_ptr, <const char *>buf.buf, buf.len)
+        finally:
+            PyBuffer_Release(&buf)
         if out is NULL:
             raise PQerror(
                 f"escape_literal failed: {error_message(self.conn)}"
@@ -39,17 +42,20 @@ cdef class Escaping:
 
     def escape_identifier(self, data: "Buffer") -> memoryview:
         cdef char *out
-        cdef char *ptr
-        cdef Py_ssize_t length
-
-        _buffer_as_string_and_size(data, &ptr, &length)
+        cdef Py_buffer buf
 
         if self.conn is None:
             raise PQerror("escape_identifier failed: no connection provided")
         if self.conn.pgconn_ptr is NULL:
             raise PQerror("the connection is closed")
 
-        out = libpq.PQescapeIdentifier(self.conn.pgconn_ptr, ptr, length)
+        _buffer_acquire(data, &buf)
+        try:
+            with nogil:
+                out = libpq.PQescapeIdentifier(
+                    self.conn.pgconn_ptr, <const char *>buf.buf, buf.len)
+        finally:
+            PyBuffer_Release(&buf)
         if out is NULL:
             raise PQerror(
                 f"escape_identifier failed: {error_message(self.conn)}"
@@ -62,30 +68,34 @@ cdef class Escaping:
     def escape_string(self, data: "Buffer") -> memoryview:
         cdef int error
         cdef size_t len_out
-        cdef char *ptr
-        cdef Py_ssize_t length
+        cdef Py_buffer buf
         cdef bytearray rv
+        cdef char *out
 
-        _buffer_as_string_and_size(data, &ptr, &length)
-
-        rv = PyByteArray_FromStringAndSize("", 0)
-        PyByteArray_Resize(rv, length * 2 + 1)
-
-        if self.conn is not None:
-            if self.conn.pgconn_ptr is NULL:
-                raise PQerror("the connection is closed")
-
-            len_out = libpq.PQescapeStringConn(
-                self.conn.pgconn_ptr, PyByteArray_AS_STRING(rv),
-                ptr, length, &error
-            )
-            if error:
-                raise PQerror(
-                    f"escape_string failed: {error_message(self.conn)}"
-                )
+        if self.conn is not None and self.conn.pgconn_ptr is NULL:
+            raise PQerror("the connection is closed")
 
-        else:
-            len_out = libpq.PQescapeString(PyByteArray_AS_STRING(rv), ptr, length)
+        _buffer_acquire(data, &buf)
+        try:
+            rv = PyByteArray_FromStringAndSize("", 0)
+            PyByteArray_Resize(rv, buf.len * 2 + 1)
+            out = PyByteArray_AS_STRING(rv)
+
+            if self.conn is not None:
+                with nogil:
+                    len_out = libpq.PQescapeStringConn(
+                        self.conn.pgconn_ptr, out, <const char *>buf.buf,
+                        buf.len, &error
+                    )
+            else:
+                with nogil:
+                    len_out = libpq.PQescapeString(
+                        out, <const char *>buf.buf, buf.len)
+        finally:
+            PyBuffer_Release(&buf)
+
+        if self.conn is not None and error:
+            raise PQerror(f"escape_string failed: {error_message(self.conn)}")
 
         # shrink back or the length will be reported different
         PyByteArray_Resize(rv, len_out)
@@ -94,19 +104,27 @@ cdef class Escaping:
     def escape_bytea(self, data: "Buffer") -> memoryview:
         cdef size_t len_out
         cdef unsigned char *out
-        cdef char *ptr
-        cdef Py_ssize_t length
+        cdef Py_buffer buf
 
         if self.conn is not None and self.conn.pgconn_ptr is NULL:
             raise PQerror("the connection is closed")
 
-        _buffer_as_string_and_size(data, &ptr, &length)
-
+        cdef libpq.PGconn *pgconn_ptr = NULL
         if self.conn is not None:
-            out = libpq.PQescapeByteaConn(
-                self.conn.pgconn_ptr, <unsigned char *>ptr, length, &len_out)
-        else:
-            out = libpq.PQescapeBytea(<unsigned char *>ptr, length, &len_out)
+            pgconn_ptr = self.conn.pgconn_ptr
+
+        _buffer_acquire(data, &buf)
+        try:
+            with nogil:
+                if pgconn_ptr is not NULL:
+                    out = libpq.PQescapeByteaConn(
+                        pgconn_ptr, <unsigned char *>buf.buf, buf.len,
+                        &len_out)
+                else:
+                    out = libpq.PQescapeBytea(
+                        <unsigned char *>buf.buf, buf.len, &len_out)
+        finally:
+            PyBuffer_Release(&buf)
 
         if out is NULL:
             raise MemoryError(
@@ -124,8 +142,12 @@ cdef class Escaping:
             if self.conn.pgconn_ptr is NULL:
                 raise PQerror("the connection is closed")
 
+        # Only bytes are accepted: being immutable, they are safe to use
+        # without the GIL.
         cdef size_t len_out
-        cdef unsigned char *out = libpq.PQunescapeBytea(data, &len_out)
+        cdef unsigned char *out
+        with nogil:
+            out = libpq.PQunescapeBytea(data, &len_out)
         if out is NULL:
             raise MemoryError(
                 f"couldn't allocate for unescape_bytea of {len(data)} bytes"
@@ -93,17 +93,17 @@ cdef extern from "libpq-fe.h":
         PGRES_SINGLE_TUPLE
 
     # 33.1. Database Connection Control Functions
-    PGconn *PQconnectdb(const char *conninfo)
-    PGconn *PQconnectStart(const char *conninfo)
-    PostgresPollingStatusType PQconnectPoll(PGconn *conn)
+    PGconn *PQconnectdb(const char *conninfo) nogil
+    PGconn *PQconnectStart(const char *conninfo) nogil
+    PostgresPollingStatusType PQconnectPoll(PGconn *conn) nogil
     PQconninfoOption *PQconndefaults()
     PQconninfoOption *PQconninfo(PGconn *conn)
     PQconninfoOption *PQconninfoParse(const char *conninfo, char **errmsg)
-    void PQfinish(PGconn *conn)
-    void PQreset(PGconn *conn)
+    void PQfinish(PGconn *conn) nogil
+    void PQreset(PGconn *conn) nogil
     int PQresetStart(PGconn *conn)
-    PostgresPollingStatusType PQresetPoll(PGconn *conn)
-    PGPing PQping(const char *conninfo)
+    PostgresPollingStatusType PQresetPoll(PGconn *conn) nogil
+    PGPing PQping(const char *conninfo) nogil
 
     # 33.2. Connection Status Functions
     char *PQdb(const PGconn *conn)
@@ -149,14 +149,14 @@ cdef extern from "libpq-fe.h":
                              const int *paramLengths,
                              const int *paramFormats,
                              int resultFormat) nogil
-    PGresult *PQdescribePrepared(PGconn *conn, const char *stmtName)
-    PGresult *PQdescribePortal(PGconn *conn, const char *portalName)
+    PGresult *PQdescribePrepared(PGconn *conn, const char *stmtName) nogil
+    PGresult *PQdescribePortal(PGconn *conn, const char *portalName) nogil
     ExecStatusType PQresultStatus(const PGresult *res)
     # PQresStatus: not needed, we have pretty enums
     char *PQresultErrorMessage(const PGresult *res)
     # TODO: PQresultVerboseErrorMessage
     char *PQresultErrorField(const PGresult *res, int fieldcode)
-    void PQclear(PGresult *res)
+    void PQclear(PGresult *res) nogil
 
     # 33.3.2. Retrieving Query Result Information
     int PQntuples(const PGresult *res)
@@ -183,20 +183,20 @@ cdef extern from "libpq-fe.h":
     Oid PQoidValue(const PGresult *res)
 
     # 33.3.4. Escaping Strings for Inclusion in SQL Commands
-    char *PQescapeIdentifier(PGconn *conn, const char *str, size_t length)
-    char *PQescapeLiteral(PGconn *conn, const char *str, size_t length)
+    char *PQescapeIdentifier(PGconn *conn, const char *str, size_t length) nogil
+    char *PQescapeLiteral(PGconn *conn, const char *str, size_t length) nogil
     size_t PQescapeStringConn(PGconn *conn,
                               char *to, const char *from_, size_t length,
-                              int *error)
-    size_t PQescapeString(char *to, const char *from_, size_t length)
+                              int *error) nogil
+    size_t PQescapeString(char *to, const char *from_, size_t length) nogil
     unsigned char *PQescapeByteaConn(PGconn *conn,
                                      const unsigned char *src,
                                      size_t from_length,
-                                     size_t *to_length)
+                                     size_t *to_length) nogil
     unsigned char *PQescapeBytea(const unsigned char *src,
                                  size_t from_length,
-                                 size_t *to_length)
-    unsigned char *PQunescapeBytea(const unsigned char *src, size_t *to_length)
+                                 size_t *to_length) nogil
+    unsigned char *PQunescapeBytea(const unsigned char *src, size_t *to_length) nogil
 
 
     # 33.4. Asynchronous Command Processing
@@ -223,12 +223,12 @@ cdef extern from "libpq-fe.h":
                             int resultFormat) nogil
     int PQsendDescribePrepared(PGconn *conn, const char *stmtName)
     int PQsendDescribePortal(PGconn *conn, const char *portalName)
-    PGresult *PQgetResult(PGconn *conn)
+    PGresult *PQgetResult(PGconn *conn) nogil
     int PQconsumeInput(PGconn *conn) nogil
     int PQisBusy(PGconn *conn) nogil
     int PQsetnonblocking(PGconn *conn, int arg)
     int PQisnonblocking(const PGconn *conn)
-    int PQflush(PGconn *conn)
+    int PQflush(PGconn *conn) nogil
 
     # 33.5. Retrieving Query Results Row-by-Row
     int PQsetSingleRowMode(PGconn *conn)
@@ -236,15 +236,15 @@ cdef extern from "libpq-fe.h":
     # 33.6. Canceling Queries in Progress
     PGcancel *PQgetCancel(PGconn *conn)
     void PQfreeCancel(PGcancel *cancel)
-    int PQcancel(PGcancel *cancel, char *errbuf, int errbufsize)
+    int PQcancel(PGcancel *cancel, char *errbuf, int errbufsize) nogil
 
     # 33.8. Asynchronous Notification
     PGnotify *PQnotifies(PGconn *conn) nogil
 
     # 33.9. Functions Associated with the COPY Command
-    int PQputCopyData(PGconn *conn, const char *buffer, int nbytes)
-    int PQputCopyEnd(PGconn *conn, const char *errormsg)
-    int PQgetCopyData(PGconn *conn, char **buffer, int async)
+    int PQputCopyData(PGconn *conn, const char *buffer, int nbytes) nogil
+    int PQputCopyEnd(PGconn *conn, const char *errormsg) nogil
+    int PQgetCopyData(PGconn *conn, char **buffer, int async) nogil
 
     # 33.11. Miscellaneous Functions
     void PQfreemem(void *ptr) nogil
@@ -257,3 +257,38 @@ cdef extern from "libpq-fe.h":
     ctypedef void (*PQnoticeReceiver)(void *arg, const PGresult *res)
     PQnoticeReceiver PQsetNoticeReceiver(
         PGconn *conn, PQnoticeReceiver prog, void *arg)
+
+
+# 33.5.bis Pipeline Mode (libpq >= 14)
+cdef extern from *:
+    """
+#ifdef LIBPQ_HAS_PIPELINING
+#define PG3_HAS_PIPELINE 1
+#else
+#define PG3_HAS_PIPELINE 0
+#define PQpipelineStatus(conn) 0
+#define PQenterPipelineMode(conn) 0
+#define PQexitPipelineMode(conn) 0
+#define PQpipelineSync(conn) 0
+#endif
+    """
+    const int PG3_HAS_PIPELINE
+    int PQpipelineStatus(const PGconn *conn)
+    int PQenterPipelineMode(PGconn *conn)
+    int PQexitPipelineMode(PGconn *conn)
+    int PQpipelineSync(PGconn *conn)
+
+
+# 33.11.bis Result memory size (libpq >= 12)
+cdef extern from *:
+    """
+#include <pg_config.h>
+#if PG_VERSION_NUM >= 120000
+#define PG3_HAS_RESULT_MEMORY_SIZE 1
+#else
+#define PG3_HAS_RESULT_MEMORY_SIZE 0
+#define PQresultMemorySize(res) 0
+#endif
+    """
+    const int PG3_HAS_RESULT_MEMORY_SIZE
+    size_t PQresultMemorySize(const PGresult *res)
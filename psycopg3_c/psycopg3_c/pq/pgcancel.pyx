@@ -25,7 +25,9 @@ cdef class PGcancel:
 
     def cancel(self) -> None:
         cdef char buf[256]
-        cdef int res = libpq.PQcancel(self.pgcancel_ptr, buf, sizeof(buf))
+        cdef int res
+        with nogil:
+            res = libpq.PQcancel(self.pgcancel_ptr, buf, sizeof(buf))
         if not res:
             raise PQerror(
                 f"cancel failed: {buf.decode('utf8', 'ignore')}"
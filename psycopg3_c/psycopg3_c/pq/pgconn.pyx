@@ -7,6 +7,7 @@ psycopg3_c.pq.PGconn object implementation.
 from posix.unistd cimport getpid
 from cpython.mem cimport PyMem_Malloc, PyMem_Free
 from cpython.bytes cimport PyBytes_AsString, PyBytes_AsStringAndSize
+from cpython.buffer cimport PyBuffer_Release
 from cpython.memoryview cimport PyMemoryView_FromObject
 
 import logging
@@ -44,7 +45,9 @@ cdef class PGconn:
 
     @classmethod
     def connect(cls, const char *conninfo) -> PGconn:
-        cdef libpq.PGconn* pgconn = libpq.PQconnectdb(conninfo)
+        cdef libpq.PGconn* pgconn
+        with nogil:
+            pgconn = libpq.PQconnectdb(conninfo)
         if not pgconn:
             raise MemoryError("couldn't allocate PGconn")
 
@@ -52,19 +55,28 @@ cdef class PGconn:
 
     @classmethod
     def connect_start(cls, const char *conninfo) -> PGconn:
-        cdef libpq.PGconn* pgconn = libpq.PQconnectStart(conninfo)
+        cdef libpq.PGconn* pgconn
+        with nogil:
+            pgconn = libpq.PQconnectStart(conninfo)
         if not pgconn:
             raise MemoryError("couldn't allocate PGconn")
 
         return PGconn._from_ptr(pgconn)
 
     def connect_poll(self) -> int:
-        return _call_int(self, <conn_int_f>libpq.PQconnectPoll)
+        _ensure_pgconn(self)
+        cdef int rv
+        with nogil:
+            rv = libpq.PQconnectPoll(self.pgconn_ptr)
+        return rv
 
     def finish(self) -> None:
-        if self.pgconn_ptr is not NULL:
-            libpq.PQfinish(self.pgconn_ptr)
+        cdef libpq.PGconn *pgconn_ptr = self.pgconn_ptr
+        if pgconn_ptr is not NULL:
+            # Detach the pointer first: other threads may run meanwhile.
             self.pgconn_ptr = NULL
+            with nogil:
+                libpq.PQfinish(pgconn_ptr)
 
     @property
     def pgconn_ptr(self) -> Optional[int]:
@@ -85,18 +97,26 @@ cdef class PGconn:
 
     def reset(self) -> None:
         _ensure_pgconn(self)
-        libpq.PQreset(self.pgconn_ptr)
+        with nogil:
+            libpq.PQreset(self.pgconn_ptr)
 
     def reset_start(self) -> None:
         if not libpq.PQresetStart(self.pgconn_ptr):
             raise PQerror("couldn't reset connection")
 
     def reset_poll(self) -> int:
-        return _call_int(self, <conn_int_f>libpq.PQresetPoll)
+        _ensure_pgconn(self)
+        cdef int rv
+        with nogil:
+            rv = libpq.PQresetPoll(self.pgconn_ptr)
+        return rv
 
     @classmethod
     def ping(self, const char *conninfo) -> int:
-        return libpq.PQping(conninfo)
+        cdef int rv
+        with nogil:
+            rv = libpq.PQping(conninfo)
+        return rv
 
     @property
     def db(self) -> bytes:
@@ -364,26 +384,35 @@ cdef class PGconn:
 
     def describe_prepared(self, const char *name) -> PGresult:
         _ensure_pgconn(self)
-        cdef libpq.PGresult *rv = libpq.PQdescribePrepared(self.pgconn_ptr, name)
+        cdef libpq.PGresult *rv
+        with nogil:
+            rv = libpq.PQdescribePrepared(self.pgconn_ptr, name)
         if rv is NULL:
             raise MemoryError("couldn't allocate PGresult")
         return PGresult._from_ptr(rv)
 
     def describe_portal(self, const char *name) -> PGresult:
         _ensure_pgconn(self)
-        cdef libpq.PGresult *rv = libpq.PQdescribePortal(self.pgconn_ptr, name)
+        cdef libpq.PGresult *rv
+        with nogil:
+            rv = libpq.PQdescribePortal(self.pgconn_ptr, name)
         if rv is NULL:
             raise MemoryError("couldn't allocate PGresult")
         return PGresult._from_ptr(rv)
 
     def get_result(self) -> Optional["PGresult"]:
-        cdef libpq.PGresult *pgresult = libpq.PQgetResult(self.pgconn_ptr)
+        cdef libpq.PGresult *pgresult
+        with nogil:
+            pgresult = libpq.PQgetResult(self.pgconn_ptr)
         if pgresult is NULL:
             return None
         return PGresult._from_ptr(pgresult)
 
     def consume_input(self) -> None:
-        if 1 != libpq.PQconsumeInput(self.pgconn_ptr):
+        cdef int rv
+        with nogil:
+            rv = libpq.PQconsumeInput(self.pgconn_ptr)
+        if 1 != rv:
             raise PQerror(f"consuming input failed: {error_message(self)}")
 
     def is_busy(self) -> int:
@@ -404,7 +433,9 @@ cdef class PGconn:
     def flush(self) -> int:
         if self.pgconn_ptr == NULL:
             raise PQerror(f"flushing failed: the connection is closed")
-        cdef int rv = libpq.PQflush(self.pgconn_ptr)
+        cdef int rv
+        with nogil:
+            rv = libpq.PQflush(self.pgconn_ptr)
         if rv < 0:
             raise PQerror(f"flushing failed: {error_message(self)}")
         return rv
@@ -413,6 +444,25 @@ cdef class PGconn:
         if not libpq.PQsetSingleRowMode(self.pgconn_ptr):
             raise PQerror("setting single row mode failed")
 
+    @property
+    def pipeline_status(self) -> int:
+        return libpq.PQpipelineStatus(self.pgconn_ptr)
+
+    def enter_pipeline_mode(self) -> None:
+        _check_pipeline_supported()
+        if not libpq.PQenterPipelineMode(self.pgconn_ptr):
+            raise PQerror("cannot enter pipeline mode")
+
+    def exit_pipeline_mode(self) -> None:
+        _check_pipeline_supported()
+        if not libpq.PQexitPipelineMode(self.pgconn_ptr):
+            raise PQerror(f"cannot exit pipeline mode: {error_message(self)}")
+
+    def pipeline_sync(self) -> None:
+        _check_pipeline_supported()
+        if not libpq.PQpipelineSync(self.pgconn_ptr):
+            raise PQerror(f"pipeline sync failed: {error_message(self)}")
+
     def get_cancel(self) -> PGcancel:
         cdef libpq.PGcancel *ptr = libpq.PQgetCancel(self.pgconn_ptr)
         if not ptr:
@@ -432,11 +482,15 @@ cdef class PGconn:
 
     def put_copy_data(self, buffer) -> int:
         cdef int rv
-        cdef char *cbuffer
-        cdef Py_ssize_t length
-
-        _buffer_as_string_and_size(buffer, &cbuffer, &length)
-        rv = libpq.PQputCopyData(self.pgconn_ptr, cbuffer, length)
+        cdef Py_buffer buf
+
+        _buffer_acquire(buffer, &buf)
+        try:
+            with nogil:
+                rv = libpq.PQputCopyData(
+                    self.pgconn_ptr, <const char *>buf.buf, buf.len)
+        finally:
+            PyBuffer_Release(&buf)
         if rv < 0:
             raise PQerror(f"sending copy data failed: {error_message(self)}")
         return rv
@@ -446,7 +500,8 @@ cdef class PGconn:
         cdef const char *cerr = NULL
         if error is not None:
             cerr = PyBytes_AsString(error)
-        rv = libpq.PQputCopyEnd(self.pgconn_ptr, cerr)
+        with nogil:
+            rv = libpq.PQputCopyEnd(self.pgconn_ptr, cerr)
         if rv < 0:
             raise PQerror(f"sending copy end failed: {error_message(self)}")
         return rv
@@ -454,7 +509,8 @@ cdef class PGconn:
     def get_copy_data(self, int async_) -> Tuple[int, memoryview]:
         cdef char *buffer_ptr = NULL
         cdef int nbytes
-        nbytes = libpq.PQgetCopyData(self.pgconn_ptr, &buffer_ptr, async_)
+        with nogil:
+            nbytes = libpq.PQgetCopyData(self.pgconn_ptr, &buffer_ptr, async_)
         if nbytes == -2:
             raise PQerror(f"receiving copy data failed: {error_message(self)}")
         if buffer_ptr is not NULL:
@@ -479,6 +535,17 @@ cdef int _ensure_pgconn(PGconn pgconn) except 0:
     raise PQerror("the connection is closed")
 
 
+cdef int _check_pipeline_supported() except 0:
+    if libpq.PG3_HAS_PIPELINE:
+        return 1
+
+    from psycopg3.errors import NotSupportedError
+    raise NotSupportedError(
+        f"pipeline mode requires libpq from PostgreSQL 14,"
+        f" {libpq.PQlibVersion()} available instead"
+    )
+
+
 cdef char *_call_bytes(PGconn pgconn, conn_bytes_f func) except NULL:
     """
     Call one of the pgconn libpq functions returning a bytes pointer.
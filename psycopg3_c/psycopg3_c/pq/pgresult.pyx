@@ -31,9 +31,11 @@ cdef class PGresult:
         return f"<{cls} [{status.name}] at 0x{id(self):x}>"
 
     def clear(self) -> None:
-        if self.pgresult_ptr is not NULL:
-            libpq.PQclear(self.pgresult_ptr)
+        cdef libpq.PGresult *pgresult_ptr = self.pgresult_ptr
+        if pgresult_ptr is not NULL:
             self.pgresult_ptr = NULL
+            with nogil:
+                libpq.PQclear(pgresult_ptr)
 
     @property
     def pgresult_ptr(self) -> Optional[int]:
@@ -109,6 +111,9 @@ cdef class PGresult:
             else:
                 return b""
 
+    def get_length(self, int row_number, int column_number) -> int:
+        return libpq.PQgetlength(self.pgresult_ptr, row_number, column_number)
+
     @property
     def nparams(self) -> int:
         return libpq.PQnparams(self.pgresult_ptr)
@@ -136,6 +141,18 @@ cdef class PGresult:
     def oid_value(self) -> int:
         return libpq.PQoidValue(self.pgresult_ptr)
 
+    @property
+    def memory_size(self) -> int:
+        if not libpq.PG3_HAS_RESULT_MEMORY_SIZE:
+            from psycopg3.errors import NotSupportedError
+            raise NotSupportedError(
+                f"PQresultMemorySize requires libpq from PostgreSQL 12,"
+                f" {libpq.PQlibVersion()} available instead"
+            )
+        if self.pgresult_ptr is NULL:
+            return 0
+        return libpq.PQresultMemorySize(self.pgresult_ptr)
+
     def set_attributes(self, descriptions: List[PGresAttDesc]):
         cdef int num = len(descriptions)
         cdef libpq.PGresAttDesc *attrs = <libpq.PGresAttDesc *>PyMem_Malloc(
@@ -109,3 +109,17 @@ cdef int _buffer_as_string_and_size(
         PyBuffer_Release(&buf)
     else:
         raise TypeError(f"bytes or buffer expected, got {type(data)}")
+
+
+cdef int _buffer_acquire(data: "Buffer", Py_buffer *buf) except -1:
+    """
+    Acquire a view on the memory of *data*, to release by PyBuffer_Release().
+
+    Unlike with `_buffer_as_string_and_size()` the memory pointed stays valid
+    until the buffer is released (e.g. a bytearray cannot be resized), even
+    if other threads run meanwhile: use it if the GIL is released.
+    """
+    if not PyObject_CheckBuffer(data):
+        raise TypeError(f"bytes or buffer expected, got {type(data)}")
+    PyObject_GetBuffer(data, buf, PyBUF_SIMPLE)
+    return 0
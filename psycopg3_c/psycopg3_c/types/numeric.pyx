@@ -17,6 +17,7 @@ from cpython.float cimport PyFloat_FromDouble, PyFloat_AsDouble
 
 from psycopg3_c._psycopg3 cimport endian
 
+from psycopg3 import errors as e
 from psycopg3.wrappers.numeric import Int2, Int4, Int8, IntNumeric
 
 cdef extern from "Python.h":
@@ -117,7 +118,8 @@ cdef class Int2BinaryDumper(CDumper):
 
     cdef Py_ssize_t cdump(self, obj, bytearray rv, Py_ssize_t offset) except -1:
         cdef char *buf = CDumper.ensure_size(rv, offset, sizeof(int16_t))
-        cdef int16_t val = PyLong_AsLongLong(obj)
+        cdef int16_t val = _as_int_in_range(
+            obj, INT16_MIN, INT16_MAX, "int2")
         # swap bytes if needed
         cdef uint16_t *ptvar = <uint16_t *>(&val)
         cdef int16_t beval = endian.htobe16(ptvar[0])
@@ -135,7 +137,8 @@ cdef class Int4BinaryDumper(CDumper):
 
     cdef Py_ssize_t cdump(self, obj, bytearray rv, Py_ssize_t offset) except -1:
         cdef char *buf = CDumper.ensure_size(rv, offset, sizeof(int32_t))
-        cdef int32_t val = PyLong_AsLongLong(obj)
+        cdef int32_t val = _as_int_in_range(
+            obj, INT32_MIN, INT32_MAX, "int4")
         # swap bytes if needed
         cdef uint32_t *ptvar = <uint32_t *>(&val)
         cdef int32_t beval = endian.htobe32(ptvar[0])
@@ -153,7 +156,8 @@ cdef class Int8BinaryDumper(CDumper):
 
     cdef Py_ssize_t cdump(self, obj, bytearray rv, Py_ssize_t offset) except -1:
         cdef char *buf = CDumper.ensure_size(rv, offset, sizeof(int64_t))
-        cdef int64_t val = PyLong_AsLongLong(obj)
+        cdef int64_t val = _as_int_in_range(
+            obj, INT64_MIN, INT64_MAX, "int8")
         # swap bytes if needed
         cdef uint64_t *ptvar = <uint64_t *>(&val)
         cdef int64_t beval = endian.htobe64(ptvar[0])
@@ -173,6 +177,16 @@ cdef class IntNumericBinaryDumper(CDumper):
         raise NotImplementedError("binary decimal dump not implemented yet")
 
 
+cdef long long _as_int_in_range(
+    obj, long long minval, long long maxval, str name
+) except? -1:
+    cdef int overflow
+    cdef long long val = PyLong_AsLongLongAndOverflow(obj, &overflow)
+    if overflow or not minval <= val <= maxval:
+        raise e.DataError(f"value out of {name} range: {obj}")
+    return val
+
+
 cdef class IntDumper(_NumberDumper):
 
     cdef Py_ssize_t cdump(self, obj, bytearray rv, Py_ssize_t offset) except -1:
@@ -348,8 +362,13 @@ cdef class FloatLoader(CLoader):
     format = PQ_TEXT
 
     cdef object cload(self, const char *data, size_t length):
+        # The data is not necessarily null-terminated (e.g. in copy)
+        cdef char *end
         cdef double d = PyOS_string_to_double(
-            data, NULL, <PyObject *>OverflowError)
+            data, &end, <PyObject *>OverflowError)
+        if end != data + length:
+            raise ValueError(
+                f"could not convert string to float: {data[:length]!r}")
         return PyFloat_FromDouble(d)
 
 
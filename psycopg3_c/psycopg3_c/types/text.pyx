@@ -19,7 +19,6 @@ from cpython.unicode cimport (
 from psycopg3_c.pq cimport libpq, Escaping, _buffer_as_string_and_size
 
 from psycopg3 import errors as e
-from psycopg3.encodings import pg2py
 
 cdef extern from "Python.h":
     const char *PyUnicode_AsUTF8AndSize(unicode obj, Py_ssize_t *size) except NULL
@@ -35,17 +34,16 @@ cdef class _StringDumper(CDumper):
 
         self.is_utf8 = 0
         self.encoding = "utf-8"
-        cdef const char *pgenc
 
-        if self._pgconn is not None:
-            pgenc = libpq.PQparameterStatus(self._pgconn.pgconn_ptr, b"client_encoding")
-            if pgenc == NULL or pgenc == b"UTF8":
+        # Use the encoding cached by the connection, avoiding libpq lookups
+        conn = context.connection if context is not None else None
+        if conn is not None:
+            pyenc = conn.client_encoding
+            if pyenc == "utf-8" or pyenc == "ascii":
                 self._bytes_encoding = b"utf-8"
                 self.is_utf8 = 1
             else:
-                self._bytes_encoding = pg2py(pgenc).encode("utf-8")
-                if self._bytes_encoding == b"ascii":
-                    self.is_utf8 = 1
+                self._bytes_encoding = pyenc.encode("utf-8")
             self.encoding = PyBytes_AsString(self._bytes_encoding)
 
     cdef Py_ssize_t cdump(self, obj, bytearray rv, Py_ssize_t offset) except -1:
@@ -108,17 +106,19 @@ cdef class _TextLoader(CLoader):
 
         self.is_utf8 = 0
         self.encoding = "utf-8"
-        cdef const char *pgenc
 
-        if self._pgconn is not None:
-            pgenc = libpq.PQparameterStatus(self._pgconn.pgconn_ptr, b"client_encoding")
-            if pgenc == NULL or pgenc == b"UTF8":
+        # Use the encoding cached by the connection, avoiding libpq lookups
+        conn = context.connection if context is not None else None
+        if conn is not None:
+            pyenc = conn.client_encoding
+            if pyenc == "utf-8":
                 self._bytes_encoding = b"utf-8"
                 self.is_utf8 = 1
             else:
-                self._bytes_encoding = pg2py(pgenc).encode("utf-8")
+                self._bytes_encoding = pyenc.encode("utf-8")
 
-            if pgenc == b"SQL_ASCII":
+            if pyenc == "ascii":
+                # SQL_ASCII: return bytes
                 self.encoding = NULL
             else:
                 self.encoding = PyBytes_AsString(self._bytes_encoding)
@@ -104,6 +104,48 @@ def test_single_row_mode(pgconn):
     assert res.ntuples == 0
 
 
+@pytest.mark.libpq(">= 14")
+def test_pipeline(pgconn):
+    assert pgconn.pipeline_status == pq.PipelineStatus.OFF
+    pgconn.enter_pipeline_mode()
+    assert pgconn.pipeline_status == pq.PipelineStatus.ON
+
+    pgconn.send_prepare(b"prep", b"select $1::int + $2::int")
+    pgconn.send_query_prepared(b"prep", [b"3", b"5"])
+    pgconn.pipeline_sync()
+    pgconn.send_query_params(b"select 1/0", None)
+    pgconn.send_query_params(b"select 1", None)
+    pgconn.pipeline_sync()
+
+    (res,) = execute_wait(pgconn)
+    assert res.status == pq.ExecStatus.COMMAND_OK, res.error_message
+    (res,) = execute_wait(pgconn)
+    assert res.get_value(0, 0) == b"8"
+    # No NULL result after a sync
+    res, res1 = execute_wait(pgconn)
+    assert res.status == pq.ExecStatus.PIPELINE_SYNC
+    assert res1.status == pq.ExecStatus.FATAL_ERROR
+    (res,) = execute_wait(pgconn)
+    assert res.status == pq.ExecStatus.PIPELINE_ABORTED
+    (res,) = execute_wait(pgconn)
+    assert res.status == pq.ExecStatus.PIPELINE_SYNC
+
+    assert pgconn.pipeline_status == pq.PipelineStatus.ON
+    pgconn.exit_pipeline_mode()
+    assert pgconn.pipeline_status == pq.PipelineStatus.OFF
+
+    pgconn.finish()
+    with pytest.raises(psycopg3.OperationalError):
+        pgconn.enter_pipeline_mode()
+
+
+@pytest.mark.libpq("< 14")
+def test_pipeline_not_supported(pgconn):
+    assert pgconn.pipeline_status == pq.PipelineStatus.OFF
+    with pytest.raises(psycopg3.NotSupportedError):
+        pgconn.enter_pipeline_mode()
+
+
 def test_send_query_params(pgconn):
     pgconn.send_query_params(b"select $1::int + $2", [b"5", b"3"])
     (res,) = execute_wait(pgconn)
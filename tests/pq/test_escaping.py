@@ -192,3 +192,14 @@ def test_unescape_bytea(pgconn, data):
     pgconn.finish()
     with pytest.raises(psycopg3.OperationalError):
         esc.unescape_bytea(data)
+
+
+@pytest.mark.parametrize(
+    "method",
+    ["escape_literal", "escape_identifier", "escape_string", "escape_bytea"],
+)
+@pytest.mark.parametrize("type", [bytearray, memoryview])
+def test_escape_buffer(pgconn, method, type):
+    data = b"hello 'world'"
+    esc = pq.Escaping(pgconn)
+    assert getattr(esc, method)(type(data)) == getattr(esc, method)(data)
@@ -1,6 +1,7 @@
 import ctypes
 import pytest
 
+import psycopg3
 from psycopg3 import pq
 
 
@@ -163,6 +164,16 @@ def test_get_value(pgconn):
     assert res.get_value(0, 0) is None
 
 
+def test_get_length(pgconn):
+    res = pgconn.exec_(b"select 'abc', '', NULL")
+    assert res.status == pq.ExecStatus.TUPLES_OK, res.error_message
+    assert res.get_length(0, 0) == 3
+    assert res.get_length(0, 1) == 0
+    assert res.get_length(0, 2) == 0
+    res.clear()
+    assert res.get_length(0, 0) == 0
+
+
 def test_nparams_types(pgconn):
     res = pgconn.prepare(b"", b"select $1::int, $2::text")
     assert res.status == pq.ExecStatus.COMMAND_OK, res.error_message
@@ -202,3 +213,21 @@ def test_oid_value(pgconn):
     assert res.oid_value == 0
     res.clear()
     assert res.oid_value == 0
+
+
+@pytest.mark.libpq(">= 12")
+def test_memory_size(pgconn):
+    res = pgconn.exec_(b"select 1")
+    size = res.memory_size
+    assert size > 0
+    res = pgconn.exec_(b"select repeat('x', 100000)")
+    assert res.memory_size > size + 100000
+    res.clear()
+    assert res.memory_size == 0
+
+
+@pytest.mark.libpq("< 12")
+def test_memory_size_missing(pgconn):
+    res = pgconn.exec_(b"select 1")
+    with pytest.raises(psycopg3.NotSupportedError):
+        res.memory_size
@@ -1,3 +1,6 @@
+import pytest
+
+import psycopg3
 from psycopg3 import pq
 
 
@@ -5,3 +8,13 @@ def test_version():
     rv = pq.version()
     assert rv > 90500
     assert rv < 200000  # you are good for a while
+
+
+def test_has_pipeline(pgconn):
+    if pq.has_pipeline():
+        pgconn.enter_pipeline_mode()
+        assert pgconn.pipeline_status == pq.PipelineStatus.ON
+        pgconn.exit_pipeline_mode()
+    else:
+        with pytest.raises(psycopg3.NotSupportedError):
+            pgconn.enter_pipeline_mode()
@@ -5,6 +5,7 @@ import pytest
 import psycopg3
 from psycopg3 import pq
 from psycopg3.adapt import Transformer, Format, Dumper, Loader
+from psycopg3.adapt import AdaptersProfile
 from psycopg3.oids import builtins, TEXT_OID
 
 
@@ -277,6 +278,7 @@ def test_optimised_adapters():
         c_adapters[n] = obj
 
     # All the registered adapters
+    psycopg3.global_adapters._initialize()
     reg_adapters = set()
     adapters = (
         psycopg3.global_adapters._dumpers + psycopg3.global_adapters._loaders
@@ -309,6 +311,86 @@ def test_optimised_adapters():
     assert not c_adapters
 
 
+@pytest.mark.parametrize("fmt_out", [pq.Format.TEXT, pq.Format.BINARY])
+def test_profile_load(conn, fmt_out):
+    conn.adapters_profile = profile = AdaptersProfile()
+    cur = conn.cursor(binary=fmt_out == pq.Format.BINARY)
+    cur.execute(
+        """select 'hello'::text, i::int4, null::date
+        from generate_series(1, 10) as i"""
+    )
+    cur.fetchone()
+    cur.fetchall()
+
+    stats = {s.oid: s for s in profile.report()}
+    assert set(stats) == {TEXT_OID, builtins["int4"].oid}
+    s = stats[TEXT_OID]
+    assert s.kind == "load"
+    loader = cur._tx.get_loader(TEXT_OID, fmt_out)
+    assert s.adapter is loader.__class__
+    assert s.format == fmt_out
+    assert s.calls == 10
+    assert s.bytes == 50
+    assert s.time > 0
+    s = stats[builtins["int4"].oid]
+    assert s.calls == 10
+    if fmt_out == pq.Format.BINARY:
+        assert s.bytes == 40
+
+
+@pytest.mark.parametrize("fmt_in", [Format.TEXT, Format.BINARY])
+def test_profile_dump(conn, fmt_in):
+    conn.adapters_profile = profile = AdaptersProfile()
+    cur = conn.cursor()
+    ph = "%b" if fmt_in == Format.BINARY else "%t"
+    for i in range(3):
+        cur.execute(f"select {ph}, {ph}, {ph}", ["hello", None, 42])
+
+    stats = [s for s in profile.report() if s.kind == "dump"]
+    assert len(stats) == 2
+    dumper = cur._tx.get_dumper("", fmt_in)
+    s = [s for s in stats if s.adapter is dumper.__class__]
+    assert len(s) == 1
+    assert s[0].calls == 3
+    assert s[0].bytes == 15
+    assert s[0].format == dumper.format
+    assert sum(s.calls for s in stats) == 6
+
+
+def test_profile_copy(conn):
+    conn.adapters_profile = profile = AdaptersProfile()
+    cur = conn.cursor()
+    with cur.copy(
+        "copy (select 'hello'::text from generate_series(1, 5)) to stdout"
+    ) as copy:
+        copy.set_types(["text"])
+        rows = list(copy.rows())
+
+    assert rows == [("hello",)] * 5
+    (s,) = profile.report()
+    assert s.oid == TEXT_OID
+    assert s.calls == 5
+    assert s.bytes == 25
+
+
+def test_profile_report(conn):
+    cur = conn.cursor()
+    cur.execute("select 1")
+    assert cur._tx.profile is None
+
+    conn.adapters_profile = profile = AdaptersProfile()
+    cur.execute("select 1::int4, 'x'::text, 1.0::float8")
+    cur.fetchall()
+    report = profile.report()
+    assert len(report) == 3
+    assert [s.time for s in report] == sorted(
+        (s.time for s in report), reverse=True
+    )
+
+    profile.clear()
+    assert profile.report() == []
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize("fmt", [Format.AUTO, Format.TEXT, Format.BINARY])
 def test_random(conn, faker, fmt):
@@ -320,6 +320,20 @@ def test_encoding_env_var(dsn, monkeypatch, enc, out, codec):
     assert conn.client_encoding == codec
 
 
+def test_encoding_cache_invalidated(conn):
+    conn.client_encoding = "utf-8"
+    conn.commit()
+    assert conn.client_encoding == "utf-8"
+    cur = conn.execute("set client_encoding to latin1")
+    assert conn.client_encoding == "iso8859-1"
+    assert cur._tx.encoding == "utf-8"
+    assert conn.cursor().execute("select 1")._tx.encoding == "iso8859-1"
+
+    # The server reverts the parameter on rollback
+    conn.rollback()
+    assert conn.client_encoding == "utf-8"
+
+
 def test_set_encoding_unsupported(conn):
     cur = conn.cursor()
     cur.execute("set client_encoding to EUC_TW")
@@ -486,3 +500,15 @@ def test_str(conn):
     assert "[IDLE]" in str(conn)
     conn.close()
     assert "[BAD]" in str(conn)
+
+
+def test_query_cache(conn):
+    assert conn.query_cache_size == 128
+    conn.query_cache_size = 10
+    info = conn.query_cache_info()
+    assert info.maxsize == 10
+    for i in range(3):
+        conn.execute("select %s", (i,))
+    conn.execute("select 1")
+    info = conn.query_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
@@ -1,7 +1,9 @@
 import gc
 import string
 import hashlib
+import datetime as dt
 from io import BytesIO, StringIO
+from uuid import UUID
 from itertools import cycle
 
 import pytest
@@ -13,6 +15,7 @@ from psycopg3 import errors as e
 from psycopg3.pq import Format
 from psycopg3.oids import builtins
 from psycopg3.adapt import Format as PgFormat
+from psycopg3.types.json import Jsonb
 from psycopg3.types.numeric import Int4
 
 eur = "\u20ac"
@@ -105,6 +108,15 @@ def test_read_rows(conn, format, typetype):
     assert conn.pgconn.transaction_status == conn.TransactionStatus.INTRANS
 
 
+def test_read_row_float(conn):
+    # In copy the fields are not null-terminated: the loader must only parse
+    # the field data, not the rest of the row.
+    cur = conn.cursor()
+    with cur.copy("copy (select 1.5::float8, 'hello'::text) to stdout") as copy:
+        copy.set_types(["float8", "text"])
+        assert copy.read_row() == (1.5, "hello")
+
+
 @pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
 def test_rows(conn, format):
     cur = conn.cursor()
@@ -187,6 +199,117 @@ def test_copy_out_badntypes(conn, format, err):
             copy.read_row()
 
 
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+def test_copy_out_read_block(conn, format):
+    cur = conn.cursor()
+    with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        block = copy.read_block()
+        assert block == (
+            sample_text if format == Format.TEXT else sample_binary
+        )
+        assert copy.read_block() == b""
+        assert copy.read_block() == b""
+
+    assert cur.rowcount == 2
+    assert conn.pgconn.transaction_status == conn.TransactionStatus.INTRANS
+
+
+@pytest.mark.parametrize("size", [1, 10, 40, 1000])
+def test_copy_out_read_block_buffer(conn, size):
+    buf = bytearray(size)
+    blocks = []
+    cur = conn.cursor()
+    with cur.copy(
+        "copy (select repeat('x', n) from generate_series(1, 30) n)"
+        " to stdout"
+    ) as copy:
+        while 1:
+            block = copy.read_block(buf)
+            if not block:
+                break
+            if len(block) <= size:
+                assert block.obj is buf
+            else:
+                # a row too large for the buffer is returned by itself
+                assert bytes(block).count(b"\n") == 1
+            blocks.append(bytes(block))
+
+    assert b"".join(blocks) == b"".join(
+        b"x" * n + b"\n" for n in range(1, 31)
+    )
+    assert cur.rowcount == 30
+
+
+def test_copy_out_read_block_read(conn):
+    # Rows not fitting in the buffer are not lost switching to read()
+    cur = conn.cursor()
+    with cur.copy(
+        "copy (select repeat('x', n) from generate_series(1, 4) n)"
+        " to stdout"
+    ) as copy:
+        assert copy.read_block(bytearray(5)) == b"x\nxx\n"
+        assert copy.read() == b"xxx\n"
+        assert copy.read_block(bytearray(5)) == b"xxxx\n"
+        assert copy.read_block(bytearray(5)) == b""
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("target", ["path", "fd", "file", "bytesio"])
+def test_copy_out_read_into(conn, format, target, tmpdir):
+    fn = str(tmpdir / "copy.out")
+    cur = conn.cursor()
+    with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        if target == "path":
+            copy.read_into(fn)
+        elif target == "fd":
+            with open(fn, "wb") as f:
+                copy.read_into(f.fileno())
+        elif target == "file":
+            with open(fn, "wb") as f:
+                copy.read_into(f)
+        else:
+            f = BytesIO()
+            copy.read_into(f)
+
+    if target == "bytesio":
+        data = f.getvalue()
+    else:
+        with open(fn, "rb") as f:
+            data = f.read()
+
+    assert data == (sample_text if format == Format.TEXT else sample_binary)
+    assert cur.rowcount == 2
+    assert conn.pgconn.transaction_status == conn.TransactionStatus.INTRANS
+
+
+def test_copy_out_read_into_text(conn):
+    conn.client_encoding = "utf8"
+    f = StringIO()
+    cur = conn.cursor()
+    with cur.copy(f"copy (select '{eur}'::text) to stdout") as copy:
+        copy.read_into(f)
+
+    assert f.getvalue() == f"{eur}\n"
+
+
+@pytest.mark.parametrize("size", [1, 10, 40, 1000])
+def test_copy_out_read_into_blocks(conn, size, monkeypatch):
+    monkeypatch.setattr(psycopg3.Copy, "BLOCK_SIZE", size)
+    f = BytesIO()
+    cur = conn.cursor()
+    with cur.copy(
+        "copy (select repeat('x', n) from generate_series(1, 30) n)"
+        " to stdout"
+    ) as copy:
+        copy.read_into(f)
+
+    assert f.getvalue() == b"".join(b"x" * n + b"\n" for n in range(1, 31))
+
+
 @pytest.mark.parametrize(
     "format, buffer",
     [(Format.TEXT, "sample_text"), (Format.BINARY, "sample_binary")],
@@ -260,6 +383,84 @@ def test_copy_in_empty(conn, format):
     assert cur.rowcount == 0
 
 
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("source", ["path", "fd", "file", "bytesio"])
+def test_copy_in_write_from(conn, format, source, tmpdir):
+    data = sample_text if format == Format.TEXT else sample_binary
+    fn = str(tmpdir / "copy.in")
+    with open(fn, "wb") as f:
+        f.write(data)
+
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        if source == "path":
+            copy.write_from(fn)
+        elif source == "fd":
+            with open(fn, "rb") as f:
+                copy.write_from(f.fileno())
+        elif source == "file":
+            with open(fn, "rb") as f:
+                copy.write_from(f)
+        else:
+            copy.write_from(BytesIO(data))
+
+    assert cur.rowcount == 2
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == sample_records
+
+
+def test_copy_in_write_from_text(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy("copy copy_in from stdin (format text)") as copy:
+        copy.write_from(StringIO(sample_text.decode("utf8")))
+
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == sample_records
+
+
+@pytest.mark.parametrize("source", ["path", "bytesio"])
+@pytest.mark.parametrize("size", [1, 7, 1000])
+def test_copy_in_write_from_blocks(conn, source, size, tmpdir, monkeypatch):
+    monkeypatch.setattr(psycopg3.Copy, "BLOCK_SIZE", size)
+    fn = str(tmpdir / "copy.in")
+    with open(fn, "wb") as f:
+        f.write(sample_binary)
+
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy("copy copy_in from stdin (format binary)") as copy:
+        copy.write_from(fn if source == "path" else BytesIO(sample_binary))
+
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == sample_records
+
+
+def test_copy_in_write_from_empty(conn, tmpdir):
+    fn = str(tmpdir / "copy.in")
+    open(fn, "wb").close()
+
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy("copy copy_in from stdin (format text)") as copy:
+        copy.write_from(fn)
+
+    assert cur.rowcount == 0
+
+
+def test_copy_in_write_from_after_write(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    rows = sample_text.splitlines(True)
+    with cur.copy("copy copy_in from stdin (format text)") as copy:
+        copy.write(rows[0])
+        copy.write_from(BytesIO(rows[1]))
+
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == sample_records
+
+
 @pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
 def test_subclass_adapter(conn, format):
     if format == Format.TEXT:
@@ -333,6 +534,172 @@ def test_copy_in_records(conn, format):
     assert data == sample_records
 
 
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+def test_copy_in_write_rows(conn, format):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.write_rows(iter(sample_records))
+        copy.write_rows([])
+        copy.write_row((Int4(50), Int4(60), "!"))
+
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == sample_records + [(50, 60, "!")]
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+def test_copy_in_write_rows_many(conn, format):
+    cur = conn.cursor()
+    ensure_table(cur, "col1 int primary key, col2 int, data text")
+
+    nrecs = 10000
+    rows = (
+        (Int4(i), None if i % 3 else Int4(i), None if i % 5 else str(i) * 3)
+        for i in range(nrecs)
+    )
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.write_rows(rows)
+
+    assert cur.rowcount == nrecs
+    cur.execute(
+        """
+select count(*), sum(col1), count(col2), count(data)
+from copy_in where data is null or data = repeat(col1::text, 3)
+"""
+    )
+    assert cur.fetchone() == (
+        nrecs,
+        sum(range(nrecs)),
+        len(range(0, nrecs, 3)),
+        len(range(0, nrecs, 5)),
+    )
+
+
+def test_copy_in_write_rows_upgrade(conn):
+    # The dumper of an int depends on its value: make sure it is not reused
+    cur = conn.cursor()
+    ensure_table(cur, "col1 bigint, data text")
+    rows = [(1, "a"), (2 ** 40, "b"), (None, "c"), (-(2 ** 20), None)]
+
+    with cur.copy("copy copy_in from stdin") as copy:
+        copy.write_rows(rows)
+
+    data = cur.execute("select * from copy_in").fetchall()
+    assert data == rows
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+def test_copy_in_write_rows_error(conn, format):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    def rows():
+        yield from sample_records
+        # Fail dumping a row after writing part of it
+        yield (Int4(50), object(), "!")
+
+    with pytest.raises(e.QueryCanceled) as exc:
+        with cur.copy(
+            f"copy copy_in from stdin (format {format.name})"
+        ) as copy:
+            copy.write_rows(rows())
+
+    assert "ProgrammingError" in str(exc.value)
+    assert conn.pgconn.transaction_status == conn.TransactionStatus.INERROR
+
+
+@pytest.mark.parametrize("method", ["row", "rows"])
+def test_copy_in_set_types_binary(conn, method):
+    cur = conn.cursor()
+    ensure_table(cur, "col1 bigint, col2 int, col3 int2, data text, b bytea")
+    rows = [
+        (1, 2, 3, "hello", b"\x00"),
+        (2 ** 40, -(2 ** 20), None, None, bytearray(b"\xff")),
+    ]
+
+    with cur.copy("copy copy_in from stdin (format binary)") as copy:
+        copy.set_types(["int8", "int4", "int2", "text", "bytea"])
+        if method == "row":
+            for row in rows:
+                copy.write_row(row)
+        else:
+            copy.write_rows(rows)
+
+    data = cur.execute("select * from copy_in").fetchall()
+    assert data == [(*r[:4], bytes(r[4])) for r in rows]
+
+
+def test_copy_in_set_types_extra_columns(conn):
+    cur = conn.cursor()
+    ensure_table(cur, "col1 bigint, data text")
+    with cur.copy("copy copy_in from stdin (format binary)") as copy:
+        copy.set_types(["int8"])
+        copy.write_rows([(1, "hello")])
+
+    data = cur.execute("select * from copy_in").fetchall()
+    assert data == [(1, "hello")]
+
+
+@pytest.mark.parametrize(
+    "typename, value",
+    [
+        ("varchar", "hello"),
+        ("name", "hello"),
+        ("uuid", UUID("12345678-1234-5678-1234-567812345678")),
+        ("int4[]", [1, None, 70000]),
+        ("jsonb", Jsonb({"a": [1, None]})),
+        ("jsonb", {"a": [1, None]}),
+        ("jsonb", "hello"),
+    ],
+)
+def test_copy_in_set_types_by_value(conn, typename, value):
+    cur = conn.cursor()
+    ensure_table(cur, f"col1 {typename}")
+    with cur.copy("copy copy_in from stdin (format binary)") as copy:
+        copy.set_types([typename])
+        copy.write_row([value])
+
+    data = cur.execute("select * from copy_in").fetchone()[0]
+    assert data == (value.obj if isinstance(value, Jsonb) else value)
+
+
+def test_copy_in_set_types_no_dumper(conn):
+    cur = conn.cursor()
+    ensure_table(cur, "col1 timestamptz")
+    with cur.copy("copy copy_in from stdin (format binary)") as copy:
+        copy.set_types(["timestamptz"])
+        copy.write_row([None])
+        with pytest.raises(e.ProgrammingError, match="datetime"):
+            copy.write_row([dt.datetime.now(dt.timezone.utc)])
+
+
+@pytest.mark.parametrize(
+    "typename, value",
+    [("int2", 70000), ("int2", -(2 ** 15) - 1), ("int4", 2 ** 31)],
+)
+def test_copy_in_set_types_out_of_range(conn, typename, value):
+    cur = conn.cursor()
+    ensure_table(cur, f"col1 {typename}")
+    with pytest.raises(e.QueryCanceled) as exc:
+        with cur.copy("copy copy_in from stdin (format binary)") as copy:
+            copy.set_types([typename])
+            copy.write_row([value])
+
+    assert "DataError" in str(exc.value)
+
+
+def test_copy_in_set_types_text(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy("copy copy_in from stdin") as copy:
+        copy.set_types(["int4", "int4", "text"])
+        copy.write_rows(sample_records)
+
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == sample_records
+
+
 @pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
 def test_copy_in_records_binary(conn, format):
     cur = conn.cursor()
@@ -496,6 +863,50 @@ def test_worker_life(conn, format, buffer):
     assert data == sample_records
 
 
+def test_queued_size_limit(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy("copy copy_in (col2, data) from stdin") as copy:
+        copy.MAX_QUEUED_SIZE = 1000
+        assert copy.queued_size == 0
+        for i in range(10):
+            copy.write(f"{i}\t{'x' * 400}\n")
+            assert 0 < copy.queued_size <= 1000
+
+        with pytest.raises(e.OperationalError):
+            copy.write("x" * 1001)
+        assert copy.queued_size <= 1000
+
+    assert copy.queued_size == 0
+    cur.execute("select count(*) from copy_in")
+    assert cur.fetchone()[0] == 10
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("method", ["row", "rows"])
+def test_buffer_size_limit(conn, format, method):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with pytest.raises(e.QueryCanceled) as exc:
+        with cur.copy(f"copy copy_in from stdin (format {format.name})") as c:
+            c.formatter.MAX_BUFFER_SIZE = 200
+            c.write_row(sample_records[0])
+            assert c.formatter.buffer_size > 0
+            rec = (Int4(1), Int4(2), "x" * 200)
+            try:
+                if method == "row":
+                    c.write_row(rec)
+                else:
+                    c.write_rows([rec])
+            finally:
+                assert c.formatter.buffer_size == 0
+
+    assert "limit" in str(exc.value)
+    conn.rollback()
+    cur.execute("select count(*) from copy_in")
+    assert cur.fetchone()[0] == 0
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize("fmt", [Format.TEXT, Format.BINARY])
 @pytest.mark.parametrize("method", ["read", "iter", "row", "rows"])
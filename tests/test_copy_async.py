@@ -13,6 +13,7 @@ from psycopg3 import errors as e
 from psycopg3.pq import Format
 from psycopg3.oids import builtins
 from psycopg3.adapt import Format as PgFormat
+from psycopg3.types.numeric import Int4
 
 from .test_copy import sample_text, sample_binary, sample_binary_rows  # noqa
 from .test_copy import eur, sample_values, sample_records, sample_tabledef
@@ -175,6 +176,63 @@ async def test_copy_out_badntypes(aconn, format, err):
             await copy.read_row()
 
 
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+async def test_copy_out_read_block(aconn, format):
+    cur = await aconn.cursor()
+    async with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        block = await copy.read_block(bytearray(1000))
+        assert block == (
+            sample_text if format == Format.TEXT else sample_binary
+        )
+        assert await copy.read_block() == b""
+
+    assert cur.rowcount == 2
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("target", ["path", "bytesio"])
+async def test_copy_out_read_into(aconn, format, target, tmpdir):
+    fn = str(tmpdir / "copy.out")
+    f = BytesIO()
+    cur = await aconn.cursor()
+    async with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        await copy.read_into(fn if target == "path" else f)
+
+    if target == "path":
+        with open(fn, "rb") as f:
+            data = f.read()
+    else:
+        data = f.getvalue()
+
+    assert data == (sample_text if format == Format.TEXT else sample_binary)
+    assert cur.rowcount == 2
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("source", ["path", "bytesio"])
+async def test_copy_in_write_from(aconn, format, source, tmpdir):
+    data = sample_text if format == Format.TEXT else sample_binary
+    fn = str(tmpdir / "copy.in")
+    with open(fn, "wb") as f:
+        f.write(data)
+
+    cur = await aconn.cursor()
+    await ensure_table(cur, sample_tabledef)
+    async with cur.copy(
+        f"copy copy_in from stdin (format {format.name})"
+    ) as copy:
+        await copy.write_from(fn if source == "path" else BytesIO(data))
+
+    assert cur.rowcount == 2
+    await cur.execute("select * from copy_in order by 1")
+    data = await cur.fetchall()
+    assert data == sample_records
+
+
 @pytest.mark.parametrize(
     "format, buffer",
     [(Format.TEXT, "sample_text"), (Format.BINARY, "sample_binary")],
@@ -303,6 +361,22 @@ async def test_copy_in_records(aconn, format):
     assert data == sample_records
 
 
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+async def test_copy_in_write_rows(aconn, format):
+    cur = await aconn.cursor()
+    await ensure_table(cur, sample_tabledef)
+
+    async with cur.copy(
+        f"copy copy_in from stdin (format {format.name})"
+    ) as copy:
+        await copy.write_rows(iter(sample_records))
+        await copy.write_row((Int4(50), Int4(60), "!"))
+
+    await cur.execute("select * from copy_in order by 1")
+    data = await cur.fetchall()
+    assert data == sample_records + [(50, 60, "!")]
+
+
 @pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
 async def test_copy_in_records_binary(aconn, format):
     cur = await aconn.cursor()
@@ -475,6 +549,52 @@ async def test_worker_life(aconn, format, buffer):
     assert data == sample_records
 
 
+async def test_queued_size_limit(aconn):
+    cur = await aconn.cursor()
+    await ensure_table(cur, sample_tabledef)
+    async with cur.copy("copy copy_in (col2, data) from stdin") as copy:
+        copy.MAX_QUEUED_SIZE = 1000
+        assert copy.queued_size == 0
+        for i in range(10):
+            await copy.write(f"{i}\t{'x' * 400}\n")
+            assert 0 < copy.queued_size <= 1000
+
+        with pytest.raises(e.OperationalError):
+            await copy.write("x" * 1001)
+        assert copy.queued_size <= 1000
+
+    assert copy.queued_size == 0
+    await cur.execute("select count(*) from copy_in")
+    assert (await cur.fetchone())[0] == 10
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("method", ["row", "rows"])
+async def test_buffer_size_limit(aconn, format, method):
+    cur = await aconn.cursor()
+    await ensure_table(cur, sample_tabledef)
+    with pytest.raises(e.QueryCanceled) as exc:
+        async with cur.copy(
+            f"copy copy_in from stdin (format {format.name})"
+        ) as c:
+            c.formatter.MAX_BUFFER_SIZE = 200
+            await c.write_row(sample_records[0])
+            assert c.formatter.buffer_size > 0
+            rec = (Int4(1), Int4(2), "x" * 200)
+            try:
+                if method == "row":
+                    await c.write_row(rec)
+                else:
+                    await c.write_rows([rec])
+            finally:
+                assert c.formatter.buffer_size == 0
+
+    assert "limit" in str(exc.value)
+    await aconn.rollback()
+    await cur.execute("select count(*) from copy_in")
+    assert (await cur.fetchone())[0] == 0
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize("fmt", [Format.TEXT, Format.BINARY])
 @pytest.mark.parametrize("method", ["read", "iter", "row", "rows"])
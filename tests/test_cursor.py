@@ -137,6 +137,17 @@ def test_query_badenc(conn):
         cur.execute("select '\u20ac'")
 
 
+def test_query_encoding_change(conn):
+    conn.client_encoding = "utf8"
+    cur = conn.cursor()
+    query = "select %s::text, '\u20ac', length(%s), length('\u20ac')"
+    cur.execute(query, ["\u20ac"] * 2)
+    assert cur.fetchone() == ("\u20ac", "\u20ac", 1, 1)
+    conn.client_encoding = "latin9"
+    cur.execute(query, ["\u20ac"] * 2)
+    assert cur.fetchone() == ("\u20ac", "\u20ac", 1, 1)
+
+
 @pytest.fixture(scope="session")
 def _execmany(svcconn):
     cur = svcconn.cursor()
@@ -263,6 +274,58 @@ def test_iter_stop(conn):
     assert list(cur) == []
 
 
+@pytest.mark.parametrize("fetch", ["one", "many", "all", "iter"])
+def test_release_result(conn, fetch):
+    cur = conn.cursor()
+    cur.release_results = True
+    cur.execute("select generate_series(1, 3) as foo, 'x'::text as bar")
+    res = cur.pgresult
+    if fetch == "one":
+        while cur.fetchone():
+            pass
+    elif fetch == "many":
+        assert len(cur.fetchmany(2)) == 2
+        assert cur.pgresult is res
+        assert len(cur.fetchmany(2)) == 1
+    elif fetch == "all":
+        assert len(cur.fetchall()) == 3
+    elif fetch == "iter":
+        assert len(list(cur)) == 3
+
+    assert cur.pgresult is not res
+    assert cur.pgresult.ntuples == 0
+    assert cur.rowcount == 3
+    assert [c.name for c in cur.description] == ["foo", "bar"]
+    assert [c.type_code for c in cur.description] == [
+        builtins["int4"].oid,
+        builtins["text"].oid,
+    ]
+    assert cur.fetchone() is None
+    assert cur.fetchall() == []
+
+
+def test_release_result_default(conn):
+    cur = conn.cursor()
+    cur.execute("select generate_series(1, 3)")
+    res = cur.pgresult
+    assert len(cur.fetchall()) == 3
+    assert cur.pgresult is res
+    assert res.command_status == b"SELECT 3"
+
+
+def test_release_result_nextset(conn):
+    cur = conn.cursor()
+    cur.release_results = True
+    cur.execute("select 1; select 'x', 'y'")
+    assert cur.fetchall() == [(1,)]
+    assert cur.pgresult.ntuples == 0
+    assert cur.nextset()
+    assert cur.pgresult.ntuples == 1
+    assert cur.fetchall() == [("x", "y")]
+    assert len(cur.description) == 2
+    assert cur.nextset() is None
+
+
 def test_query_params_execute(conn):
     cur = conn.cursor()
     assert cur.query is None
@@ -488,3 +551,123 @@ def test_leak(dsn, faker, fmt, fetch):
     assert (
         n[0] == n[1] == n[2]
     ), f"objects leaked: {n[1] - n[0]}, {n[2] - n[1]}"
+
+
+def test_trace_execute(conn):
+    traces = []
+    conn.add_trace_handler(traces.append)
+    cur = conn.cursor()
+    cur.execute("select %s::text, 'ab' from generate_series(1, 3)", ["xyz"])
+    assert len(traces) == 1
+    t = traces[0]
+    assert t.operation == "execute"
+    assert t.query == b"select $1::text, 'ab' from generate_series(1, 3)"
+    assert not t.prepared
+    assert t.bytes_sent == len(t.query) + 3
+    assert t.bytes_received == cur.pgresult.memory_size > 3 * 5
+    assert t.rows == 3
+    assert t.convert_time > 0
+    assert t.dump_time > 0
+    assert t.send_time + t.wait_time > 0
+    assert t.load_time == 0
+
+    cur.fetchone()
+    cur.fetchmany(1)
+    cur.fetchall()
+    assert [t.operation for t in traces[1:]] == ["fetch"] * 3
+    assert [t.rows for t in traces[1:]] == [1, 1, 1]
+    assert all(t.load_time > 0 for t in traces[1:])
+    assert all(t.query == traces[0].query for t in traces[1:])
+
+
+def test_trace_iter(conn):
+    traces = []
+    cur = conn.cursor()
+    cur.execute("select generate_series(1, 3)")
+    conn.add_trace_handler(traces.append)
+    assert list(cur) == [(1,), (2,), (3,)]
+    assert [t.operation for t in traces] == ["fetch"] * 3
+    assert traces[0].query == b"select generate_series(1, 3)"
+
+
+def test_trace_executemany(conn, execmany):
+    traces = []
+    conn.add_trace_handler(traces.append)
+    cur = conn.cursor()
+    cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        [(10, "hello"), (20, "world")],
+    )
+    assert [t.operation for t in traces] == ["executemany"] * 2
+    assert traces[0].convert_time > 0
+    assert traces[1].convert_time == 0
+    assert traces[1].dump_time > 0
+    assert traces[1].bytes_sent == len(traces[1].query) + 2 + 5
+    assert all(t.prepared for t in traces)
+
+
+def test_trace_prepared(conn):
+    traces = []
+    conn.add_trace_handler(traces.append)
+    cur = conn.cursor()
+    cur.execute("select 1", prepare=True)
+    cur.execute("select 1", prepare=True)
+    cur.execute("select 1", prepare=False)
+    assert [t.prepared for t in traces] == [True, True, False]
+
+
+def test_trace_remove(conn):
+    traces = []
+    conn.add_trace_handler(traces.append)
+    cur = conn.cursor()
+    cur.execute("select 1")
+    conn.remove_trace_handler(traces.append)
+    cur.execute("select 1")
+    cur.fetchone()
+    assert len(traces) == 1
+
+
+def test_trace_remove_executemany(conn, execmany):
+    traces = []
+
+    def handler(trace):
+        traces.append(trace)
+        conn.remove_trace_handler(handler)
+
+    conn.add_trace_handler(handler)
+    cur = conn.cursor()
+    cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        [(10, "hello"), (20, "world"), (30, "ciao")],
+    )
+    assert len(traces) == 1
+    assert cur._tracer is None
+
+
+def test_trace_remove_self(conn):
+    traces = []
+
+    def handler(trace):
+        conn.remove_trace_handler(handler)
+
+    conn.add_trace_handler(handler)
+    conn.add_trace_handler(traces.append)
+    cur = conn.cursor()
+    cur.execute("select 1")
+    assert len(traces) == 1
+
+
+def test_trace_error(conn, caplog):
+    traces = []
+
+    def cb(trace):
+        1 / 0
+
+    conn.add_trace_handler(cb)
+    conn.add_trace_handler(traces.append)
+    cur = conn.cursor()
+    cur.execute("select 1")
+    assert cur.fetchone() == (1,)
+    assert len(traces) == 2
+    assert len(caplog.records) == 2
+    assert "division by zero" in caplog.records[0].message
@@ -140,6 +140,17 @@ async def test_query_badenc(aconn):
         await cur.execute("select '\u20ac'")
 
 
+async def test_query_encoding_change(aconn):
+    await aconn.set_client_encoding("utf8")
+    cur = await aconn.cursor()
+    query = "select %s::text, '\u20ac', length(%s), length('\u20ac')"
+    await cur.execute(query, ["\u20ac"] * 2)
+    assert (await cur.fetchone()) == ("\u20ac", "\u20ac", 1, 1)
+    await aconn.set_client_encoding("latin9")
+    await cur.execute(query, ["\u20ac"] * 2)
+    assert (await cur.fetchone()) == ("\u20ac", "\u20ac", 1, 1)
+
+
 @pytest.fixture(scope="function")
 async def execmany(svcconn):
     cur = svcconn.cursor()
@@ -268,6 +279,41 @@ async def test_iter_stop(aconn):
         assert False
 
 
+@pytest.mark.parametrize("fetch", ["one", "many", "all", "iter"])
+async def test_release_result(aconn, fetch):
+    cur = await aconn.cursor()
+    cur.release_results = True
+    await cur.execute("select generate_series(1, 3) as foo, 'x'::text as bar")
+    res = cur.pgresult
+    if fetch == "one":
+        while await cur.fetchone():
+            pass
+    elif fetch == "many":
+        assert len(await cur.fetchmany(2)) == 2
+        assert cur.pgresult is res
+        assert len(await cur.fetchmany(2)) == 1
+    elif fetch == "all":
+        assert len(await cur.fetchall()) == 3
+    elif fetch == "iter":
+        assert len([rec async for rec in cur]) == 3
+
+    assert cur.pgresult is not res
+    assert cur.pgresult.ntuples == 0
+    assert cur.rowcount == 3
+    assert [c.name for c in cur.description] == ["foo", "bar"]
+    assert (await cur.fetchone()) is None
+    assert (await cur.fetchall()) == []
+
+
+async def test_release_result_default(aconn):
+    cur = await aconn.cursor()
+    await cur.execute("select generate_series(1, 3)")
+    res = cur.pgresult
+    assert len(await cur.fetchall()) == 3
+    assert cur.pgresult is res
+    assert res.command_status == b"SELECT 3"
+
+
 async def test_query_params_execute(aconn):
     cur = await aconn.cursor()
     assert cur.query is None
@@ -401,3 +447,125 @@ async def test_leak(dsn, faker, fmt, fetch):
     assert (
         n[0] == n[1] == n[2]
     ), f"objects leaked: {n[1] - n[0]}, {n[2] - n[1]}"
+
+
+async def test_trace_execute(aconn):
+    traces = []
+    aconn.add_trace_handler(traces.append)
+    cur = await aconn.cursor()
+    await cur.execute(
+        "select %s::text, 'ab' from generate_series(1, 3)", ["xyz"]
+    )
+    assert len(traces) == 1
+    t = traces[0]
+    assert t.operation == "execute"
+    assert t.query == b"select $1::text, 'ab' from generate_series(1, 3)"
+    assert not t.prepared
+    assert t.bytes_sent == len(t.query) + 3
+    assert t.bytes_received == cur.pgresult.memory_size > 3 * 5
+    assert t.rows == 3
+    assert t.convert_time > 0
+    assert t.dump_time > 0
+    assert t.send_time + t.wait_time > 0
+    assert t.load_time == 0
+
+    await cur.fetchone()
+    await cur.fetchmany(1)
+    await cur.fetchall()
+    assert [t.operation for t in traces[1:]] == ["fetch"] * 3
+    assert [t.rows for t in traces[1:]] == [1, 1, 1]
+    assert all(t.load_time > 0 for t in traces[1:])
+    assert all(t.query == traces[0].query for t in traces[1:])
+
+
+async def test_trace_iter(aconn):
+    traces = []
+    cur = await aconn.cursor()
+    await cur.execute("select generate_series(1, 3)")
+    aconn.add_trace_handler(traces.append)
+    assert [rec async for rec in cur] == [(1,), (2,), (3,)]
+    assert [t.operation for t in traces] == ["fetch"] * 3
+    assert traces[0].query == b"select generate_series(1, 3)"
+
+
+async def test_trace_executemany(aconn, execmany):
+    traces = []
+    aconn.add_trace_handler(traces.append)
+    cur = await aconn.cursor()
+    await cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        [(10, "hello"), (20, "world")],
+    )
+    assert [t.operation for t in traces] == ["executemany"] * 2
+    assert traces[0].convert_time > 0
+    assert traces[1].convert_time == 0
+    assert traces[1].dump_time > 0
+    assert traces[1].bytes_sent == len(traces[1].query) + 2 + 5
+    assert all(t.prepared for t in traces)
+
+
+async def test_trace_prepared(aconn):
+    traces = []
+    aconn.add_trace_handler(traces.append)
+    cur = await aconn.cursor()
+    await cur.execute("select 1", prepare=True)
+    await cur.execute("select 1", prepare=True)
+    await cur.execute("select 1", prepare=False)
+    assert [t.prepared for t in traces] == [True, True, False]
+
+
+async def test_trace_remove(aconn):
+    traces = []
+    aconn.add_trace_handler(traces.append)
+    cur = await aconn.cursor()
+    await cur.execute("select 1")
+    aconn.remove_trace_handler(traces.append)
+    await cur.execute("select 1")
+    await cur.fetchone()
+    assert len(traces) == 1
+
+
+async def test_trace_remove_executemany(aconn, execmany):
+    traces = []
+
+    def handler(trace):
+        traces.append(trace)
+        aconn.remove_trace_handler(handler)
+
+    aconn.add_trace_handler(handler)
+    cur = await aconn.cursor()
+    await cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        [(10, "hello"), (20, "world"), (30, "ciao")],
+    )
+    assert len(traces) == 1
+    assert cur._tracer is None
+
+
+async def test_trace_remove_self(aconn):
+    traces = []
+
+    def handler(trace):
+        aconn.remove_trace_handler(handler)
+
+    aconn.add_trace_handler(handler)
+    aconn.add_trace_handler(traces.append)
+    cur = await aconn.cursor()
+    await cur.execute("select 1")
+    assert len(traces) == 1
+
+
+async def test_trace_error(aconn, caplog):
+    traces = []
+
+    def cb(trace):
+        1 / 0
+
+    aconn.add_trace_handler(cb)
+    aconn.add_trace_handler(traces.append)
+    cur = await aconn.cursor()
+    await cur.execute("select 1")
+    assert (await cur.fetchone()) == (1,)
+    assert len(traces) == 2
+    assert len(caplog.records) == 2
+    assert "division by zero" in caplog.records[0].message
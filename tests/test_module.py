@@ -1,3 +1,6 @@
+import sys
+import subprocess as sp
+
 import pytest
 
 
@@ -28,3 +31,44 @@ def test_connect(monkeypatch, dsn, args, kwargs, want_conninfo):
 
     psycopg3.connect(*args, **kwargs)
     assert got_conninfo == want_conninfo
+
+
+def test_lazy_import():
+    # Importing the package doesn't import the adapters: check it in a new
+    # interpreter.
+    script = """\
+import sys
+import psycopg3
+assert not [m for m in sys.modules if m.startswith("psycopg3.types")]
+assert psycopg3.global_adapters.get_loader(23, psycopg3.pq.Format.TEXT)
+assert "psycopg3.types" in sys.modules
+"""
+    sp.check_call([sys.executable, "-c", script])
+
+
+@pytest.mark.subprocess
+def test_lazy_import_threads():
+    # The first use from several threads at once must wait for the adapters
+    # registration.
+    script = """\
+import threading
+import psycopg3
+
+nthreads = 8
+barrier = threading.Barrier(nthreads)
+loaders = []
+
+def worker():
+    barrier.wait()
+    loaders.append(
+        psycopg3.global_adapters.get_loader(23, psycopg3.pq.Format.TEXT))
+
+threads = [threading.Thread(target=worker) for i in range(nthreads)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+
+assert len(loaders) == nthreads and all(loaders), loaders
+"""
+    sp.check_call([sys.executable, "-c", script])
@@ -0,0 +1,226 @@
+import time
+import queue
+import logging
+import threading
+
+import pytest
+
+import psycopg3
+from psycopg3 import NotifyListener
+
+
+@pytest.fixture
+def nconn(dsn):
+    conn = psycopg3.connect(dsn, autocommit=True)
+    yield conn
+    conn.close()
+
+
+def notify(conn, *pairs):
+    for channel, payload in pairs:
+        conn.execute("select pg_notify(%s, %s)", (channel, payload))
+
+
+def get_all(q, n, timeout=2.0):
+    rv = []
+    while len(rv) < n:
+        batch = q.get(timeout=timeout)
+        assert batch is not None
+        rv.extend(batch)
+    return rv
+
+
+def test_subscribe_channels(conn, nconn):
+    conn.autocommit = True
+    with NotifyListener(conn) as listener:
+        qfoo = listener.subscribe("foo")
+        qbar = listener.subscribe("bar", "baz")
+        qall = listener.subscribe()
+        assert listener.channels == ["bar", "baz", "foo"]
+
+        notify(nconn, ("foo", "1"), ("bar", "2"), ("baz", "3"), ("qux", "4"))
+
+        ns = get_all(qfoo, 1)
+        assert [(n.channel, n.payload) for n in ns] == [("foo", "1")]
+        assert ns[0].pid == nconn.pgconn.backend_pid
+        assert isinstance(ns[0], psycopg3.Notify)
+
+        ns = get_all(qbar, 2)
+        assert [n.payload for n in ns] == ["2", "3"]
+
+        # 'qux' is not listened to
+        ns = get_all(qall, 3)
+        assert [n.payload for n in ns] == ["1", "2", "3"]
+
+    for q in (qfoo, qbar, qall):
+        assert q.get(timeout=1.0) is None
+    assert listener.error is None
+
+
+def test_batch(conn, nconn):
+    conn.autocommit = True
+    with NotifyListener(conn) as listener:
+        q = listener.subscribe("foo")
+        with nconn.transaction():
+            for i in range(10):
+                notify(nconn, ("foo", str(i)))
+
+        batch = q.get(timeout=1.0)
+        assert [n.payload for n in batch] == [str(i) for i in range(10)]
+
+
+def test_unsubscribe(conn, nconn):
+    conn.autocommit = True
+    with NotifyListener(conn) as listener:
+        q1 = listener.subscribe("foo")
+        q2 = listener.subscribe("foo", "bar")
+        listener.unsubscribe(q2)
+        assert listener.channels == ["foo"]
+        listener.unsubscribe(q1)
+        assert listener.channels == []
+
+        with pytest.raises(ValueError):
+            listener.unsubscribe(q1)
+
+        q3 = listener.subscribe("bar")
+        notify(nconn, ("foo", "1"), ("bar", "2"))
+        assert [n.payload for n in get_all(q3, 1)] == ["2"]
+
+    assert q1.empty()
+    assert q2.empty()
+
+
+def test_connection_usable(conn, nconn):
+    conn.autocommit = True
+    with NotifyListener(conn) as listener:
+        q = listener.subscribe("foo")
+        time.sleep(0.1)
+
+        # The listener doesn't hold the lock while waiting
+        t0 = time.time()
+        cur = conn.execute("select pg_notify('foo', '1'), 42")
+        assert cur.fetchone() == ("", 42)
+        assert time.time() - t0 < 0.5
+
+        # The notification received by the query goes to the listener
+        assert [n.payload for n in get_all(q, 1)] == ["1"]
+
+        notify(nconn, ("foo", "2"))
+        assert [n.payload for n in get_all(q, 1)] == ["2"]
+
+
+def test_stop_fast(conn):
+    listener = NotifyListener(conn)
+    q = listener.subscribe("foo")
+    listener.start()
+    time.sleep(0.1)
+    t0 = time.time()
+    listener.stop()
+    assert time.time() - t0 < 0.5
+    assert q.get_nowait() is None
+
+    with pytest.raises(psycopg3.ProgrammingError):
+        listener.start()
+    with pytest.raises(psycopg3.ProgrammingError):
+        listener.subscribe("bar")
+
+
+def test_stop_not_started(conn):
+    listener = NotifyListener(conn)
+    q = listener.subscribe("foo")
+
+    # A consumer already waiting receives the end marker
+    got = []
+    t = threading.Thread(target=lambda: got.append(q.get(timeout=2.0)))
+    t.start()
+    time.sleep(0.1)
+    listener.stop()
+    t.join()
+    assert got == [None]
+
+    listener.stop()
+    assert q.empty()
+    with pytest.raises(psycopg3.ProgrammingError):
+        listener.start()
+
+
+def test_timeout(conn):
+    conn.autocommit = True
+    with NotifyListener(conn) as listener:
+        q = listener.subscribe("foo")
+        with pytest.raises(queue.Empty):
+            q.get(timeout=0.2)
+
+
+def test_connection_closed(conn):
+    listener = NotifyListener(conn)
+    listener.POLL_INTERVAL = 0.1
+    q = listener.subscribe("foo")
+    listener.start()
+    threading.Timer(0.1, conn.close).start()
+    assert q.get(timeout=1.0) is None
+    assert isinstance(listener.error, psycopg3.OperationalError)
+    listener.stop()
+
+
+def test_maxsize(conn, nconn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg3")
+    conn.autocommit = True
+    with NotifyListener(conn) as listener:
+        q = listener.subscribe("foo", maxsize=2)
+        for i in range(3):
+            notify(nconn, ("foo", str(i)))
+            # Make sure the notifications arrive in different batches
+            for j in range(20):
+                if q.qsize() == min(i + 1, 2) and (i < 2 or caplog.records):
+                    break
+                time.sleep(0.05)
+
+        # The oldest batch was discarded
+        assert [n.payload for n in get_all(q, 2)] == ["1", "2"]
+        assert "discarded" in caplog.records[0].message
+
+    assert q.get(timeout=1.0) is None
+
+
+def test_maxsize_stop(conn, nconn):
+    conn.autocommit = True
+    listener = NotifyListener(conn)
+    q = listener.subscribe("foo", maxsize=1)
+    listener.start()
+    notify(nconn, ("foo", "1"))
+    time.sleep(0.2)
+
+    # The worker doesn't block on the full queue
+    t0 = time.time()
+    listener.stop()
+    assert time.time() - t0 < 0.5
+    assert q.get_nowait() is None
+
+
+def test_stop_timeout(conn, nconn):
+    conn.autocommit = True
+    listener = NotifyListener(conn)
+    q = listener.subscribe("foo")
+    listener.start()
+    with conn.lock:
+        notify(nconn, ("foo", "1"))
+        time.sleep(0.2)  # the worker waits for the lock
+        t0 = time.time()
+        listener.stop(timeout=0.2)
+        assert 0.1 < time.time() - t0 < 0.5
+
+    assert [n.payload for n in get_all(q, 1)] == ["1"]
+    assert q.get(timeout=1.0) is None
+
+
+def test_notify_handlers(conn, nconn):
+    conn.autocommit = True
+    ns = []
+    conn.add_notify_handler(ns.append)
+    with NotifyListener(conn) as listener:
+        q = listener.subscribe("foo")
+        notify(nconn, ("foo", "1"))
+        assert [n.payload for n in get_all(q, 1)] == ["1"]
+
+    assert [n.payload for n in ns] == ["1"]
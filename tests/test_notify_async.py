@@ -0,0 +1,216 @@
+import time
+import asyncio
+import logging
+
+import pytest
+
+import psycopg3
+from psycopg3 import AsyncNotifyListener
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+async def anconn(dsn):
+    conn = await psycopg3.AsyncConnection.connect(dsn, autocommit=True)
+    yield conn
+    await conn.close()
+
+
+async def notify(conn, *pairs):
+    for channel, payload in pairs:
+        await conn.execute("select pg_notify(%s, %s)", (channel, payload))
+
+
+async def get_all(q, n, timeout=2.0):
+    rv = []
+    while len(rv) < n:
+        batch = await asyncio.wait_for(q.get(), timeout)
+        assert batch is not None
+        rv.extend(batch)
+    return rv
+
+
+async def test_subscribe_channels(aconn, anconn):
+    await aconn.set_autocommit(True)
+    async with AsyncNotifyListener(aconn) as listener:
+        qfoo = await listener.subscribe("foo")
+        qbar = await listener.subscribe("bar", "baz")
+        qall = await listener.subscribe()
+        assert listener.channels == ["bar", "baz", "foo"]
+
+        await notify(
+            anconn, ("foo", "1"), ("bar", "2"), ("baz", "3"), ("qux", "4")
+        )
+
+        ns = await get_all(qfoo, 1)
+        assert [(n.channel, n.payload) for n in ns] == [("foo", "1")]
+        assert ns[0].pid == anconn.pgconn.backend_pid
+        assert isinstance(ns[0], psycopg3.Notify)
+
+        ns = await get_all(qbar, 2)
+        assert [n.payload for n in ns] == ["2", "3"]
+
+        ns = await get_all(qall, 3)
+        assert [n.payload for n in ns] == ["1", "2", "3"]
+
+    for q in (qfoo, qbar, qall):
+        assert await asyncio.wait_for(q.get(), 1.0) is None
+    assert listener.error is None
+
+
+async def test_batch(aconn, anconn):
+    await aconn.set_autocommit(True)
+    async with AsyncNotifyListener(aconn) as listener:
+        q = await listener.subscribe("foo")
+        async with anconn.transaction():
+            for i in range(10):
+                await notify(anconn, ("foo", str(i)))
+
+        batch = await asyncio.wait_for(q.get(), 1.0)
+        assert [n.payload for n in batch] == [str(i) for i in range(10)]
+
+
+async def test_unsubscribe(aconn, anconn):
+    await aconn.set_autocommit(True)
+    async with AsyncNotifyListener(aconn) as listener:
+        q1 = await listener.subscribe("foo")
+        q2 = await listener.subscribe("foo", "bar")
+        await listener.unsubscribe(q2)
+        assert listener.channels == ["foo"]
+        await listener.unsubscribe(q1)
+        assert listener.channels == []
+
+        q3 = await listener.subscribe("bar")
+        await notify(anconn, ("foo", "1"), ("bar", "2"))
+        assert [n.payload for n in await get_all(q3, 1)] == ["2"]
+
+    assert q1.empty()
+    assert q2.empty()
+
+
+async def test_connection_usable(aconn, anconn):
+    await aconn.set_autocommit(True)
+    async with AsyncNotifyListener(aconn) as listener:
+        q = await listener.subscribe("foo")
+        await asyncio.sleep(0.1)
+
+        t0 = time.time()
+        cur = await aconn.execute("select pg_notify('foo', '1'), 42")
+        assert await cur.fetchone() == ("", 42)
+        assert time.time() - t0 < 0.5
+
+        assert [n.payload for n in await get_all(q, 1)] == ["1"]
+
+        # The fd is still watched after the connection used it
+        await notify(anconn, ("foo", "2"))
+        t0 = time.time()
+        assert [n.payload for n in await get_all(q, 1)] == ["2"]
+        assert time.time() - t0 < 0.5
+
+
+async def test_stop_fast(aconn):
+    listener = AsyncNotifyListener(aconn)
+    q = await listener.subscribe("foo")
+    await listener.start()
+    await asyncio.sleep(0.1)
+    t0 = time.time()
+    await listener.stop()
+    assert time.time() - t0 < 0.5
+    assert q.get_nowait() is None
+
+    with pytest.raises(psycopg3.ProgrammingError):
+        await listener.start()
+    with pytest.raises(psycopg3.ProgrammingError):
+        await listener.subscribe("bar")
+
+
+async def test_stop_not_started(aconn):
+    listener = AsyncNotifyListener(aconn)
+    q = await listener.subscribe("foo")
+
+    # A consumer already waiting receives the end marker
+    consumer = asyncio.ensure_future(asyncio.wait_for(q.get(), 2.0))
+    await asyncio.sleep(0.1)
+    await listener.stop()
+    assert await consumer is None
+
+    await listener.stop()
+    assert q.empty()
+    with pytest.raises(psycopg3.ProgrammingError):
+        await listener.start()
+
+
+async def test_connection_closed(aconn):
+    listener = AsyncNotifyListener(aconn)
+    listener.POLL_INTERVAL = 0.1
+    q = await listener.subscribe("foo")
+    await listener.start()
+    await asyncio.sleep(0.1)
+    await aconn.close()
+    assert await asyncio.wait_for(q.get(), 1.0) is None
+    assert isinstance(listener.error, psycopg3.OperationalError)
+    await listener.stop()
+
+
+async def test_maxsize(aconn, anconn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg3")
+    await aconn.set_autocommit(True)
+    async with AsyncNotifyListener(aconn) as listener:
+        q = await listener.subscribe("foo", maxsize=2)
+        for i in range(3):
+            await notify(anconn, ("foo", str(i)))
+            # Make sure the notifications arrive in different batches
+            for j in range(20):
+                if q.qsize() == min(i + 1, 2) and (i < 2 or caplog.records):
+                    break
+                await asyncio.sleep(0.05)
+
+        # The oldest batch was discarded
+        assert [n.payload for n in await get_all(q, 2)] == ["1", "2"]
+        assert "discarded" in caplog.records[0].message
+
+    assert await asyncio.wait_for(q.get(), 1.0) is None
+
+
+async def test_maxsize_stop(aconn, anconn):
+    await aconn.set_autocommit(True)
+    listener = AsyncNotifyListener(aconn)
+    q = await listener.subscribe("foo", maxsize=1)
+    await listener.start()
+    await notify(anconn, ("foo", "1"))
+    await asyncio.sleep(0.2)
+
+    # The worker doesn't block on the full queue
+    t0 = time.time()
+    await listener.stop()
+    assert time.time() - t0 < 0.5
+    assert q.get_nowait() is None
+
+
+async def test_stop_timeout(aconn, anconn):
+    await aconn.set_autocommit(True)
+    listener = AsyncNotifyListener(aconn)
+    q = await listener.subscribe("foo")
+    await listener.start()
+    async with aconn.lock:
+        await notify(anconn, ("foo", "1"))
+        await asyncio.sleep(0.2)  # the worker waits for the lock
+        t0 = time.time()
+        await listener.stop(timeout=0.2)
+        assert 0.1 < time.time() - t0 < 0.5
+
+    assert [n.payload for n in await get_all(q, 1)] == ["1"]
+    assert await asyncio.wait_for(q.get(), 1.0) is None
+
+
+async def test_notify_handlers(aconn, anconn):
+    await aconn.set_autocommit(True)
+    ns = []
+    aconn.add_notify_handler(ns.append)
+    async with AsyncNotifyListener(aconn) as listener:
+        q = await listener.subscribe("foo")
+        await notify(anconn, ("foo", "1"))
+        assert [n.payload for n in await get_all(q, 1)] == ["1"]
+
+    assert [n.payload for n in ns] == ["1"]
@@ -0,0 +1,188 @@
+import pytest
+
+from psycopg3 import errors as e
+from psycopg3.pq import Format
+from psycopg3.parallel import copy_from_parallel, copy_to_parallel
+
+sample_query = "select n, 'data' || n as data from generate_series(1, 1000) n"
+sample_bounds = list(range(100, 1000, 100))
+sample_data = b"".join(b"%d\tdata%d\n" % (n, n) for n in range(1, 1001))
+
+
+@pytest.mark.parametrize("jobs", [1, 3, 20])
+def test_copy_to_ordered(dsn, jobs):
+    blocks = []
+    nrows = copy_to_parallel(
+        dsn, sample_query, "n", sample_bounds, blocks.append, jobs=jobs
+    )
+    assert nrows == 1000
+    assert b"".join(blocks) == sample_data
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_copy_to_unordered(dsn, jobs):
+    blocks = []
+    nrows = copy_to_parallel(
+        dsn,
+        sample_query,
+        "n",
+        sample_bounds,
+        blocks.append,
+        jobs=jobs,
+        ordered=False,
+    )
+    assert nrows == 1000
+    got = b"".join(blocks).splitlines(True)
+    assert sorted(got) == sorted(sample_data.splitlines(True))
+
+
+def test_copy_to_no_bounds(dsn):
+    blocks = []
+    nrows = copy_to_parallel(dsn, sample_query, "n", [], blocks.append)
+    assert nrows == 1000
+    assert b"".join(blocks) == sample_data
+
+
+def test_copy_to_nulls(dsn):
+    blocks = []
+    nrows = copy_to_parallel(
+        dsn,
+        "select nullif(n % 10, 0) as n from generate_series(1, 100) n",
+        "n",
+        [3, 6],
+        blocks.append,
+    )
+    assert nrows == 100
+    assert b"".join(blocks).count(b"\\N\n") == 10
+
+
+def test_copy_to_binary(dsn, conn):
+    blocks = []
+    nrows = copy_to_parallel(
+        dsn,
+        sample_query,
+        "n",
+        sample_bounds,
+        blocks.append,
+        ordered=False,
+        format=Format.BINARY,
+    )
+    assert nrows == 1000
+
+    cur = conn.cursor()
+    cur.execute("create temp table copy_in (n int, data text)")
+    with cur.copy("copy copy_in from stdin (format binary)") as copy:
+        copy.write(b"".join(blocks))
+    cur.execute("select count(*), sum(n) from copy_in")
+    assert cur.fetchone() == (1000, 500500)
+
+
+def test_copy_to_snapshot(dsn, svcconn):
+    svcconn.execute("drop table if exists parallel_test")
+    svcconn.execute("create table parallel_test (n int)")
+    try:
+        svcconn.execute(
+            "insert into parallel_test select generate_series(1, 100)"
+        )
+
+        blocks = []
+
+        def sink(data):
+            # The records inserted after the export started are not seen
+            if not blocks:
+                svcconn.execute("insert into parallel_test values (50)")
+            blocks.append(data)
+
+        nrows = copy_to_parallel(
+            dsn, "select * from parallel_test", "n", [20, 40, 60, 80], sink
+        )
+        assert nrows == 100
+        assert b"".join(blocks).split() == [b"%d" % n for n in range(1, 101)]
+    finally:
+        svcconn.execute("drop table parallel_test")
+
+
+def test_copy_to_error(dsn):
+    with pytest.raises(e.UndefinedColumn):
+        copy_to_parallel(dsn, sample_query, "nosuch", [10], lambda data: None)
+
+
+def test_copy_to_sink_error(dsn):
+    def sink(data):
+        1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        copy_to_parallel(dsn, sample_query, "n", sample_bounds, sink, jobs=3)
+
+
+@pytest.fixture
+def copy_table(svcconn):
+    svcconn.execute("drop table if exists parallel_in")
+    svcconn.execute("create table parallel_in (n int primary key, data text)")
+    yield "parallel_in"
+    svcconn.execute("drop table parallel_in")
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+@pytest.mark.parametrize("batch_size", [1, 7, 2000])
+def test_copy_from_rows(dsn, svcconn, copy_table, jobs, batch_size):
+    nrows = copy_from_parallel(
+        dsn,
+        "copy parallel_in from stdin",
+        ((n, f"data{n}") for n in range(1, 1001)),
+        jobs=jobs,
+        batch_size=batch_size,
+    )
+    assert nrows == 1000
+    cur = svcconn.execute("select count(*), sum(n) from parallel_in")
+    assert cur.fetchone() == (1000, 500500)
+
+
+def test_copy_from_buffers(dsn, svcconn, copy_table):
+    nrows = copy_from_parallel(
+        dsn,
+        "copy parallel_in from stdin",
+        (b"%d\tdata%d\n" % (n, n) for n in range(1, 1001)),
+        batch_size=10,
+    )
+    assert nrows == 1000
+    cur = svcconn.execute("select count(*), sum(n) from parallel_in")
+    assert cur.fetchone() == (1000, 500500)
+
+
+def test_copy_from_binary_types(dsn, svcconn, copy_table):
+    nrows = copy_from_parallel(
+        dsn,
+        "copy parallel_in from stdin (format binary)",
+        ((n, f"data{n}") for n in range(1, 1001)),
+        types=["int4", "text"],
+    )
+    assert nrows == 1000
+    cur = svcconn.execute("select count(*), sum(n) from parallel_in")
+    assert cur.fetchone() == (1000, 500500)
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_copy_from_pg_error(dsn, copy_table, jobs):
+    data = [(n, f"data{n}") for n in range(1, 1001)]
+    data.append((500, "dupe"))
+    with pytest.raises(e.UniqueViolation):
+        copy_from_parallel(
+            dsn, "copy parallel_in from stdin", data, jobs=jobs, batch_size=10
+        )
+
+
+def test_copy_from_data_error(dsn, svcconn, copy_table):
+    def data():
+        for n in range(1, 1001):
+            yield (n, f"data{n}")
+        1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        copy_from_parallel(
+            dsn, "copy parallel_in from stdin", data(), batch_size=10
+        )
+
+    # The connections didn't receive the end of the data: nothing committed
+    cur = svcconn.execute("select count(*) from parallel_in")
+    assert cur.fetchone() == (0,)
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from psycopg3 import errors as e
+from psycopg3.parallel import copy_from_parallel_async, copy_to_parallel_async
+
+from .test_parallel import sample_query, sample_bounds, sample_data
+from .test_parallel import copy_table  # noqa: F401
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize("jobs", [1, 3, 20])
+async def test_copy_to_ordered(dsn, jobs):
+    blocks = []
+    nrows = await copy_to_parallel_async(
+        dsn, sample_query, "n", sample_bounds, blocks.append, jobs=jobs
+    )
+    assert nrows == 1000
+    assert b"".join(blocks) == sample_data
+
+
+async def test_copy_to_unordered(dsn):
+    blocks = []
+    nrows = await copy_to_parallel_async(
+        dsn, sample_query, "n", sample_bounds, blocks.append, ordered=False
+    )
+    assert nrows == 1000
+    got = b"".join(blocks).splitlines(True)
+    assert sorted(got) == sorted(sample_data.splitlines(True))
+
+
+async def test_copy_to_async_sink(dsn):
+    blocks = []
+
+    async def sink(data):
+        await asyncio.sleep(0)
+        blocks.append(data)
+
+    nrows = await copy_to_parallel_async(
+        dsn, sample_query, "n", sample_bounds, sink
+    )
+    assert nrows == 1000
+    assert b"".join(blocks) == sample_data
+
+
+async def test_copy_to_error(dsn):
+    with pytest.raises(e.UndefinedColumn):
+        await copy_to_parallel_async(
+            dsn, sample_query, "nosuch", [10], lambda data: None
+        )
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+async def test_copy_from_rows(dsn, svcconn, copy_table, jobs):  # noqa: F811
+    nrows = await copy_from_parallel_async(
+        dsn,
+        "copy parallel_in from stdin",
+        ((n, f"data{n}") for n in range(1, 1001)),
+        jobs=jobs,
+        batch_size=7,
+    )
+    assert nrows == 1000
+    cur = svcconn.execute("select count(*), sum(n) from parallel_in")
+    assert cur.fetchone() == (1000, 500500)
+
+
+async def test_copy_from_async_iter(dsn, svcconn, copy_table):  # noqa: F811
+    async def data():
+        for n in range(1, 1001):
+            yield (n, f"data{n}")
+
+    nrows = await copy_from_parallel_async(
+        dsn, "copy parallel_in from stdin", data(), batch_size=10
+    )
+    assert nrows == 1000
+    cur = svcconn.execute("select count(*), sum(n) from parallel_in")
+    assert cur.fetchone() == (1000, 500500)
+
+
+async def test_copy_from_data_error(dsn, svcconn, copy_table):  # noqa: F811
+    async def data():
+        for n in range(1, 1001):
+            yield (n, f"data{n}")
+        1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        await copy_from_parallel_async(
+            dsn, "copy parallel_in from stdin", data(), batch_size=10
+        )
+
+    cur = svcconn.execute("select count(*) from parallel_in")
+    assert cur.fetchone() == (0,)
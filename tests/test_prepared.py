@@ -2,11 +2,17 @@
 Prepared statements tests
 """
 
+import logging
 import datetime as dt
 from decimal import Decimal
 
 import pytest
 
+import psycopg3
+from psycopg3 import pq
+from psycopg3 import errors as e
+from psycopg3._preparing import PrepareManager
+
 
 def test_connection_attributes(conn, monkeypatch):
     assert conn.prepare_threshold == 5
@@ -141,7 +147,8 @@ def test_evict_lru(conn):
         conn.execute(f"select {i}")
 
     assert len(conn._prepared._prepared) == 5
-    assert conn._prepared._prepared[b"select 'a'", ()] == b"_pg3_0"
+    name = conn._prepared._prepared[b"select 'a'", ()]
+    assert name.startswith(b"_pg3_") and name.endswith(b"_0")
     for i in [9, 8, 7, 6]:
         assert conn._prepared._prepared[f"select {i}".encode("utf8"), ()] == 1
 
@@ -162,6 +169,8 @@ def test_evict_lru_deallocate(conn):
             f"select {i}".encode("utf8"), ()
         ].startswith(b"_pg3_")
 
+    # The statements evicted are deallocated before the next transaction
+    conn.commit()
     cur = conn.execute(
         "select statement from pg_prepared_statements order by prepare_time",
         prepare=False,
@@ -192,3 +201,546 @@ def test_untyped_json(conn):
 
     cur = conn.execute("select parameter_types from pg_prepared_statements")
     assert cur.fetchall() == [(["jsonb"],)]
+
+
+def test_prepare_query(conn):
+    q = conn.prepare_query("select %t::int, %t::text")
+    assert q.query == b"select $1::int, $2::text"
+    cur1 = conn.cursor()
+    cur2 = conn.cursor()
+    for i in range(3):
+        cur1.execute(q, (i, "a"))
+        assert cur1.fetchone() == (i, "a")
+        cur2.execute(q, [i + 10, "b"])
+        assert cur2.fetchone() == (i + 10, "b")
+
+    assert cur1.params == [b"2", b"a"]
+    assert cur2.params == [b"12", b"b"]
+
+
+def test_prepare_query_cursor_adapters(conn):
+    from psycopg3.types import StringDumper
+
+    class MyStringDumper(StringDumper):
+        def dump(self, obj):
+            return (obj * 2).encode("utf-8")
+
+    q = conn.prepare_query("select %t")
+    cur = conn.cursor()
+    MyStringDumper.register(str, cur)
+    assert cur.execute(q, ["hello"]).fetchone() == ("hellohello",)
+    assert conn.execute(q, ["hello"]).fetchone() == ("hello",)
+
+
+def test_prepare_query_encoding(conn):
+    q = conn.prepare_query("select %s, '\u20ac'")
+    assert conn.execute(q, ["a"]).fetchone() == ("a", "\u20ac")
+    conn.client_encoding = "latin9"
+    assert conn.execute(q, ["b"]).fetchone() == ("b", "\u20ac")
+    assert q.query == "select $1, '\u20ac'".encode("latin9")
+
+
+def test_prepare_query_named(conn):
+    q = conn.prepare_query("select %(a)s::int, %(b)s::int, %(a)s::int")
+    cur = conn.execute(q, {"a": 1, "b": 2})
+    assert cur.fetchone() == (1, 2, 1)
+    cur.executemany(q, [{"a": 3, "b": 4}, {"a": 5, "b": 6}])
+    assert list(cur.stream(q, {"a": 7, "b": 8})) == [(7, 8, 7)]
+
+
+def test_prepare_query_no_params(conn):
+    q = conn.prepare_query("select '%%'")
+    assert conn.execute(q).fetchone() == ("%%",)
+    assert conn.execute(q, ()).fetchone() == ("%",)
+
+
+def test_prepare_query_prepare(conn):
+    q = conn.prepare_query("select %s::int", prepare=True)
+    conn.execute(q, [1])
+    cur = conn.execute("select count(*) from pg_prepared_statements")
+    assert cur.fetchone() == (1,)
+
+    q = conn.prepare_query("select %s::text", prepare=True)
+    conn.execute(q, ["a"], prepare=False)
+    cur = conn.execute("select count(*) from pg_prepared_statements")
+    assert cur.fetchone() == (1,)
+
+
+def test_prepare_query_bad(conn, dsn):
+    with pytest.raises(conn.ProgrammingError):
+        conn.prepare_query("select %x")
+
+    q = conn.prepare_query("select %s")
+    with pytest.raises(conn.ProgrammingError):
+        conn.execute(q, (1, 2))
+
+    conn2 = conn.connect(dsn)
+    with pytest.raises(conn.ProgrammingError):
+        conn2.execute(q, [1])
+    conn2.close()
+
+
+@pytest.mark.libpq(">= 14")
+def test_deallocate_deferred(conn):
+    conn.autocommit = True
+    conn.prepared_max = 1
+    conn.prepare_threshold = 0
+    conn.execute("select %s::int", [1])
+    conn.execute("select %s::text", ["a"])
+    assert conn._prepared._maint_commands
+
+    # Deallocation sent in the same round trip of the query
+    cur = conn.execute(
+        "select count(*) from pg_prepared_statements where %s",
+        [True],
+        prepare=False,
+    )
+    assert not conn._prepared._maint_commands
+    assert cur.fetchone() == (1,)
+
+
+def test_deallocate_simple_query(conn):
+    conn.autocommit = True
+    conn.prepared_max = 1
+    conn.prepare_threshold = 0
+    conn.execute("select %s::int", [1])
+    conn.execute("select %s::text", ["a"])
+    cur = conn.execute(
+        "select count(*) from pg_prepared_statements", prepare=False
+    )
+    assert cur.fetchone() == (1,)
+    assert not conn._prepared._maint_commands
+
+
+@pytest.mark.libpq(">= 14")
+def test_deallocate_failed_transaction(conn):
+    conn.prepared_max = 1
+    conn.prepare_threshold = 0
+    conn.execute("select %s::int", [1])
+    conn.execute("select %s::text", ["a"])
+    conn.pgconn.exec_(b"select 1/0")
+    with pytest.raises(e.InFailedSqlTransaction):
+        conn.execute("select %s::int", [1], prepare=False)
+    assert conn._prepared._maint_commands
+
+    conn.rollback()
+    cur = conn.execute(
+        "select count(*) from pg_prepared_statements where %s",
+        [True],
+        prepare=False,
+    )
+    assert cur.fetchone() == (1,)
+    assert not conn._prepared._maint_commands
+
+
+def test_deallocate_missing(conn):
+    conn.autocommit = True
+    conn.prepared_max = 1
+    conn.prepare_threshold = 0
+    conn.execute("select %s::int", [1])
+    conn.execute("select %s::text", ["a"])
+    conn.execute("deallocate all")
+    # The statement evicted doesn't exist anymore: nothing to do
+    assert conn.execute("select %s::int", [1], prepare=False).fetchone() == (
+        1,
+    )
+    assert not conn._prepared._maint_commands
+
+
+def test_deallocate_missing_transaction(conn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg3")
+    conn.prepared_max = 1
+    conn.prepare_threshold = 0
+    conn.execute("select %s::int", [1])
+    conn.execute("select %s::text", ["a"])
+    conn.execute("deallocate all")
+    # The deallocation is not run in the transaction, which is not broken
+    cur = conn.execute("select %s::int", [1], prepare=False)
+    assert cur.fetchone() == (1,)
+    assert conn._prepared._maint_commands
+
+    conn.commit()
+    assert conn.execute("select %s::int", [1]).fetchone() == (1,)
+    assert not [r for r in caplog.records if r.name == "psycopg3.cursor"]
+
+
+def test_deallocate_transaction(conn):
+    conn.prepared_max = 1
+    conn.prepare_threshold = 0
+    conn.execute("select %s::int", [1])
+    conn.execute("select %s::text", ["a"])
+    cur = conn.execute(
+        "select count(*) from pg_prepared_statements", prepare=False
+    )
+    assert cur.fetchone() == (2,)
+    assert conn._prepared._maint_commands
+
+    # Deallocated before starting the next transaction
+    conn.commit()
+    cur = conn.execute(
+        "select count(*) from pg_prepared_statements", prepare=False
+    )
+    assert cur.fetchone() == (1,)
+    assert not conn._prepared._maint_commands
+
+
+def test_deallocate_error_logged(conn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg3")
+    conn.autocommit = True
+    conn._prepared.push_maintenance_commands([b"deallocate 42"])
+    cur = conn.execute("select %s::int", [1], prepare=False)
+    assert cur.fetchone() == (1,)
+    assert not conn._prepared._maint_commands
+    (rec,) = [r for r in caplog.records if r.name == "psycopg3.cursor"]
+    assert "syntax error" in rec.getMessage()
+
+
+@pytest.mark.libpq(">= 14")
+def test_pipeline_error_send(conn, monkeypatch):
+    conn.autocommit = True
+
+    def send_query_prepared(self, name, pgq):
+        raise ZeroDivisionError()
+
+    with monkeypatch.context() as m:
+        m.setattr(
+            psycopg3.cursor.BaseCursor,
+            "_send_query_prepared",
+            send_query_prepared,
+        )
+        with pytest.raises(ZeroDivisionError):
+            conn.execute("select %s::int", [1], prepare=True)
+
+    assert conn.pgconn.pipeline_status == pq.PipelineStatus.OFF
+    assert conn.execute("select %s::int", [2]).fetchone() == (2,)
+
+
+@pytest.mark.libpq(">= 14")
+def test_pipeline_error_fetch(conn, monkeypatch):
+    conn.autocommit = True
+    conn.prepared_max = 1
+    conn.prepare_threshold = 0
+    conn.execute("select %s::int", [1])
+    conn.execute("select %s::text", ["a"])
+    assert conn._prepared._maint_commands
+
+    orig_execute = psycopg3.cursor.execute
+
+    def execute(pgconn):
+        yield from orig_execute(pgconn)
+        raise ZeroDivisionError()
+
+    with monkeypatch.context() as m:
+        m.setattr(psycopg3.cursor, "execute", execute)
+        with pytest.raises(ZeroDivisionError):
+            conn.execute("select %s::bool", [True])
+
+    assert conn.pgconn.pipeline_status == pq.PipelineStatus.OFF
+    cur = conn.execute(
+        "select statement from pg_prepared_statements order by prepare_time",
+        prepare=False,
+    )
+    assert cur.fetchall() == [("select $1::text",), ("select $1::bool",)]
+
+
+def test_prepare_error(conn):
+    conn.autocommit = True
+    with pytest.raises(e.UndefinedTable):
+        conn.execute(
+            "select * from nosuchtable where x = %s", [1], prepare=True
+        )
+    assert conn.execute("select %s::int", [1], prepare=True).fetchone() == (1,)
+
+
+def test_invalidated_retry(conn):
+    conn.autocommit = True
+    conn.execute("create temp table tinv (a int)")
+    conn.execute("insert into tinv values (1)")
+    cur = conn.execute("select * from tinv where 1 = %s", [1], prepare=True)
+    assert cur.fetchone() == (1,)
+
+    conn.execute("alter table tinv add b int default 2")
+    cur = conn.execute("select * from tinv where 1 = %s", [1])
+    assert cur.fetchone() == (1, 2)
+
+    cur = conn.execute("select count(*) from pg_prepared_statements")
+    assert cur.fetchone() == (1,)
+
+
+def test_invalidated_transaction(conn):
+    conn.execute("create table tinv (a int)")
+    conn.execute("insert into tinv values (1)")
+    conn.commit()
+    try:
+        conn.execute("select * from tinv where 1 = %s", [1], prepare=True)
+        conn.execute("alter table tinv add b int default 2")
+        conn.commit()
+        with pytest.raises(e.FeatureNotSupported):
+            conn.execute("select * from tinv where 1 = %s", [1])
+        conn.rollback()
+
+        cur = conn.execute("select * from tinv where 1 = %s", [1])
+        assert cur.fetchone() == (1, 2)
+        cur = conn.execute(
+            "select count(*) from pg_prepared_statements", prepare=False
+        )
+        assert cur.fetchone() == (1,)
+    finally:
+        conn.rollback()
+        conn.execute("drop table tinv")
+        conn.commit()
+
+
+def test_invalidated_transaction_info(conn):
+    conn.execute("create table tinv (a int)")
+    conn.commit()
+    try:
+        conn.execute("select * from tinv where 1 = %s", [1], prepare=True)
+        conn.execute("alter table tinv add b int default 2")
+        conn.commit()
+        with pytest.raises(e.FeatureNotSupported):
+            conn.execute("select * from tinv where 1 = %s", [1])
+        info = conn.prepared_info()
+        assert info.hits == 0
+        assert info.prepares == 1
+    finally:
+        conn.rollback()
+        conn.execute("drop table tinv")
+        conn.commit()
+
+
+def test_feature_not_supported_not_reprepared(conn):
+    conn.autocommit = True
+    conn.prepare_threshold = 0
+    conn.execute("select %s::text::numeric::int", ["1"])
+    with pytest.raises(e.FeatureNotSupported):
+        conn.execute("select %s::text::numeric::int", ["NaN"])
+    assert not conn._prepared._maint_commands
+
+    info = conn.prepared_info()
+    assert info.hits == 1
+    assert info.prepares == 1
+    cur = conn.execute(
+        "select count(*) from pg_prepared_statements", prepare=False
+    )
+    assert cur.fetchone() == (1,)
+
+
+def test_missing_retry(conn):
+    # What happens behind a pooler, if the session changes server connection
+    conn.autocommit = True
+    cur = conn.execute("select %s::int", [1], prepare=True)
+    (name,) = conn._prepared._prepared.values()
+    assert isinstance(name, bytes)
+    conn.execute("deallocate all")
+
+    cur = conn.execute("select %s::int", [2])
+    assert cur.fetchone() == (2,)
+    # The statement was prepared again with the same name
+    names = [v for v in conn._prepared._prepared.values() if v == name]
+    assert names == [name]
+    cur = conn.execute(
+        "select name from pg_prepared_statements", prepare=False
+    )
+    assert cur.fetchone() == (name.decode(),)
+    assert not conn._prepared._maint_commands
+
+
+def test_missing_transaction(conn):
+    conn.execute("select %s::int", [1], prepare=True)
+    conn.commit()
+    conn.execute("deallocate all")
+    with pytest.raises(e.InvalidSqlStatementName):
+        conn.execute("select %s::int", [1])
+    conn.rollback()
+    assert conn.execute("select %s::int", [1]).fetchone() == (1,)
+
+
+def test_names_unique(conn, dsn):
+    conn.execute("select 1", prepare=True)
+    with psycopg3.connect(dsn) as conn2:
+        conn2.execute("select 1", prepare=True)
+        (name1,) = conn._prepared._prepared.values()
+        (name2,) = conn2._prepared._prepared.values()
+        assert name1 != name2
+
+
+def test_missing_shared_session(conn, dsn):
+    # Behind a pooler, the session may be served by a server connection where
+    # a different client has prepared its statements.
+    conn.autocommit = True
+    with psycopg3.connect(dsn, autocommit=True) as conn2:
+        conn.execute("select %s::int", [1], prepare=True)
+        conn2.execute("select %s::int + 10", [1], prepare=True)
+
+        # The first client is now served by the second server connection
+        conn2._prepared = conn._prepared
+        cur = conn2.execute("select %s::int", [2])
+        assert cur.fetchone() == (2,)
+        cur = conn2.execute("select %s::int + 10", [2], prepare=False)
+        assert cur.fetchone() == (12,)
+
+
+def test_missing_retry_duplicate(conn, monkeypatch):
+    # Behind a pooler, the statement may be prepared again on a server
+    # connection different from the one where it was found missing, which
+    # may have it already.
+    conn.autocommit = True
+    conn.execute("select %s::int", [1], prepare=True)
+    conn.execute("deallocate all")
+
+    reprepare = PrepareManager.reprepare
+
+    def reprepare_elsewhere(self, query, results):
+        name = reprepare(self, query, results)
+        conn.pgconn.prepare(name, query.query, query.types)
+        return name
+
+    monkeypatch.setattr(PrepareManager, "reprepare", reprepare_elsewhere)
+    assert conn.execute("select %s::int", [2]).fetchone() == (2,)
+    monkeypatch.undo()
+    assert conn.execute("select %s::int", [3]).fetchone() == (3,)
+    assert conn.prepared_info().currsize == 1
+
+
+def test_prepare_duplicate_transaction(conn):
+    conn.execute("select %s::int", [1], prepare=True)
+    (name,) = conn._prepared._prepared.values()
+    conn._prepared.clear()
+    conn._prepared._new_name = lambda: name
+    with pytest.raises(e.DuplicatePreparedStatement):
+        conn.execute("select %s::int", [1], prepare=True)
+
+
+@pytest.mark.libpq(">= 14")
+def test_prepare_duplicate(conn):
+    conn.autocommit = True
+    conn.execute("select %s::int", [1], prepare=True)
+    (name,) = conn._prepared._prepared.values()
+    conn._prepared.clear()
+
+    # The name is used already: the statement is prepared with a new name
+    new_name = conn._prepared._new_name
+    names = iter([name])
+    conn._prepared._new_name = lambda: next(names, None) or new_name()
+    cur = conn.execute("select %s::int", [2], prepare=True)
+    assert cur.fetchone() == (2,)
+    (name2,) = conn._prepared._prepared.values()
+    assert name2 != name
+    cur = conn.execute("select %s::int", [3])
+    assert cur.fetchone() == (3,)
+    assert conn.prepared_info().hits == 1
+
+
+@pytest.mark.libpq(">= 14")
+def test_prepare_single_sync(conn, monkeypatch):
+    # Behind a pooler in transaction mode, each sync block can be served by a
+    # different server connection: a statement must be prepared in the same
+    # block where it is executed.
+    conn.autocommit = True
+    syncs = []
+    fetch = psycopg3.generators.fetch
+
+    def fetch_sync(pgconn):
+        res = yield from fetch(pgconn)
+        if res and res.status == pq.ExecStatus.PIPELINE_SYNC:
+            syncs.append(res)
+        return res
+
+    monkeypatch.setattr(psycopg3.generators, "fetch", fetch_sync)
+    cur = conn.execute("select %s::int", [1], prepare=True)
+    assert cur.fetchone() == (1,)
+    assert len(syncs) == 1
+
+
+def test_clear_prepared(conn):
+    conn.prepare_threshold = 0
+    for i in range(3):
+        conn.execute(f"select {i}")
+    cur = conn.execute("select count(*) from pg_prepared_statements")
+    assert cur.fetchone() == (4,)
+
+    conn.clear_prepared()
+    assert not conn._prepared._prepared
+    cur = conn.execute(
+        "select count(*) from pg_prepared_statements", prepare=False
+    )
+    assert cur.fetchone() == (0,)
+
+    # The statements are prepared again
+    conn.execute("select 1")
+    cur = conn.execute(
+        "select count(*) from pg_prepared_statements", prepare=False
+    )
+    assert cur.fetchone() == (1,)
+
+
+def test_prepared_info(conn):
+    conn.prepare_threshold = 2
+    for i in range(5):
+        conn.execute("select %s::int", [i])
+    conn.execute("select 1", prepare=False)
+
+    info = conn.prepared_info()
+    assert info.misses == 2
+    assert info.prepares == 1
+    assert info.hits == 2
+    assert info.evictions == info.deallocations == 0
+    assert info.maxsize == 100
+    assert info.currsize == 1
+    assert info.time_saved >= 0.0
+
+
+def test_prepared_info_evict(conn):
+    conn.autocommit = True
+    conn.prepared_max = 1
+    conn.prepare_threshold = 0
+    conn.execute("select %s::int", [1])
+    conn.execute("select %s::text", ["a"])
+    conn.execute("select %s::int", [1])
+    conn.execute("select 1", prepare=False)
+
+    info = conn.prepared_info()
+    assert info.prepares == 3
+    assert info.evictions == 2
+    assert info.deallocations == 2
+    assert info.currsize == 1
+
+    conn.clear_prepared()
+    info = conn.prepared_info()
+    assert info.deallocations == 3
+    assert info.currsize == 0
+
+
+def test_prepared_statements(conn):
+    conn.prepare_threshold = 1
+    assert conn.prepared_statements() == []
+    for i in range(3):
+        conn.execute("select %s::int", [i])
+    conn.execute("select %s::text", ["a"], prepare=True)
+    conn.execute("select 1")
+
+    stmts = conn.prepared_statements()
+    assert [s.query for s in stmts] == [b"select $1::int", b"select $1::text"]
+    assert stmts[0].executions == 1
+    assert stmts[1].executions == 0
+    assert len(stmts[0].types) == len(stmts[1].types) == 1
+
+    cur = conn.execute(
+        "select name from pg_prepared_statements order by prepare_time",
+        prepare=False,
+    )
+    assert [s.name for s in stmts] == [r[0] for r in cur]
+
+
+def test_time_saved():
+    from psycopg3._preparing import StatementStats
+
+    stats = StatementStats()
+    assert stats.time_saved == 0.0
+    stats.executions, stats.time = 2, 2.0
+    assert stats.time_saved == 0.0
+    stats.prepared_executions, stats.prepared_time = 3, 1.5
+    assert stats.time_saved == pytest.approx(1.5)
+    stats.prepared_time = 6.0
+    assert stats.time_saved == 0.0
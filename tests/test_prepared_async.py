@@ -7,6 +7,8 @@ from decimal import Decimal
 
 import pytest
 
+import psycopg3
+
 pytestmark = pytest.mark.asyncio
 
 
@@ -149,7 +151,8 @@ async def test_evict_lru(aconn):
         await aconn.execute(f"select {i}")
 
     assert len(aconn._prepared._prepared) == 5
-    assert aconn._prepared._prepared[b"select 'a'", ()] == b"_pg3_0"
+    name = aconn._prepared._prepared[b"select 'a'", ()]
+    assert name.startswith(b"_pg3_") and name.endswith(b"_0")
     for i in [9, 8, 7, 6]:
         assert aconn._prepared._prepared[f"select {i}".encode("utf8"), ()] == 1
 
@@ -170,6 +173,8 @@ async def test_evict_lru_deallocate(aconn):
             f"select {i}".encode("utf8"), ()
         ].startswith(b"_pg3_")
 
+    # The statements evicted are deallocated before the next transaction
+    await aconn.commit()
     cur = await aconn.execute(
         "select statement from pg_prepared_statements order by prepare_time",
         prepare=False,
@@ -203,3 +208,88 @@ async def test_untyped_json(aconn):
         "select parameter_types from pg_prepared_statements"
     )
     assert await cur.fetchall() == [(["jsonb"],)]
+
+
+async def test_prepare_query(aconn):
+    q = aconn.prepare_query("select %t::int, %t::text")
+    cur1 = await aconn.cursor()
+    cur2 = await aconn.cursor()
+    for i in range(3):
+        await cur1.execute(q, (i, "a"))
+        assert await cur1.fetchone() == (i, "a")
+        await cur2.execute(q, [i + 10, "b"])
+        assert await cur2.fetchone() == (i + 10, "b")
+
+    assert cur1.params == [b"2", b"a"]
+    assert cur2.params == [b"12", b"b"]
+
+
+async def test_prepare_query_prepare(aconn):
+    q = aconn.prepare_query("select %s::int", prepare=True)
+    await aconn.execute(q, [1])
+    cur = await aconn.execute("select count(*) from pg_prepared_statements")
+    assert await cur.fetchone() == (1,)
+
+
+async def test_invalidated_retry(aconn):
+    await aconn.set_autocommit(True)
+    await aconn.execute("create temp table tinv (a int)")
+    await aconn.execute("insert into tinv values (1)")
+    await aconn.execute("select * from tinv where 1 = %s", [1], prepare=True)
+
+    await aconn.execute("alter table tinv add b int default 2")
+    cur = await aconn.execute("select * from tinv where 1 = %s", [1])
+    assert await cur.fetchone() == (1, 2)
+
+
+async def test_missing_retry(aconn):
+    await aconn.set_autocommit(True)
+    await aconn.execute("select %s::int", [1], prepare=True)
+    await aconn.execute("deallocate all")
+    cur = await aconn.execute("select %s::int", [2])
+    assert await cur.fetchone() == (2,)
+    cur = await aconn.execute(
+        "select count(*) from pg_prepared_statements", prepare=False
+    )
+    assert await cur.fetchone() == (1,)
+
+
+async def test_missing_shared_session(aconn, dsn):
+    await aconn.set_autocommit(True)
+    aconn2 = await psycopg3.AsyncConnection.connect(dsn, autocommit=True)
+    try:
+        await aconn.execute("select %s::int", [1], prepare=True)
+        await aconn2.execute("select %s::int + 10", [1], prepare=True)
+
+        aconn2._prepared = aconn._prepared
+        cur = await aconn2.execute("select %s::int", [2])
+        assert await cur.fetchone() == (2,)
+        cur = await aconn2.execute("select %s::int + 10", [2], prepare=False)
+        assert await cur.fetchone() == (12,)
+    finally:
+        await aconn2.close()
+
+
+async def test_clear_prepared(aconn):
+    aconn.prepare_threshold = 0
+    for i in range(3):
+        await aconn.execute(f"select {i}")
+
+    await aconn.clear_prepared()
+    cur = await aconn.execute(
+        "select count(*) from pg_prepared_statements", prepare=False
+    )
+    assert await cur.fetchone() == (0,)
+
+
+async def test_prepared_info(aconn):
+    aconn.prepare_threshold = 1
+    for i in range(3):
+        await aconn.execute("select %s::int", [i])
+
+    info = aconn.prepared_info()
+    assert (info.misses, info.prepares, info.hits) == (1, 1, 1)
+    assert info.currsize == 1
+    (stmt,) = aconn.prepared_statements()
+    assert stmt.query == b"select $1::int"
+    assert stmt.executions == 1
@@ -3,7 +3,13 @@ import pytest
 import psycopg3
 from psycopg3 import pq
 from psycopg3.adapt import Transformer, Format
-from psycopg3._queries import PostgresQuery, _split_query
+from psycopg3._queries import PostgresQuery, QueryCache
+from psycopg3._queries import _split_query, split_query
+
+# Test both the Python implementation and the one in use (maybe C)
+splitters = pytest.mark.parametrize(
+    "split", [_split_query, split_query], ids=["python", "impl"]
+)
 
 
 @pytest.mark.parametrize(
@@ -41,10 +47,18 @@ from psycopg3._queries import PostgresQuery, _split_query
                 (b" baz", 0, Format.AUTO),
             ],
         ),
+        (b"foo %\n bar", [(b"foo %\n bar", 0, Format.AUTO)]),
+        (b"foo %", [(b"foo %", 0, Format.AUTO)]),
+        (
+            b"%(a)s%(b)t",
+            [(b"", "a", Format.AUTO), (b"", "b", Format.TEXT)]
+            + [(b"", 0, Format.AUTO)],
+        ),
     ],
 )
-def test_split_query(input, want):
-    assert _split_query(input) == want
+@splitters
+def test_split_query(split, input, want):
+    assert split(input) == want
 
 
 @pytest.mark.parametrize(
@@ -58,11 +72,70 @@ def test_split_query(input, want):
         b"foo %(foo) bar",
         b"foo %(foo bar",
         b"3%2",
+        b"foo %()s bar",
+        b"foo %(foo)\n bar",
+        b"foo %(",
+        b"%s %(foo)s",
     ],
 )
-def test_split_query_bad(input):
-    with pytest.raises(psycopg3.ProgrammingError):
+@splitters
+def test_split_query_bad(split, input):
+    with pytest.raises(psycopg3.ProgrammingError) as excinfo:
+        split(input)
+
+    # The implementations report the same error
+    with pytest.raises(psycopg3.ProgrammingError) as pyexcinfo:
         _split_query(input)
+    assert str(excinfo.value) == str(pyexcinfo.value)
+
+
+def test_query_cache():
+    cache = QueryCache(maxsize=2)
+    rv = cache.get(b"select %s", "utf8")
+    assert rv[0] == b"select $1"
+    assert cache.get(b"select %s", "utf8") is rv
+    assert cache.info() == (1, 1, 2, 1)
+
+    cache.get(b"select %s, %s", "utf8")
+    cache.get(b"select %s", "utf8")
+    cache.get(b"select %s, %s, %s", "utf8")
+    assert cache.info() == (2, 3, 2, 2)
+
+    # The least recently used was dropped
+    cache.get(b"select %s", "utf8")
+    assert cache.info().hits == 3
+    cache.get(b"select %s, %s", "utf8")
+    assert cache.info().misses == 4
+
+
+def test_query_cache_error():
+    cache = QueryCache()
+    for i in range(2):
+        with pytest.raises(psycopg3.ProgrammingError):
+            cache.get(b"select %x", "utf8")
+    assert cache.info() == (0, 2, 128, 0)
+
+
+def test_query_cache_maxsize():
+    cache = QueryCache(maxsize=3)
+    for i in range(3):
+        cache.get(b"select %%s + %d" % i, "utf8")
+    assert cache.info().currsize == 3
+
+    cache.maxsize = 1
+    assert cache.info().currsize == 1
+    cache.get(b"select %s + 2", "utf8")
+    assert cache.info().hits == 1
+
+    cache.maxsize = 0
+    cache.get(b"select %s + 2", "utf8")
+    assert cache.info() == (1, 4, 0, 0)
+
+    with pytest.raises(ValueError):
+        cache.maxsize = -1
+
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 0)
 
 
 @pytest.mark.parametrize(
@@ -1,4 +1,5 @@
 import select
+import asyncio
 
 import pytest
 
@@ -105,3 +106,16 @@ async def test_wait_async_bad(pgconn):
     pgconn.finish()
     with pytest.raises(psycopg3.OperationalError):
         await waiting.wait_async(gen, socket)
+
+
+@pytest.mark.asyncio
+async def test_wait_async_unregisters(pgconn):
+    loop = asyncio.get_event_loop()
+    for i in range(3):
+        pgconn.send_query(b"select %d" % i)
+        gen = generators.execute(pgconn)
+        (res,) = await waiting.wait_async(gen, pgconn.socket)
+        assert res.get_value(0, 0) == b"%d" % i
+
+    assert not loop.remove_reader(pgconn.socket)
+    assert not loop.remove_writer(pgconn.socket)
@@ -0,0 +1,151 @@
+import pytest
+
+import psycopg3
+from psycopg3 import pq
+from psycopg3.oids import builtins
+from psycopg3.types import CompositeInfo, EnumInfo, RangeInfo
+from psycopg3.types.database import DatabaseTypes, DomainInfo
+
+
+@pytest.fixture(scope="session")
+def testtypes(svcconn):
+    cur = svcconn.cursor()
+    cur.execute(
+        """
+        create schema if not exists testschema;
+
+        drop type if exists testdbcomp cascade;
+        drop type if exists testschema.testdbcomp cascade;
+        drop type if exists testdbenum cascade;
+        drop type if exists testdbrange cascade;
+        drop domain if exists testdbdom cascade;
+        drop table if exists testdbtable cascade;
+
+        create type testdbcomp as (foo text, bar int8);
+        create type testschema.testdbcomp as (foo text, qux bool);
+        create type testdbenum as enum ('foo', 'bar');
+        create type testdbrange as range (subtype = float8);
+        create domain testdbdom as int4 check (value > 0);
+        create domain testdbdom2 as testdbdom;
+        create table testdbtable (foo text);
+        """
+    )
+
+
+def test_fetch(conn, testtypes):
+    types = DatabaseTypes.fetch(conn, refresh=True)
+    cur = conn.cursor()
+
+    info = types["testdbcomp"]
+    assert isinstance(info, CompositeInfo)
+    cur.execute(
+        "select 'testdbcomp'::regtype::oid, 'testdbcomp[]'::regtype::oid"
+    )
+    assert (info.oid, info.array_oid) == cur.fetchone()
+    assert [f.name for f in info.fields] == ["foo", "bar"]
+    assert [f.type_oid for f in info.fields] == [
+        builtins["text"].oid,
+        builtins["int8"].oid,
+    ]
+
+    info = types["testschema.testdbcomp"]
+    assert isinstance(info, CompositeInfo)
+    assert info.name == "testdbcomp"
+    assert [f.name for f in info.fields] == ["foo", "qux"]
+
+    info = types["testdbrange"]
+    assert isinstance(info, RangeInfo)
+    assert info.range_subtype == builtins["float8"].oid
+
+    info = types["testdbenum"]
+    assert isinstance(info, EnumInfo)
+    cur.execute("select 'testdbenum'::regtype::oid")
+    assert info.oid == cur.fetchone()[0]
+    assert info.labels == ["foo", "bar"]
+    assert types["testdbenum[]"] is info
+
+    info = types["testdbdom2"]
+    assert isinstance(info, DomainInfo)
+    assert info.base_oid == types["testdbdom"].oid
+
+    # The row types of the tables are not read
+    assert types.get("testdbtable") is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_async(aconn, testtypes):
+    types = await DatabaseTypes.fetch_async(aconn, refresh=True)
+    info = types["testdbcomp"]
+    assert isinstance(info, CompositeInfo)
+    assert [f.name for f in info.fields] == ["foo", "bar"]
+    assert isinstance(types["testdbdom"], DomainInfo)
+
+
+def test_fetch_cached(conn, dsn, testtypes):
+    types = DatabaseTypes.fetch(conn, refresh=True)
+    assert DatabaseTypes.fetch(conn) is types
+    assert DatabaseTypes.cached(conn) is types
+
+    with psycopg3.connect(dsn) as conn2:
+        assert DatabaseTypes.fetch(conn2) is types
+        types2 = DatabaseTypes.fetch(conn2, refresh=True)
+
+    assert types2 is not types
+    assert DatabaseTypes.fetch(conn) is types2
+
+
+def test_get_oid(conn, testtypes):
+    types = DatabaseTypes.fetch(conn, refresh=True)
+    assert types.get_oid("testdbcomp") == types["testdbcomp"].oid
+    assert types.get_oid("testdbdom") == builtins["int4"].oid
+    assert types.get_oid("testdbdom2") == builtins["int4"].oid
+    assert types.get_oid("testdbdom2[]") == types["testdbdom2"].array_oid
+    with pytest.raises(KeyError):
+        types.get_oid("nosuchtype")
+
+
+@pytest.mark.parametrize("fmt_out", [pq.Format.TEXT, pq.Format.BINARY])
+def test_register(conn, testtypes, fmt_out):
+    types = DatabaseTypes.fetch(conn, refresh=True)
+    for name in ["testdbcomp", "testdbdom2", "testdbenum", "testdbrange"]:
+        types.register(name, conn)
+
+    cur = conn.cursor(binary=fmt_out)
+    cur.execute(
+        """
+        select row('hello', 10)::testdbcomp,
+            array[1, 2]::testdbdom2[],
+            array['foo', 'bar']::testdbenum[]
+        """
+    )
+    comp, doms, enums = cur.fetchone()
+    assert (comp.foo, comp.bar) == ("hello", 10)
+    assert doms == [1, 2]
+    assert [m.name for m in enums] == ["foo", "bar"]
+
+    if fmt_out == pq.Format.TEXT:
+        cur.execute("select '[1.5, 2)'::testdbrange")
+        rng = cur.fetchone()[0]
+        assert (rng.lower, rng.upper) == (1.5, 2.0)
+
+
+def test_copy_set_types(conn, testtypes):
+    DatabaseTypes.fetch(conn, refresh=True)
+    cur = conn.cursor()
+    cur.execute("create temp table testcopy (id testdbdom, data testdbenum)")
+
+    with cur.copy("copy testcopy (id) from stdin (format binary)") as copy:
+        copy.set_types(["testdbdom"])
+        copy.write_row([10])
+
+    with cur.copy("copy testcopy to stdout") as copy:
+        copy.set_types(["testdbdom", "testdbenum"])
+        assert list(copy.rows()) == [(10, None)]
+
+
+def test_copy_set_types_unknown(conn):
+    cur = conn.cursor()
+    with cur.copy("copy (select 1) to stdout") as copy:
+        with pytest.raises(KeyError):
+            copy.set_types(["nosuchtype"])
+        list(copy)
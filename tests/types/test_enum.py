@@ -0,0 +1,105 @@
+from enum import Enum
+
+import pytest
+
+from psycopg3 import pq
+from psycopg3 import errors as e
+from psycopg3.sql import Identifier
+from psycopg3.adapt import Format
+from psycopg3.types import EnumInfo
+
+
+class Mood(Enum):
+    sad = 1
+    ok = 2
+    happy = 3
+
+
+@pytest.fixture(scope="session")
+def testenum(svcconn):
+    cur = svcconn.cursor()
+    cur.execute(
+        """
+        create schema if not exists testschema;
+
+        drop type if exists testmood cascade;
+        drop type if exists testschema.testmood cascade;
+
+        create type testmood as enum ('sad', 'ok', 'happy');
+        create type testschema.testmood as enum ('meh');
+        """
+    )
+
+
+fetch_cases = [
+    ("testmood", ["sad", "ok", "happy"]),
+    ("testschema.testmood", ["meh"]),
+    (Identifier("testmood"), ["sad", "ok", "happy"]),
+    (Identifier("testschema", "testmood"), ["meh"]),
+]
+
+
+@pytest.mark.parametrize("name, labels", fetch_cases)
+def test_fetch_info(conn, testenum, name, labels):
+    info = EnumInfo.fetch(conn, name)
+    assert info.name == "testmood"
+    assert info.oid > 0
+    assert info.oid != info.array_oid > 0
+    assert info.labels == labels
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name, labels", fetch_cases)
+async def test_fetch_info_async(aconn, testenum, name, labels):
+    info = await EnumInfo.fetch_async(aconn, name)
+    assert info.name == "testmood"
+    assert info.oid > 0
+    assert info.oid != info.array_oid > 0
+    assert info.labels == labels
+
+
+@pytest.mark.parametrize("fmt_out", [pq.Format.TEXT, pq.Format.BINARY])
+def test_load_enum(conn, testenum, fmt_out):
+    info = EnumInfo.fetch(conn, "testmood")
+    enum = info.register(conn)
+    assert enum.__name__ == "testmood"
+    assert [m.name for m in enum] == ["sad", "ok", "happy"]
+
+    cur = conn.cursor(binary=fmt_out)
+    cur.execute("select 'ok'::testmood, '{happy,sad}'::testmood[]")
+    assert cur.fetchone() == (enum.ok, [enum.happy, enum.sad])
+
+
+@pytest.mark.parametrize("fmt_in", [Format.AUTO, Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("fmt_out", [pq.Format.TEXT, pq.Format.BINARY])
+def test_roundtrip_python_enum(conn, testenum, fmt_in, fmt_out):
+    info = EnumInfo.fetch(conn, "testmood")
+    assert info.register(conn, enum=Mood) is Mood
+
+    cur = conn.cursor(binary=fmt_out)
+    cur.execute(f"select %{fmt_in}, %{fmt_in}::text", [Mood.happy, Mood.sad])
+    assert cur.fetchone() == (Mood.happy, "sad")
+    assert cur.description[0].type_code == info.oid
+
+
+def test_register_scope(conn, testenum):
+    info = EnumInfo.fetch(conn, "testmood")
+    cur = conn.cursor()
+    info.register(cur, enum=Mood)
+    assert cur.execute("select 'ok'::testmood").fetchone()[0] is Mood.ok
+    assert conn.execute("select 'ok'::testmood").fetchone()[0] == "ok"
+
+
+def test_register_missing_members(conn, testenum):
+    info = EnumInfo.fetch(conn, "testschema.testmood")
+    with pytest.raises(e.ProgrammingError):
+        info.register(conn, enum=Mood)
+
+
+def test_load_unknown_label(conn, testenum):
+    info = EnumInfo.fetch(conn, "testmood")
+    info.labels.remove("happy")
+    info.register(conn)
+    assert conn.execute("select 'ok'::testmood").fetchone()[0].name == "ok"
+    with pytest.raises(e.DataError):
+        conn.execute("select 'happy'::testmood").fetchone()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python
+"""
+Benchmark the adaptation and fetch hot paths of psycopg3.
+
+The benchmarks are run with the Python and the C implementation, each one in
+a new interpreter, and the results are compared. Most of the benchmarks don't
+need a server: the results to adapt are built in memory, using
+`PGconn.make_empty_result()` and `PGresult.set_attributes()`. The ones
+fetching data from a database run only if a connection string is specified.
+"""
+
+import os
+import re
+import sys
+import json
+import timeit
+import argparse
+import subprocess as sp
+import datetime as dt
+from decimal import Decimal
+from functools import partial
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import psycopg3
+from psycopg3 import pq
+from psycopg3.pq import Format
+from psycopg3.adapt import Format as PyFormat, Transformer
+from psycopg3.oids import builtins
+
+IMPLEMENTATIONS = ["python", "c"]
+
+# The record used in the benchmarks: PostgreSQL type, Python value.
+SAMPLE = [
+    ("int2", 42),
+    ("int8", 2 ** 40),
+    ("numeric", Decimal("1234.5678")),
+    ("float8", 3.14159),
+    ("text", "hello world"),
+    ("bool", True),
+    ("date", dt.date(2021, 3, 1)),
+    ("timestamptz", dt.datetime(2021, 3, 1, 12, 30, tzinfo=dt.timezone.utc)),
+    ("bytea", b"\x00\x01\x02\x03"),
+    ("int2[]", [1, 2, 3]),
+]
+
+Bench = Callable[["Context"], Callable[[], Any]]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Bench
+    needs_db: bool
+
+
+benchmarks: List[Benchmark] = []
+
+
+def benchmark(
+    *names: str, needs_db: bool = False
+) -> Callable[[Callable[..., Callable[[], Any]]], Any]:
+    """
+    Register a benchmark.
+
+    The decorated function receives a `Context` and returns the function to
+    time. If more than one name is specified, the function is registered
+    once for each name, and receives the format as second argument (the
+    names must end with ``text`` or ``binary``).
+    """
+
+    def benchmark_(f: Callable[..., Callable[[], Any]]) -> Any:
+        for name in names:
+            func: Bench
+            if name.endswith("_text"):
+                func = partial(f, format=Format.TEXT)
+            elif name.endswith("_binary"):
+                func = partial(f, format=Format.BINARY)
+            else:
+                func = f
+            benchmarks.append(Benchmark(name, func, needs_db))
+        return f
+
+    return benchmark_
+
+
+class Context:
+    """The data shared by the benchmarks."""
+
+    def __init__(self, nrows: int, conn: Optional[psycopg3.Connection]):
+        self.nrows = nrows
+        self.conn = conn
+
+    def sample(
+        self, tx: Transformer, format: Format
+    ) -> Tuple[List[Any], List[int], List[Optional[bytes]]]:
+        """
+        Return the sample values adaptable in *format*.
+
+        Return the values, their oids and their representation in *format*.
+        """
+        values = []
+        oids = []
+        data: List[Optional[bytes]] = []
+        for typname, value in SAMPLE:
+            try:
+                dumper = tx.get_dumper(value, PyFormat.from_pq(format))
+            except psycopg3.ProgrammingError:
+                continue
+            values.append(value)
+            oids.append(builtins.get_oid(typname))
+            data.append(bytes(dumper.dump(value)))
+        return values, oids, data
+
+    def empty_result(self, oids: List[int], format: Format) -> pq.PGresult:
+        """Build a result with no row and columns of the types *oids*."""
+        # A connection is not needed to build a result.
+        pgconn = pq.PGconn.connect(b"host=/nonexistent")
+        pgconn.finish()
+        res = pgconn.make_empty_result(pq.ExecStatus.TUPLES_OK)
+        res.set_attributes(
+            [
+                pq.PGresAttDesc(
+                    f"col{i}".encode(), 0, 0, format, oid, -1, -1
+                )
+                for i, oid in enumerate(oids)
+            ]
+        )
+        return res
+
+
+@benchmark("set_pgresult_text", "set_pgresult_binary")
+def bench_set_pgresult(ctx: Context, format: Format) -> Callable[[], Any]:
+    tx = Transformer()
+    values, oids, data = ctx.sample(tx, format)
+    res = ctx.empty_result(oids, format)
+    return lambda: tx.set_pgresult(res)
+
+
+@benchmark("load_sequence_text", "load_sequence_binary")
+def bench_load_sequence(ctx: Context, format: Format) -> Callable[[], Any]:
+    tx = Transformer()
+    values, oids, data = ctx.sample(tx, format)
+    tx.set_row_types(oids, [format] * len(oids))
+    records = [data] * ctx.nrows
+    load = tx.load_sequence
+    return lambda: [load(rec) for rec in records]
+
+
+@benchmark("dump_sequence_text", "dump_sequence_binary")
+def bench_dump_sequence(ctx: Context, format: Format) -> Callable[[], Any]:
+    tx = Transformer()
+    values, oids, data = ctx.sample(tx, format)
+    formats = [PyFormat.from_pq(format)] * len(values)
+    dump = tx.dump_sequence
+    return lambda: [dump(values, formats) for i in range(ctx.nrows)]
+
+
+@benchmark("query2pg")
+def bench_query2pg(ctx: Context) -> Callable[[], Any]:
+    from psycopg3._queries import PostgresQuery
+
+    tx = Transformer()
+    values, oids, data = ctx.sample(tx, Format.TEXT)
+    query = "select " + ", ".join(["%s"] * len(values))
+
+    def query2pg() -> None:
+        for i in range(ctx.nrows):
+            pgq = PostgresQuery(tx)
+            pgq.convert(query, values)
+
+    return query2pg
+
+
+@benchmark("format_row_text", "format_row_binary")
+def bench_format_row(ctx: Context, format: Format) -> Callable[[], Any]:
+    from psycopg3 import copy
+
+    tx = Transformer()
+    values, oids, data = ctx.sample(tx, format)
+    if format == Format.TEXT:
+        format_row = copy.format_row_text
+    else:
+        format_row = copy.format_row_binary
+
+    def format_rows() -> None:
+        out = bytearray()
+        for i in range(ctx.nrows):
+            format_row(values, tx, out)
+
+    return format_rows
+
+
+@benchmark("parse_row_text", "parse_row_binary")
+def bench_parse_row(ctx: Context, format: Format) -> Callable[[], Any]:
+    from psycopg3 import copy
+
+    tx = Transformer()
+    values, oids, data = ctx.sample(tx, format)
+    if format == Format.TEXT:
+        row = copy.format_row_text(values, tx)
+        parse_row = copy.parse_row_text
+    else:
+        row = copy.format_row_binary(values, tx)
+        parse_row = copy.parse_row_binary
+
+    row = bytes(row)
+    # The C parser takes the number of fields from the result, as in copy
+    tx.set_pgresult(ctx.empty_result(oids, format))
+    tx.set_row_types(oids, [format] * len(oids))
+    return lambda: [parse_row(row, tx) for i in range(ctx.nrows)]
+
+
+def _fetch_query(ctx: Context, format: Format) -> Tuple[str, List[Any]]:
+    values, oids, data = ctx.sample(Transformer(), format)
+    names = {builtins.get_oid(name): name for name, value in SAMPLE}
+    cols = ", ".join(f"%s::{names[oid]}" for oid in oids)
+    return f"select {cols} from generate_series(1, %s)", values + [ctx.nrows]
+
+
+@benchmark("load_rows_text", "load_rows_binary", needs_db=True)
+def bench_load_rows(ctx: Context, format: Format) -> Callable[[], Any]:
+    assert ctx.conn
+    query, params = _fetch_query(ctx, format)
+    cur = ctx.conn.cursor(binary=format == Format.BINARY)
+    cur.execute(query, params)
+    assert cur.pgresult
+    res = cur.pgresult
+    tx = Transformer(ctx.conn)
+    tx.set_pgresult(res)
+    return lambda: tx.load_rows(0, res.ntuples)
+
+
+@benchmark("fetchall_text", "fetchall_binary", needs_db=True)
+def bench_fetchall(ctx: Context, format: Format) -> Callable[[], Any]:
+    assert ctx.conn
+    query, params = _fetch_query(ctx, format)
+    cur = ctx.conn.cursor(binary=format == Format.BINARY)
+
+    def fetchall() -> None:
+        cur.execute(query, params)
+        cur.fetchall()
+
+    return fetchall
+
+
+def run(opt: argparse.Namespace) -> Dict[str, float]:
+    """
+    Run the benchmarks selected in the current interpreter.
+
+    Return the best time of each benchmark, in seconds.
+    """
+    conn = psycopg3.connect(opt.dsn) if opt.dsn else None
+    ctx = Context(opt.rows, conn)
+    rv = {}
+    for bench in benchmarks:
+        if opt.filter and not re.search(opt.filter, bench.name):
+            continue
+        if bench.needs_db and not conn:
+            continue
+        func = bench.func(ctx)
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        rv[bench.name] = min(timer.repeat(opt.repeat, number)) / number
+
+    if conn:
+        conn.close()
+    return rv
+
+
+def run_impl(impl: str, opt: argparse.Namespace) -> Dict[str, float]:
+    """Run the benchmarks using the implementation *impl* in a subprocess."""
+    env = dict(os.environ, PSYCOPG3_IMPL=impl)
+    cmdline = [sys.executable, __file__, "--impl", impl, "--json"]
+    cmdline += ["--rows", str(opt.rows), "--repeat", str(opt.repeat)]
+    if opt.dsn:
+        cmdline += ["--dsn", opt.dsn]
+    if opt.filter:
+        cmdline += ["--filter", opt.filter]
+
+    proc = sp.run(cmdline, env=env, stdout=sp.PIPE, stderr=sp.PIPE)
+    if proc.returncode:
+        err = proc.stderr.decode("utf8", "replace").strip().splitlines()
+        print(f"{impl} implementation not available: {err[-1]}")
+        return {}
+    rv: Dict[str, float] = json.loads(proc.stdout)
+    return rv
+
+
+def format_time(t: Optional[float]) -> str:
+    if t is None:
+        return "-"
+    for unit, mul in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if t * mul >= 1.0:
+            break
+    else:
+        unit, mul = "ns", 1e9
+    return f"{t * mul:.1f} {unit}"
+
+
+def report(results: Dict[str, Dict[str, float]]) -> None:
+    impls = list(results)
+    names = [b.name for b in benchmarks]
+    names = [n for n in names if any(n in res for res in results.values())]
+    head = ["benchmark"] + impls
+    if impls == IMPLEMENTATIONS:
+        head.append("speedup")
+    print(f"{head[0]:<24}" + "".join(f"{h:>12}" for h in head[1:]))
+    for name in names:
+        times = [results[impl].get(name) for impl in impls]
+        line = f"{name:<24}" + "".join(f"{format_time(t):>12}" for t in times)
+        if impls == IMPLEMENTATIONS and all(times):
+            line += f"{times[0] / times[1]:>11.1f}x"  # type: ignore
+        print(line)
+
+
+def main() -> None:
+    opt = parse_cmdline()
+    if opt.impl:
+        results = {opt.impl: run(opt)}
+    else:
+        results = {impl: run_impl(impl, opt) for impl in IMPLEMENTATIONS}
+        results = {impl: res for impl, res in results.items() if res}
+
+    if opt.json:
+        print(json.dumps(results[opt.impl]))
+    else:
+        print(f"{opt.rows} records, best of {opt.repeat} runs")
+        report(results)
+
+
+def parse_cmdline() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--dsn",
+        default=os.environ.get("PSYCOPG3_TEST_DSN"),
+        help="connection string to run the benchmarks requiring a server"
+        " [default: PSYCOPG3_TEST_DSN env var]",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=1000,
+        help="number of records processed by each benchmark"
+        " [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="number of measures to take the best of [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--filter",
+        help="only run the benchmarks matching this regular expression",
+    )
+    parser.add_argument(
+        "--impl",
+        choices=IMPLEMENTATIONS,
+        help="only run the benchmarks with this implementation"
+        " [default: compare all the implementations available]",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print the results as json"
+    )
+    opt = parser.parse_args()
+    if opt.json and not opt.impl:
+        parser.error("--json requires --impl")
+    return opt
+
+
+if __name__ == "__main__":
+    main()
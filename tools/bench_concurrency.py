@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+"""
+Measure the throughput of psycopg3 under different concurrency models.
+
+The same mix of operations is run by several workers, each one using its own
+connection, in different modes:
+
+- serial: a single worker using a `Connection`
+- threads: a `Connection` per worker, each in its own thread
+- async: an `AsyncConnection` per worker, each in its own asyncio task
+
+For each mode, the number of operations per second and the latency
+percentiles of each operation are reported.
+"""
+
+import os
+import time
+import random
+import asyncio
+import argparse
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+import psycopg3
+
+MODES = ["serial", "threads", "async"]
+OPERATIONS = ["lookup", "fetch", "executemany", "copy"]
+
+# Latencies measured by a worker: operation name, seconds
+Timings = List[Tuple[str, float]]
+
+DATA_TABLE = "bench_data"
+SINK_TABLE = "bench_sink"
+
+
+def setup(opt: argparse.Namespace) -> None:
+    """Create the tables used by the benchmark."""
+    with psycopg3.connect(opt.dsn, autocommit=True) as conn:
+        cur = conn.cursor()
+        cur.execute(f"drop table if exists {DATA_TABLE}, {SINK_TABLE}")
+        cur.execute(
+            f"create table {DATA_TABLE} (id int primary key, data text)"
+        )
+        cur.execute(f"create unlogged table {SINK_TABLE} (id int, data text)")
+        with cur.copy(f"copy {DATA_TABLE} from stdin") as copy:
+            copy.write_rows(records(0, opt.table_rows))
+        cur.execute(f"vacuum analyze {DATA_TABLE}")
+
+
+def records(start: int, n: int) -> List[Tuple[int, str]]:
+    return [(i, f"record {i:08}") for i in range(start, start + n)]
+
+
+class Worker:
+    """Run the operations of a worker and record their latency."""
+
+    def __init__(self, opt: argparse.Namespace, num: int):
+        self.opt = opt
+        self.rnd = random.Random(opt.seed + num)
+        self.timings: Timings = []
+        ops, weights = zip(*opt.mix.items())
+        self.ops: List[str] = list(ops)
+        self.weights: List[int] = list(weights)
+
+    def next_op(self) -> str:
+        return self.rnd.choices(self.ops, self.weights)[0]
+
+    def lookup_args(self) -> List[Any]:
+        return [self.rnd.randrange(self.opt.table_rows)]
+
+    def fetch_args(self) -> List[Any]:
+        start = self.rnd.randrange(self.opt.table_rows - self.opt.rows)
+        return [start, start + self.opt.rows - 1]
+
+    def sink_records(self) -> List[Tuple[int, str]]:
+        return records(self.rnd.randrange(1 << 30), self.opt.rows)
+
+    def run(self, deadline: float) -> None:
+        conn = psycopg3.connect(self.opt.dsn, autocommit=True)
+        cur = conn.cursor()
+        try:
+            while time.monotonic() < deadline:
+                op = self.next_op()
+                t0 = time.monotonic()
+                getattr(self, op)(cur)
+                self.timings.append((op, time.monotonic() - t0))
+        finally:
+            conn.close()
+
+    def lookup(self, cur: psycopg3.Cursor) -> None:
+        cur.execute(
+            f"select data from {DATA_TABLE} where id = %s", self.lookup_args()
+        )
+        cur.fetchone()
+
+    def fetch(self, cur: psycopg3.Cursor) -> None:
+        cur.execute(
+            f"select id, data from {DATA_TABLE} where id between %s and %s",
+            self.fetch_args(),
+        )
+        cur.fetchall()
+
+    def executemany(self, cur: psycopg3.Cursor) -> None:
+        cur.executemany(
+            f"insert into {SINK_TABLE} values (%s, %s)", self.sink_records()
+        )
+
+    def copy(self, cur: psycopg3.Cursor) -> None:
+        with cur.copy(f"copy {SINK_TABLE} from stdin") as copy:
+            copy.write_rows(self.sink_records())
+
+    async def run_async(self, deadline: float) -> None:
+        aconn = await psycopg3.AsyncConnection.connect(
+            self.opt.dsn, autocommit=True
+        )
+        cur = await aconn.cursor()
+        try:
+            while time.monotonic() < deadline:
+                op = self.next_op()
+                t0 = time.monotonic()
+                await getattr(self, f"{op}_async")(cur)
+                self.timings.append((op, time.monotonic() - t0))
+        finally:
+            await aconn.close()
+
+    async def lookup_async(self, cur: psycopg3.AsyncCursor) -> None:
+        await cur.execute(
+            f"select data from {DATA_TABLE} where id = %s", self.lookup_args()
+        )
+        await cur.fetchone()
+
+    async def fetch_async(self, cur: psycopg3.AsyncCursor) -> None:
+        await cur.execute(
+            f"select id, data from {DATA_TABLE} where id between %s and %s",
+            self.fetch_args(),
+        )
+        await cur.fetchall()
+
+    async def executemany_async(self, cur: psycopg3.AsyncCursor) -> None:
+        await cur.executemany(
+            f"insert into {SINK_TABLE} values (%s, %s)", self.sink_records()
+        )
+
+    async def copy_async(self, cur: psycopg3.AsyncCursor) -> None:
+        async with cur.copy(f"copy {SINK_TABLE} from stdin") as copy:
+            await copy.write_rows(self.sink_records())
+
+
+def run_serial(opt: argparse.Namespace) -> Timings:
+    worker = Worker(opt, 0)
+    worker.run(time.monotonic() + opt.duration)
+    return worker.timings
+
+
+def run_threads(opt: argparse.Namespace) -> Timings:
+    workers = [Worker(opt, i) for i in range(opt.workers)]
+    deadline = time.monotonic() + opt.duration
+    threads = [
+        threading.Thread(target=w.run, args=(deadline,)) for w in workers
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return [t for w in workers for t in w.timings]
+
+
+def run_async(opt: argparse.Namespace) -> Timings:
+    workers = [Worker(opt, i) for i in range(opt.workers)]
+
+    async def run_all() -> None:
+        deadline = time.monotonic() + opt.duration
+        await asyncio.gather(*(w.run_async(deadline) for w in workers))
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(run_all())
+    return [t for w in workers for t in w.timings]
+
+
+runners: Dict[str, Callable[[argparse.Namespace], Timings]] = {
+    "serial": run_serial,
+    "threads": run_threads,
+    "async": run_async,
+}
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Return the *p* percentile of the sorted list *values*."""
+    idx = min(len(values) - 1, int(len(values) * p / 100))
+    return values[idx]
+
+
+def report(mode: str, opt: argparse.Namespace, timings: Timings) -> None:
+    nworkers = 1 if mode == "serial" else opt.workers
+    print(
+        f"\n{mode} ({nworkers} worker{'s' if nworkers > 1 else ''}):"
+        f" {len(timings)} operations,"
+        f" {len(timings) / opt.duration:.1f} ops/sec"
+    )
+    print(
+        f"{'operation':<12}{'count':>8}{'ops/sec':>10}"
+        f"{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (ms)"
+    )
+    for op in opt.mix:
+        lats = sorted(t for name, t in timings if name == op)
+        if not lats:
+            continue
+        pcts = [percentile(lats, p) for p in (50, 90, 99)] + [lats[-1]]
+        print(
+            f"{op:<12}{len(lats):>8}{len(lats) / opt.duration:>10.1f}"
+            + "".join(f"{t * 1000:>10.2f}" for t in pcts)
+        )
+
+
+def main() -> None:
+    opt = parse_cmdline()
+    print(
+        f"psycopg3 {psycopg3.__version__}"
+        f" ({psycopg3.pq.__impl__} implementation)"
+    )
+    setup(opt)
+    for mode in opt.modes:
+        timings = runners[mode](opt)
+        report(mode, opt, timings)
+
+
+def parse_mix(s: str) -> Dict[str, int]:
+    rv = {}
+    for item in s.split(","):
+        op, _, weight = item.partition("=")
+        op = op.strip()
+        if op not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f"unknown operation {op!r}: choose from {', '.join(OPERATIONS)}"
+            )
+        rv[op] = int(weight) if weight else 1
+    return rv
+
+
+def parse_cmdline() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--dsn",
+        default=os.environ.get("PSYCOPG3_TEST_DSN"),
+        help="the database to connect to [default: PSYCOPG3_TEST_DSN env var]",
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=MODES,
+        default=MODES,
+        help="the concurrency models to test [default: all]",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="number of concurrent workers [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=5.0,
+        help="seconds to run each mode for [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default="lookup=20,fetch=4,executemany=1,copy=1",
+        help="operations to run, with their relative weight"
+        " [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=100,
+        help="number of records fetched or inserted by the bulk operations"
+        " [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--table-rows",
+        type=int,
+        default=100_000,
+        help="number of records in the table to query [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="seed of the random operations [default: %(default)s]",
+    )
+    opt = parser.parse_args()
+    if not opt.dsn:
+        parser.error("no database specified: use --dsn or PSYCOPG3_TEST_DSN")
+    if opt.rows >= opt.table_rows:
+        parser.error("--rows must be smaller than --table-rows")
+    return opt
+
+
+if __name__ == "__main__":
+    main()
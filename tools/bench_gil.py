@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+"""
+Measure how well the libpq calls wrapped by psycopg3 run in parallel threads.
+
+Every thread uses its own connection and calls in a loop one of the libpq
+functions which may block or take long, such as PQgetResult(), PQgetCopyData()
+or PQescapeBytea(), using the `psycopg3.pq` objects directly. If the wrapper
+holds the GIL during the call, the threads run one at time and the throughput
+doesn't grow with the number of threads.
+
+The operations waiting for the server use `pg_sleep()` to simulate the
+network or query latency. The CPU-bound ones can only scale if more than one
+CPU is available.
+
+Run the script with the environment variable PSYCOPG3_IMPL set to 'python' or
+'c' to choose the implementation to test.
+"""
+
+import os
+import time
+import argparse
+import threading
+from typing import Any, Callable, Dict
+
+import psycopg3
+from psycopg3 import pq
+
+Operation = Callable[[pq.PGconn], Any]
+
+
+class Context:
+    """The data shared by the operations."""
+
+    def __init__(self, opt: argparse.Namespace):
+        self.dsn = opt.dsn.encode()
+        self.latency = opt.latency
+        self.blob = os.urandom(opt.size)
+        self.escaped = bytes(pq.Escaping().escape_bytea(self.blob))
+
+    def connect(self) -> pq.PGconn:
+        pgconn = pq.PGconn.connect(self.dsn)
+        if pgconn.status != pq.ConnStatus.OK:
+            raise psycopg3.OperationalError(
+                f"connection failed: {pq.error_message(pgconn)}"
+            )
+        return pgconn
+
+
+def op_connect(ctx: Context) -> Operation:
+    def connect(pgconn: pq.PGconn) -> None:
+        ctx.connect().finish()
+
+    return connect
+
+
+def op_get_result(ctx: Context) -> Operation:
+    query = f"select pg_sleep({ctx.latency})".encode()
+
+    def get_result(pgconn: pq.PGconn) -> None:
+        pgconn.send_query(query)
+        while pgconn.get_result() is not None:
+            pass
+
+    return get_result
+
+
+def op_get_copy_data(ctx: Context) -> Operation:
+    query = (
+        f"copy (select pg_sleep({ctx.latency}), repeat('x', {len(ctx.blob)}))"
+        " to stdout"
+    ).encode()
+
+    def get_copy_data(pgconn: pq.PGconn) -> None:
+        pgconn.send_query(query)
+        pgconn.get_result()
+        while pgconn.get_copy_data(0)[0] != -1:
+            pass
+        while pgconn.get_result() is not None:
+            pass
+
+    return get_copy_data
+
+
+def op_escape_bytea(ctx: Context) -> Operation:
+    def escape_bytea(pgconn: pq.PGconn) -> None:
+        pq.Escaping(pgconn).escape_bytea(ctx.blob)
+
+    return escape_bytea
+
+
+def op_unescape_bytea(ctx: Context) -> Operation:
+    def unescape_bytea(pgconn: pq.PGconn) -> None:
+        pq.Escaping().unescape_bytea(ctx.escaped)
+
+    return unescape_bytea
+
+
+operations: Dict[str, Callable[[Context], Operation]] = {
+    "connect": op_connect,
+    "get_result": op_get_result,
+    "get_copy_data": op_get_copy_data,
+    "escape_bytea": op_escape_bytea,
+    "unescape_bytea": op_unescape_bytea,
+}
+
+
+def run(ctx: Context, op: Operation, nthreads: int, duration: float) -> float:
+    """
+    Run *op* in *nthreads* threads for *duration* seconds.
+
+    Return the number of operations per second.
+    """
+    pgconns = [ctx.connect() for i in range(nthreads)]
+    counts = [0] * nthreads
+    start = threading.Barrier(nthreads + 1)
+    deadline = 0.0
+
+    def worker(i: int) -> None:
+        pgconn = pgconns[i]
+        start.wait()
+        while time.monotonic() < deadline:
+            op(pgconn)
+            counts[i] += 1
+
+    threads = [
+        threading.Thread(target=worker, args=(i,)) for i in range(nthreads)
+    ]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + duration
+    start.wait()
+    for t in threads:
+        t.join()
+    for pgconn in pgconns:
+        pgconn.finish()
+
+    return sum(counts) / duration
+
+
+def main() -> None:
+    opt = parse_cmdline()
+    ctx = Context(opt)
+    print(
+        f"psycopg3 {psycopg3.__version__} ({pq.__impl__} implementation),"
+        f" {os.cpu_count()} CPUs, {opt.latency * 1000:g} ms latency,"
+        f" {opt.size} bytes blobs"
+    )
+
+    head = ["operation"] + [f"{n} thr" for n in opt.threads] + ["scaling"]
+    print(f"{head[0]:<16}" + "".join(f"{h:>10}" for h in head[1:]))
+    for name in opt.operations:
+        op = operations[name](ctx)
+        rates = [run(ctx, op, n, opt.duration) for n in opt.threads]
+        print(
+            f"{name:<16}"
+            + "".join(f"{r:>10.1f}" for r in rates)
+            + f"{rates[-1] / rates[0]:>9.1f}x"
+        )
+
+
+def parse_cmdline() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--dsn",
+        default=os.environ.get("PSYCOPG3_TEST_DSN"),
+        help="the database to connect to [default: PSYCOPG3_TEST_DSN env var]",
+    )
+    parser.add_argument(
+        "--operations",
+        nargs="+",
+        choices=list(operations),
+        default=list(operations),
+        help="the operations to test [default: all]",
+    )
+    parser.add_argument(
+        "--threads",
+        nargs="+",
+        type=int,
+        default=[1, 4],
+        help="numbers of threads to compare [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=3.0,
+        help="seconds to run each measure for [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.01,
+        help="seconds the server waits before replying [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=1 << 20,
+        help="size of the data to escape or to copy [default: %(default)s]",
+    )
+    opt = parser.parse_args()
+    if not opt.dsn:
+        parser.error("no database specified: use --dsn or PSYCOPG3_TEST_DSN")
+    return opt
+
+
+if __name__ == "__main__":
+    main()
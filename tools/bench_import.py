@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Measure the time taken to import psycopg3.
+
+Every measure is taken in a new interpreter, so the modules are not cached.
+"""
+
+import sys
+import argparse
+import subprocess as sp
+from statistics import median
+
+script = """\\
+import time
+t0 = time.perf_counter()
+import psycopg3
+print(time.perf_counter() - t0)
+"""
+
+
+def main():
+    opt = parse_cmdline()
+    times = []
+    for i in range(opt.runs):
+        out = sp.check_output([sys.executable, "-c", script])
+        times.append(float(out))
+
+    print(
+        f"import psycopg3 ({opt.runs} runs):"
+        f" median {median(times) * 1000:.1f} ms,"
+        f" min {min(times) * 1000:.1f} ms"
+    )
+
+
+def parse_cmdline():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=20,
+        help="number of interpreters to start [default: %(default)s]",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()